@@ -0,0 +1,166 @@
+import time
+from os import getenv
+from typing import TYPE_CHECKING, Mapping
+
+from dotenv import load_dotenv
+from derived import DerivedResponses
+from notices import is_premium_notice, is_rate_limited
+
+if TYPE_CHECKING:
+    from upstream import Fetch
+
+load_dotenv()
+
+# ? Unadjusted function -> (adjusted function, adjusted series key, series key, information).
+SHARED: dict[str, tuple[str, str, str, str]] = {
+    "TIME_SERIES_DAILY": (
+        "TIME_SERIES_DAILY_ADJUSTED",
+        "Time Series (Daily)",
+        "Time Series (Daily)",
+        "Daily Prices (open, high, low, close) and Volumes",
+    ),
+    "TIME_SERIES_WEEKLY": (
+        "TIME_SERIES_WEEKLY_ADJUSTED",
+        "Weekly Adjusted Time Series",
+        "Weekly Time Series",
+        "Weekly Prices (open, high, low, close) and Volumes",
+    ),
+    "TIME_SERIES_MONTHLY": (
+        "TIME_SERIES_MONTHLY_ADJUSTED",
+        "Monthly Adjusted Time Series",
+        "Monthly Time Series",
+        "Monthly Prices (open, high, low, close) and Volumes",
+    ),
+}
+
+_FIELDS = (
+    ("1. open", "1. open"),
+    ("2. high", "2. high"),
+    ("3. low", "3. low"),
+    ("4. close", "4. close"),
+    ("5. volume", "6. volume"),
+)
+
+
+def unadjusted(adjusted: dict, function: str) -> dict | None:
+    """Builds the response of an unadjusted series from that of its adjusted one.
+
+    The adjusted bars carry the raw open, high, low, close and volume next to the
+    adjusted close and dividends, so nothing is lost.
+
+    Args:
+        adjusted (dict): The `TIME_SERIES_*_ADJUSTED` response.
+        function (str): The unadjusted function.
+
+    Returns:
+        dict | None: The response shaped exactly as upstream returns `function`, or
+            `None` when `adjusted` holds no series (an error or a notice).
+    """
+    _, adjusted_key, series_key, information = SHARED[function]
+    meta = adjusted.get("Meta Data")
+    bars = adjusted.get(adjusted_key)
+    if meta is None or bars is None:
+        return None
+    return {
+        "Meta Data": {**meta, "1. Information": information},
+        series_key: {
+            date: {name: bar.get(source) for name, source in _FIELDS}
+            for date, bar in bars.items()
+        },
+    }
+
+
+class AdjustedSharing:
+    """Serves `TIME_SERIES_DAILY`/`WEEKLY`/`MONTHLY` from their adjusted responses.
+
+    With sharing on, an unadjusted request fetches the adjusted response instead (from
+    the cache, the history store or upstream, exactly as an adjusted request would) and
+    derives its own from it, so clients mixing both views cost one call per series.
+    Derived responses are kept while their adjusted response keeps being served, so
+    they are built, and their frames parsed, once.
+
+    `TIME_SERIES_DAILY_ADJUSTED` is a premium function: keys answered with the premium
+    notice instead of a series fall back to the unadjusted function and are not tried
+    again for `AV_SHARE_ADJUSTED_RETRY` seconds (default a day). A rate limit notice is
+    returned as is (the cache serves a stale adjusted response when it has one), so
+    the limited key does not spend a second call on the unadjusted function.
+
+    Configuration (environment):
+        AV_SHARE_ADJUSTED: `1` to turn sharing on. Defaults to off.
+        AV_SHARE_ADJUSTED_RETRY: Seconds before a key without access is tried again.
+    """
+
+    def __init__(
+        self,
+        enabled: bool | None = None,
+        retry: float | None = None,
+        max_size: int = 64,
+    ) -> None:
+        self.enabled = (
+            enabled
+            if enabled is not None
+            else getenv("AV_SHARE_ADJUSTED", "0").lower() in ("1", "true", "yes")
+        )
+        self.retry = (
+            retry
+            if retry is not None
+            else float(getenv("AV_SHARE_ADJUSTED_RETRY", str(24 * 60 * 60)))
+        )
+        self._derived = DerivedResponses(max_size)
+        self._denied_at: dict[tuple[str, str], float] = {}
+        self.shared = 0
+        self.fallbacks = 0
+
+    def handles(self, params: Mapping[str, str]) -> bool:
+        """Whether `params` request a series that is served from its adjusted one.
+
+        Args:
+            params (Mapping[str, str]): The normalized query string parameters.
+
+        Returns:
+            bool: `True` when sharing is on and the key may call the adjusted function.
+        """
+        function = params.get("function", "")
+        if not self.enabled or function not in SHARED:
+            return False
+        denied_at = self._denied_at.get((params.get("apikey", ""), function))
+        return denied_at is None or time.monotonic() - denied_at > self.retry
+
+    async def serve(self, params: Mapping[str, str], fetch: "Fetch") -> dict:
+        """Serves an unadjusted request from the adjusted response.
+
+        Args:
+            params (Mapping[str, str]): The normalized query string parameters.
+            fetch (Fetch): Fetches one normalized request.
+
+        Returns:
+            dict: The unadjusted response, which must not be mutated.
+        """
+        function = params["function"]
+        adjusted = await fetch({**params, "function": SHARED[function][0]})
+        derived = self._derived.get(
+            adjusted, function, lambda source: unadjusted(source, function)
+        )
+        if derived is not None:
+            self.shared += 1
+            return derived
+        if is_rate_limited(adjusted):
+            return adjusted
+        if is_premium_notice(adjusted):
+            self._denied_at[(params.get("apikey", ""), function)] = time.monotonic()
+        self.fallbacks += 1
+        return await fetch(params)
+
+    def stats(self) -> dict[str, int | bool]:
+        """Requests shared, responses derived and fallbacks taken.
+
+        Returns:
+            dict[str, int | bool]: The counters.
+        """
+        return {
+            "enabled": self.enabled,
+            "shared": self.shared,
+            "derivations": self._derived.builds,
+            "fallbacks": self.fallbacks,
+            "keys_without_access": len(self._denied_at),
+        }
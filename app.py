@@ -1,10 +1,37 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from strawberry.fastapi import GraphQLRouter
 import strawberry
+from http_client import client
+from prefetch import Prefetcher
+from quotes import bulk
+from strawberry_extensions import QueryPlanner, UpstreamScope
 from strawberry_permissions import GraphQLContext
 from strawberry_types import QueryType
+from upstream import (
+    adjusted,
+    aggregator,
+    cache,
+    flights,
+    history,
+    resampler,
+    scheduler,
+)
+from vantage_wrapper import pool, threads
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Starts the watchlist prefetcher, and closes the pooled upstream connections
+    and the library's threads when the worker shuts down."""
+    prefetcher.start()
+    yield
+    await prefetcher.stop()
+    await client.close()
+    threads.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 async def get_context() -> GraphQLContext:
@@ -32,7 +59,26 @@ async def root():
         return {"message": schema.as_str()}
 
 
-schema = strawberry.Schema(query=Query)
+@app.get("/stats")
+async def stats():
+    """Runtime counters of the upstream layers."""
+    return {
+        "adjusted_sharing": adjusted.stats(),
+        "bulk_quotes": bulk.stats(),
+        "cache": cache.stats(),
+        "clients": pool.stats(),
+        "history": history.stats(),
+        "intraday": aggregator.stats(),
+        "prefetch": prefetcher.stats(),
+        "resample": resampler.stats(),
+        "singleflight": flights.stats(),
+        "scheduler": scheduler.stats(),
+        "threads": threads.stats(),
+    }
+
+
+schema = strawberry.Schema(query=Query, extensions=[UpstreamScope, QueryPlanner])
+prefetcher = Prefetcher(schema)
 
 
 gql_app = GraphQLRouter(schema, path="/graphql", debug=True, context_getter=get_context)
@@ -0,0 +1,49 @@
+import asyncio
+from os import getenv
+from typing import Awaitable, Callable
+
+from dotenv import load_dotenv
+from loaders import CONCURRENCY
+from strawberry_interfaces import BatchItem
+
+load_dotenv()
+
+MAX_SYMBOLS = int(getenv("AV_BATCH_MAX_SYMBOLS", "100"))
+
+
+async def fan_out[T](
+    symbols: list[str],
+    resolve: Callable[[str], Awaitable[T]],
+    concurrency: int | None = None,
+) -> list[BatchItem[T]]:
+    """Resolves every symbol of a batch field concurrently.
+
+    At most `AV_BATCH_CONCURRENCY` (default 8) symbols are in flight at once; their
+    upstream calls still wait for the quota of the key (see `scheduler.Scheduler`). A
+    symbol that fails is reported in its item's `error` instead of failing the batch.
+
+    Args:
+        symbols (list[str]): The symbols, at most `AV_BATCH_MAX_SYMBOLS` (default 100).
+        resolve (Callable[[str], Awaitable[T]]): Resolves one symbol.
+        concurrency (int | None, optional): The symbols in flight at once, for
+            resolvers whose loader batches them (see `loaders.Loaders`). Defaults to
+            `AV_BATCH_CONCURRENCY`.
+
+    Returns:
+        list[BatchItem[T]]: One item per symbol, in the order requested.
+    """
+    assert (
+        len(symbols) <= MAX_SYMBOLS
+    ), f"At most {MAX_SYMBOLS} symbols can be requested at once"
+    semaphore = asyncio.Semaphore(concurrency or CONCURRENCY)
+
+    async def one(symbol: str) -> BatchItem[T]:
+        async with semaphore:
+            try:
+                return BatchItem(symbol=symbol, result=await resolve(symbol))
+            except Exception as error:  # pylint: disable=broad-except
+                return BatchItem(
+                    symbol=symbol, error=str(error) or type(error).__name__
+                )
+
+    return list(await asyncio.gather(*(one(symbol) for symbol in symbols)))
@@ -0,0 +1,82 @@
+"""Requests/sec for concurrent GraphQL queries against a local stand-in upstream.
+
+Compares the pooled async client with the previous behaviour, where every upstream
+call was a blocking `requests.get` on the event loop.
+
+    python benchmarks/bench_async_client.py [--queries 200] [--concurrency 50] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("AV_DEFAULT_TIER", "unlimited")
+os.environ.setdefault("AV_CACHE_TTLS", "TIME_SERIES_DAILY=0")
+
+from standin import StandIn  # noqa: E402
+
+QUERY = '{ getTimeSeries { daily(symbol: "%s") { metadata { symbol } } } }'
+
+
+async def _blocking_get_json(params: dict[str, str]) -> dict:
+    """The old upstream path: a fresh connection and a blocking call per request."""
+    return requests.get(os.environ["AV_URL"], params=params, timeout=10).json()
+
+
+async def run(queries: int, concurrency: int) -> float:
+    """Fires `queries` GraphQL requests, `concurrency` at a time, through the ASGI app.
+
+    Returns:
+        float: Requests per second.
+    """
+    import httpx  # pylint: disable=import-outside-toplevel
+    from app import app  # pylint: disable=import-outside-toplevel
+
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+
+        async def one(i: int) -> None:
+            async with semaphore:
+                response = await http.post(
+                    "/graphql",
+                    json={"query": QUERY % f"SYM{i}"},
+                    headers={"ALPHAVANTAGE_API_KEY": "bench"},
+                )
+                assert not response.json().get("errors"), response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(queries)))
+        return queries / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with StandIn(latency=args.latency) as standin:
+        os.environ["AV_URL"] = standin.url
+        from http_client import client  # pylint: disable=import-outside-toplevel
+
+        pooled = client.get_json
+        client.get_json = _blocking_get_json
+        before = asyncio.run(run(args.queries, args.concurrency))
+        client.get_json = pooled
+        after = asyncio.run(run(args.queries, args.concurrency))
+
+    print(f"upstream latency {args.latency * 1000:.0f} ms, {args.queries} queries, "
+          f"concurrency {args.concurrency}")
+    print(f"blocking requests.get : {before:8.1f} req/s")
+    print(f"pooled async client   : {after:8.1f} req/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Library client construction and allocations per resolved field.
+
+Simulates the README's sma+ema+wma+dema+tema query: five `Vantage` wrappers per query.
+
+    python benchmarks/bench_client_pool.py [--queries 1000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vantage_wrapper import ClientPool, ClientSet  # noqa: E402
+
+FIELDS = 5
+
+
+def measure(build, queries: int) -> float:
+    """Returns the microseconds spent per field by `build`."""
+    start = time.perf_counter()
+    for _ in range(queries * FIELDS):
+        build("bench-key")
+    return (time.perf_counter() - start) / (queries * FIELDS) * 1e6
+
+
+def allocated(build) -> int:
+    """Returns the peak bytes allocated by one call of `build`."""
+    tracemalloc.start()
+    build("bench-key")
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    per_call = [0]
+
+    def per_field(key: str) -> ClientSet:
+        per_call[0] += 1
+        return ClientSet(key)
+
+    pool = ClientPool()
+    before_us = measure(per_field, args.queries)
+    after_us = measure(pool.get, args.queries)
+    before_bytes = allocated(ClientSet)
+    after_bytes = allocated(pool.get)
+
+    print(f"{args.queries} queries x {FIELDS} fields")
+    print(f"per-field construction: {per_call[0] * ClientPool.CLIENTS_PER_SET} clients, "
+          f"{before_us:6.2f} us/field, {before_bytes} B allocated/field")
+    print(f"pooled clients        : {pool.stats()['clients_constructed']} clients, "
+          f"{after_us:6.2f} us/field, {after_bytes} B allocated/field")
+    print(pool.stats())
+
+
+if __name__ == "__main__":
+    main()
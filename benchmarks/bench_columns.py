@@ -0,0 +1,87 @@
+"""CPU time and peak memory of row-oriented `data` vs. columnar `columns` results.
+
+Queries a full daily series (5000 bars from the stand-in upstream, served from the
+response cache after the first query) through the ASGI app, selecting the same six
+fields both ways.
+
+    python benchmarks/bench_columns.py [--queries 20]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("AV_DEFAULT_TIER", "unlimited")
+
+from standin import StandIn  # noqa: E402
+
+FIELDS = "date open high low close volume"
+QUERIES = {
+    "data": '{ getTimeSeries { daily(symbol: "IBM", outputsize: "full") '
+    "{ data { %s } } } }" % FIELDS,
+    "columns": '{ getTimeSeries { daily(symbol: "IBM", outputsize: "full") '
+    "{ columns { %s } } } }" % FIELDS,
+}
+
+
+async def run(queries: int) -> dict[str, tuple[float, int, int]]:
+    """Times each query shape.
+
+    Returns:
+        dict[str, tuple[float, int, int]]: Milliseconds per query, peak bytes
+            allocated by one query and response size, by shape.
+    """
+    import httpx  # pylint: disable=import-outside-toplevel
+    from app import app  # pylint: disable=import-outside-toplevel
+
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+
+        async def one(query: str) -> int:
+            response = await http.post(
+                "/graphql",
+                json={"query": query},
+                headers={"ALPHAVANTAGE_API_KEY": "bench"},
+            )
+            assert not response.json().get("errors"), response.text[:500]
+            return len(response.content)
+
+        for name, query in QUERIES.items():
+            size = await one(query)
+            start = time.perf_counter()
+            for _ in range(queries):
+                await one(query)
+            elapsed = (time.perf_counter() - start) / queries * 1000
+            tracemalloc.start()
+            await one(query)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results[name] = (elapsed, peak, size)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    with StandIn(latency=0) as standin:
+        os.environ["AV_URL"] = standin.url
+        results = asyncio.run(run(args.queries))
+
+    (rows_ms, rows_peak, rows_size) = results["data"]
+    (cols_ms, cols_peak, cols_size) = results["columns"]
+    print(f"full daily series (5000 bars), fields: {FIELDS}")
+    print(f"data    : {rows_ms:7.1f} ms/query  peak {rows_peak / 1e6:6.1f} MB  "
+          f"response {rows_size / 1e3:6.0f} KB")
+    print(f"columns : {cols_ms:7.1f} ms/query  peak {cols_peak / 1e6:6.1f} MB  "
+          f"response {cols_size / 1e3:6.0f} KB  ({rows_ms / cols_ms:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
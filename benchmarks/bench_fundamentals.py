@@ -0,0 +1,86 @@
+"""Rows/sec of parsing financial statements, through pandas vs. straight from the list.
+
+The old path built a DataFrame of the reports, turned it back into dicts, validated
+each row and converted it with `from_pydantic`; the new one validates the raw list
+with a `TypeAdapter` and builds the strawberry types from the models. Reports are
+synthesized from the schema's field names, one number per field, as upstream sends
+them.
+
+    python benchmarks/bench_fundamentals.py [--rows 1000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pandas import DataFrame  # noqa: E402
+from pydantic_schemas import (  # noqa: E402
+    BalanceSheetSchema,
+    CashFlowSchema,
+    IncomeStatementSchema,
+)
+from strawberry_types import (  # noqa: E402
+    BalanceSheetType,
+    CashFlowType,
+    FundementalDataType,
+    IncomeStatementType,
+)
+
+STATEMENTS = {
+    "balance sheet": (BalanceSheetSchema, BalanceSheetType, "manipulate_bs"),
+    "cash flow": (CashFlowSchema, CashFlowType, "manipulate_cf"),
+    "income statement": (IncomeStatementSchema, IncomeStatementType, "manipulate_is"),
+}
+
+
+def reports(schema, rows: int) -> list[dict[str, str]]:
+    return [
+        {
+            field.validation_alias: str(1_000_000 + row * 7 + i)
+            for i, field in enumerate(schema.model_fields.values())
+        }
+        for row in range(rows)
+    ]
+
+
+def through_pandas(schema, gqltype, data: list[dict]) -> list:
+    """The parsing as it was: reports -> DataFrame -> dicts -> models -> types."""
+    return [
+        gqltype.from_pydantic(schema.model_validate(row))
+        for row in DataFrame(data).to_dict(orient="index").values()
+    ]
+
+
+def rate(parse, data: list[dict], repeat: int) -> float:
+    """Best rows/sec of `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(data)
+        best = min(best, time.perf_counter() - start)
+    return len(data) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    fundamentals = FundementalDataType()
+    print(f"{args.rows} reports per run, best of {args.repeat}")
+    for name, (schema, gqltype, method) in STATEMENTS.items():
+        data = reports(schema, args.rows)
+        old = rate(lambda d: through_pandas(schema, gqltype, d), data, args.repeat)
+        new = rate(getattr(fundamentals, method), data, args.repeat)
+        print(
+            f"{name:16}: pandas {old:9.0f} rows/s  direct {new:9.0f} rows/s  "
+            f"{new / old:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
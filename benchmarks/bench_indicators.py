@@ -0,0 +1,109 @@
+"""N indicator fields vs. one batched `indicators` field.
+
+A screen asks for ten moving averages of one symbol (five functions, two periods).
+As separate `getTechnicalAverages` fields each is one upstream indicator call; the
+batched field fetches the daily series once and computes all ten in one pass over
+its 5000 bars. Both return the latest 100 values (all the stand-in's indicator
+endpoint serves). Cold queries use a new symbol every time, warm ones repeat a
+cached symbol.
+
+    python benchmarks/bench_indicators.py [--queries 10] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("AV_DEFAULT_TIER", "unlimited")
+
+from standin import StandIn  # noqa: E402
+
+SPECS = [
+    (function, period)
+    for function in ("sma", "ema", "wma", "dema", "tema")
+    for period in (20, 50)
+]
+
+
+def separate(symbol: str) -> str:
+    fields = " ".join(
+        f'{name}{period}: {name}(symbol: "{symbol}", interval: "daily", '
+        f'timePeriod: {period}, seriesType: "close") {{ Analysis {{ date average }} }}'
+        for name, period in SPECS
+    )
+    return "{ getTechnicalAverages { %s } }" % fields
+
+
+def batched(symbol: str) -> str:
+    specs = ", ".join(
+        f'{{function: "{name.upper()}", timePeriod: {period}}}'
+        for name, period in SPECS
+    )
+    return (
+        '{ getTechnicalAverages { indicators(symbol: "%s", limit: 100, specs: [%s]) '
+        "{ dates results { label lines { values } } } } }" % (symbol, specs)
+    )
+
+
+async def run(standin: StandIn, queries: int) -> dict[str, tuple[float, float, float]]:
+    """Times each query shape.
+
+    Returns:
+        dict[str, tuple[float, float, float]]: Cold and warm milliseconds per query,
+            and upstream calls per cold query, by shape.
+    """
+    import httpx  # pylint: disable=import-outside-toplevel
+    from app import app  # pylint: disable=import-outside-toplevel
+
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+
+        async def one(query: str) -> None:
+            response = await http.post(
+                "/graphql",
+                json={"query": query},
+                headers={"ALPHAVANTAGE_API_KEY": "bench"},
+            )
+            assert not response.json().get("errors"), response.text[:500]
+
+        for name, build in (("separate", separate), ("batched", batched)):
+            calls = standin.calls
+            start = time.perf_counter()
+            for i in range(queries):
+                await one(build(f"{name.upper()}{i}"))
+            cold = (time.perf_counter() - start) / queries * 1000
+            per_query = (standin.calls - calls) / queries
+            start = time.perf_counter()
+            for _ in range(queries):
+                await one(build(f"{name.upper()}0"))
+            warm = (time.perf_counter() - start) / queries * 1000
+            results[name] = (cold, warm, per_query)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with StandIn(latency=args.latency) as standin:
+        os.environ["AV_URL"] = standin.url
+        results = asyncio.run(run(standin, args.queries))
+
+    print(
+        f"{len(SPECS)} indicators per query, upstream latency {args.latency * 1000:.0f} ms"
+    )
+    for name, (cold, warm, calls) in results.items():
+        print(
+            f"{name:9}: cold {cold:7.1f} ms/query  warm {warm:7.1f} ms/query  "
+            f"{calls:4.1f} upstream calls/query"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""A multi-timeframe intraday chart: one upstream call per interval vs. one in all.
+
+The chart shows the latest 100 bars of the five upstream intervals. Without a base
+interval (`AV_INTRADAY_BASE=`) each is its own upstream call; with `1min` the full
+one-minute series is fetched once and the other intervals are aggregated from it.
+Cold queries use a new symbol every time, warm ones repeat a cached symbol.
+
+    python benchmarks/bench_intraday.py [--queries 10] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("AV_DEFAULT_TIER", "unlimited")
+
+from standin import StandIn  # noqa: E402
+
+INTERVALS = ("1min", "5min", "15min", "30min", "60min")
+
+
+def chart(symbol: str) -> str:
+    fields = " ".join(
+        f'i{interval}: intraday(symbol: "{symbol}", interval: "{interval}") '
+        "{ columns { date close volume } }"
+        for interval in INTERVALS
+    )
+    return "{ getTimeSeries { %s } }" % fields
+
+
+async def run(standin: StandIn, queries: int) -> dict[str, tuple[float, float, float]]:
+    """Times the chart with each base.
+
+    Returns:
+        dict[str, tuple[float, float, float]]: Cold and warm milliseconds per query,
+            and upstream calls per cold query, by base.
+    """
+    import httpx  # pylint: disable=import-outside-toplevel
+    import upstream  # pylint: disable=import-outside-toplevel
+    from app import app  # pylint: disable=import-outside-toplevel
+
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+
+        async def one(query: str) -> None:
+            response = await http.post(
+                "/graphql",
+                json={"query": query},
+                headers={"ALPHAVANTAGE_API_KEY": "bench"},
+            )
+            assert not response.json().get("errors"), response.text[:500]
+
+        for base in ("", "1min"):
+            upstream.aggregator.base = base
+            name = base or "per interval"
+            calls = standin.calls
+            start = time.perf_counter()
+            for i in range(queries):
+                await one(chart(f"B{base}{i}"))
+            cold = (time.perf_counter() - start) / queries * 1000
+            per_query = (standin.calls - calls) / queries
+            start = time.perf_counter()
+            for _ in range(queries):
+                await one(chart(f"B{base}0"))
+            warm = (time.perf_counter() - start) / queries * 1000
+            results[name] = (cold, warm, per_query)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with StandIn(latency=args.latency) as standin:
+        os.environ["AV_URL"] = standin.url
+        results = asyncio.run(run(standin, args.queries))
+
+    print(
+        f"{len(INTERVALS)} intervals per chart, upstream latency "
+        f"{args.latency * 1000:.0f} ms"
+    )
+    for name, (cold, warm, calls) in results.items():
+        print(
+            f"{name:12}: cold {cold:7.1f} ms/query  warm {warm:7.1f} ms/query  "
+            f"{calls:4.1f} upstream calls/query"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Per-bar CPU of turning upstream strings into the floats GraphQL serializes.
+
+Before, every string reached `Float` serialization, which parsed it value by value;
+now each column is parsed in one NumPy pass, once per cached payload, and
+serialization receives floats.
+
+    python benchmarks/bench_parsing.py [--bars 5000] [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graphql import GraphQLFloat  # noqa: E402
+from series import SeriesFrame  # noqa: E402
+from standin import make_bars  # noqa: E402
+from strawberry_interfaces import TimeSeriesData, time_series_rows  # noqa: E402
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def serialize(rows: list[TimeSeriesData]) -> list:
+    """What GraphQL does with every selected numeric field of every row."""
+    to_float = GraphQLFloat.serialize
+    return [[to_float(getattr(row, name)) for name in FIELDS] for row in rows]
+
+
+def per_value(bars: dict) -> list:
+    """The old path: rows holding the raw strings, parsed one at a time on output."""
+    rows = [
+        TimeSeriesData(
+            date=date,
+            open=bar.get("1. open"),
+            high=bar.get("2. high"),
+            low=bar.get("3. low"),
+            close=bar.get("4. close"),
+            volume=bar.get("5. volume"),
+        )
+        for date, bar in bars.items()
+    ]
+    return serialize(rows)
+
+
+def vectorized(bars: dict) -> list:
+    """The new path, first request: columns parsed by NumPy, then the rows built."""
+    return serialize(time_series_rows(SeriesFrame(bars)))
+
+
+def vectorized_cached(bars: dict) -> list:
+    """The new path, payload served again: the parsed columns are reused."""
+    return serialize(time_series_rows(SeriesFrame.of(bars)))
+
+
+def measure(fn, bars: dict, repeat: int) -> float:
+    """Returns the microseconds spent per bar by `fn`."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(bars)
+    return (time.perf_counter() - start) / (repeat * len(bars)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bars", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    bars = make_bars(args.bars)
+    assert per_value(bars) == vectorized(bars) == vectorized_cached(bars)
+    before = measure(per_value, bars, args.repeat)
+    first = measure(vectorized, bars, args.repeat)
+    again = measure(vectorized_cached, bars, args.repeat)
+    print(f"{args.bars} bars x {len(FIELDS)} numeric fields, rows built and serialized")
+    print(f"per-value parsing           : {before:6.2f} us/bar")
+    print(f"vectorized, first request   : {first:6.2f} us/bar  ({before / first:.1f}x)")
+    print(f"vectorized, payload reused  : {again:6.2f} us/bar  ({before / again:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
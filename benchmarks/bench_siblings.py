@@ -0,0 +1,95 @@
+"""Latency of one query with 1, 5 and 20 sibling `getTechnicalAverages` fields.
+
+Each field is a distinct upstream-bound `sma` call (its own `timePeriod`), so nothing
+is shared through the cache or single-flight, and only its metadata is selected so
+the time measured is spent waiting on upstream rather than completing the 100
+`Analysis` rows of each field. Compares asyncio's default executor
+size, `min(32, cpus + 4)`, with the library thread pool (`AV_THREAD_POOL_SIZE`).
+
+    python benchmarks/bench_siblings.py [--queries 5] [--latency 0.1]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("AV_DEFAULT_TIER", "unlimited")
+
+from standin import StandIn  # noqa: E402
+
+SIBLINGS = (1, 5, 20)
+
+
+def query(symbol: str, siblings: int) -> str:
+    fields = " ".join(
+        f'f{i}: sma(symbol: "{symbol}", interval: "daily", timePeriod: {10 + i}) '
+        "{ MetaData { timePeriod } }"
+        for i in range(siblings)
+    )
+    return "{ getTechnicalAverages { %s } }" % fields
+
+
+async def run(queries: int, size: int) -> dict[int, float]:
+    """Times queries of each number of siblings with `size` library threads.
+
+    Returns:
+        dict[int, float]: Milliseconds per query by number of siblings.
+    """
+    import httpx  # pylint: disable=import-outside-toplevel
+    import vantage_wrapper  # pylint: disable=import-outside-toplevel
+    from app import app  # pylint: disable=import-outside-toplevel
+
+    vantage_wrapper.threads = vantage_wrapper.LibraryThreads(max_size=size)
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+
+        async def one(symbol: str, siblings: int) -> None:
+            response = await http.post(
+                "/graphql",
+                json={"query": query(symbol, siblings)},
+                headers={"ALPHAVANTAGE_API_KEY": "bench"},
+            )
+            assert not response.json().get("errors"), response.text[:500]
+
+        # ? Opens the threads and connections before timing.
+        await one(f"S{size}WARM", max(SIBLINGS))
+        for siblings in SIBLINGS:
+            start = time.perf_counter()
+            for i in range(queries):
+                await one(f"S{size}X{siblings}X{i}", siblings)
+            results[siblings] = (time.perf_counter() - start) / queries * 1000
+    vantage_wrapper.threads.shutdown()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    default = min(32, (os.cpu_count() or 1) + 4)
+    configured = int(os.getenv("AV_THREAD_POOL_SIZE", "64"))
+    with StandIn(latency=args.latency) as standin:
+        os.environ["AV_URL"] = standin.url
+        before = asyncio.run(run(args.queries, default))
+        after = asyncio.run(run(args.queries, configured))
+
+    print(f"upstream latency {args.latency * 1000:.0f} ms, {args.queries} queries each")
+    print(
+        f"{'siblings':>8} {'sequential':>11} {f'{default} threads':>12} "
+        f"{f'{configured} threads':>12}"
+    )
+    for siblings in SIBLINGS:
+        print(
+            f"{siblings:8d} {siblings * args.latency * 1000:8.0f} ms "
+            f"{before[siblings]:9.0f} ms {after[siblings]:9.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Records upstream indicator responses for the parity tests of the local engine.
+
+Fetches the price series an indicator is computed from (see
+`indicators.series_request`) and the indicator itself from Alpha Vantage, and writes
+both to `tests/fixtures/indicators/`, where `tests/test_indicators.py` picks them up.
+By default the five moving averages are recorded for one daily and one intraday
+series. Needs a real API key and network access; each interval costs one call for
+the series and one per function.
+
+    ALPHAVANTAGE_API_KEY=... python benchmarks/record_indicators.py \\
+        [--symbol IBM] [--intervals daily,60min] [--time-period 20] \\
+        [--series-type close]
+"""
+
+import argparse
+import json
+import os
+import sys
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlencode
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from indicators import AVERAGES, series_request  # noqa: E402
+
+
+def get(params: dict[str, str]) -> dict:
+    """One upstream call."""
+    url = os.environ.get("AV_URL", "https://www.alphavantage.co/query")
+    with urllib.request.urlopen(f"{url}?{urlencode(params)}", timeout=60) as response:
+        payload = json.load(response)
+    assert "Error Message" not in payload, payload["Error Message"]
+    assert "Information" not in payload and "Note" not in payload, payload
+    return payload
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbol", default="IBM")
+    parser.add_argument("--intervals", default="daily,60min")
+    parser.add_argument("--time-period", default="20")
+    parser.add_argument("--series-type", default="close")
+    parser.add_argument("--functions", default=",".join(AVERAGES))
+    args = parser.parse_args()
+
+    key = os.environ["ALPHAVANTAGE_API_KEY"]
+    out = ROOT / "tests" / "fixtures" / "indicators"
+    out.mkdir(parents=True, exist_ok=True)
+    for interval in args.intervals.split(","):
+        series_params, _ = series_request(args.symbol, interval)
+        series = get({**series_params, "apikey": key})
+        for function in args.functions.split(","):
+            params = {
+                "function": function,
+                "symbol": args.symbol,
+                "interval": interval,
+                "time_period": args.time_period,
+                "series_type": args.series_type,
+            }
+            indicator = get({**params, "apikey": key})
+            name = "_".join(
+                (args.symbol, function, interval, args.time_period, args.series_type)
+            )
+            path = out / f"{name.lower()}.json"
+            path.write_text(
+                json.dumps({"params": params, "series": series, "indicator": indicator})
+            )
+            print(f"recorded {path.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Records upstream weekly and monthly responses for the parity tests of the resampler.
+
+Fetches the full daily adjusted history of a symbol and its four weekly and monthly
+series from Alpha Vantage, and writes them to `tests/fixtures/resample/`, where
+`tests/test_resample.py` picks them up. Needs a key with access to
+`TIME_SERIES_DAILY_ADJUSTED` and network access; each recording costs five calls.
+
+    ALPHAVANTAGE_API_KEY=... python benchmarks/record_resample.py [--symbol IBM]
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from record_indicators import get  # noqa: E402
+from resample import RESAMPLED  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbol", default="IBM")
+    args = parser.parse_args()
+
+    key = os.environ["ALPHAVANTAGE_API_KEY"]
+    daily = get(
+        {
+            "function": "TIME_SERIES_DAILY_ADJUSTED",
+            "symbol": args.symbol,
+            "outputsize": "full",
+            "apikey": key,
+        }
+    )
+    resampled = {
+        function: get({"function": function, "symbol": args.symbol, "apikey": key})
+        for function in RESAMPLED
+    }
+    out = ROOT / "tests" / "fixtures" / "resample"
+    out.mkdir(parents=True, exist_ok=True)
+    path = out / f"{args.symbol.lower()}.json"
+    path.write_text(json.dumps({"daily": daily, "resampled": resampled}))
+    print(f"recorded {path.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
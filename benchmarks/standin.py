@@ -0,0 +1,257 @@
+"""A local stand-in for the Alpha Vantage API, used by the benchmarks.
+
+It serves deterministic, correctly shaped payloads for the time series (intraday
+included), quote, bulk quote (denied to the key `free`) and indicator functions,
+with a configurable latency per call, and counts the calls it receives so a
+benchmark can report how many reached "upstream".
+"""
+
+import functools
+import json
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+_SERIES_KEYS = {
+    "TIME_SERIES_DAILY": "Time Series (Daily)",
+    "TIME_SERIES_DAILY_ADJUSTED": "Time Series (Daily)",
+    "TIME_SERIES_WEEKLY": "Weekly Time Series",
+    "TIME_SERIES_WEEKLY_ADJUSTED": "Weekly Adjusted Time Series",
+    "TIME_SERIES_MONTHLY": "Monthly Time Series",
+    "TIME_SERIES_MONTHLY_ADJUSTED": "Monthly Adjusted Time Series",
+}
+
+
+@functools.cache
+def make_bars(count: int, adjusted: bool = False, seed: int = 0) -> dict:
+    """Builds `count` business-day bars ending on 2024-03-01, newest first.
+
+    They are only built once per arguments; the result must not be mutated.
+
+    Args:
+        count (int): The number of bars.
+        adjusted (bool, optional): Emit the adjusted layout. Defaults to False.
+        seed (int, optional): Shifts the generated prices. Defaults to 0.
+
+    Returns:
+        dict: The bars keyed by date, as Alpha Vantage returns them.
+    """
+    bars: dict[str, dict[str, str]] = {}
+    day = date(2024, 3, 1)
+    i = 0
+    while len(bars) < count:
+        if day.weekday() < 5:
+            base = 100.0 + seed + ((i * 37) % 101) / 10.0
+            bar = {
+                "1. open": f"{base:.4f}",
+                "2. high": f"{base + 1.5:.4f}",
+                "3. low": f"{base - 1.25:.4f}",
+                "4. close": f"{base + 0.5:.4f}",
+            }
+            if adjusted:
+                bar["5. adjusted close"] = f"{base + 0.25:.4f}"
+                bar["6. volume"] = str(1_000_000 + i * 7)
+                bar["7. dividend amount"] = "0.0000"
+                bar["8. split coefficient"] = "1.0"
+            else:
+                bar["5. volume"] = str(1_000_000 + i * 7)
+            bars[day.isoformat()] = bar
+            i += 1
+        day -= timedelta(days=1)
+    return bars
+
+
+@functools.cache
+def make_intraday(count: int, size: int) -> dict:
+    """Builds `count` intraday bars of `size` minutes, newest first.
+
+    Bars are keyed by their start and cover 04:00 to 20:00 of the business days up to
+    2024-03-01, as Alpha Vantage's extended hours series do. They do not depend on the
+    symbol, so they are only built once; the result must not be mutated.
+
+    Args:
+        count (int): The number of bars.
+        size (int): The minutes of a bar.
+
+    Returns:
+        dict: The bars keyed by timestamp.
+    """
+    bars: dict[str, dict[str, str]] = {}
+    day = date(2024, 3, 1)
+    while len(bars) < count:
+        if day.weekday() < 5:
+            for start in range(20 * 60 - size, 4 * 60 - 1, -size):
+                if len(bars) == count:
+                    break
+                # ? Prices follow the minute of the day, so coarser bars stay consistent.
+                base = 100.0 + (start % 97) / 10.0 + day.day
+                bars[f"{day.isoformat()} {start // 60:02d}:{start % 60:02d}:00"] = {
+                    "1. open": f"{base:.4f}",
+                    "2. high": f"{base + 1.5:.4f}",
+                    "3. low": f"{base - 1.25:.4f}",
+                    "4. close": f"{base + 0.5:.4f}",
+                    "5. volume": str(1000 * size),
+                }
+        day -= timedelta(days=1)
+    return bars
+
+
+def make_payload(params: dict[str, str]) -> dict:
+    """Builds the response for one request.
+
+    Args:
+        params (dict[str, str]): The query string parameters.
+
+    Returns:
+        dict: The response body.
+    """
+    function = params.get("function", "")
+    symbol = params.get("symbol", "IBM")
+    if function == "GLOBAL_QUOTE":
+        return {
+            "Global Quote": {
+                "01. symbol": symbol,
+                "02. open": "100.0000",
+                "03. high": "101.0000",
+                "04. low": "99.0000",
+                "05. price": "100.5000",
+                "06. volume": "1000000",
+                "07. latest trading day": "2024-03-01",
+                "08. previous close": "100.0000",
+                "09. change": "0.5000",
+                "10. change percent": "0.5000%",
+            }
+        }
+    if function == "REALTIME_BULK_QUOTES":
+        if params.get("apikey") == "free":
+            return {"Information": "This is a premium endpoint."}
+        return {
+            "endpoint": "Realtime Bulk Quotes",
+            "message": "",
+            "data": [
+                {
+                    "symbol": name,
+                    "timestamp": "2024-03-01 16:00:00.000",
+                    "open": "100.0000",
+                    "high": "101.0000",
+                    "low": "99.0000",
+                    "close": "100.5000",
+                    "volume": "1000000",
+                    "previous_close": "100.0000",
+                    "change": "0.5000",
+                    "change_percent": "0.5000",
+                }
+                for name in symbol.split(",")
+            ],
+        }
+    if function == "TIME_SERIES_INTRADAY":
+        interval = params.get("interval", "5min")
+        size = int(interval.removesuffix("min"))
+        count = 30 * 16 * 60 // size if params.get("outputsize") == "full" else 100
+        bars = make_intraday(count, size)
+        return {
+            "Meta Data": {
+                "1. Information": f"Intraday ({interval}) stand-in",
+                "2. Symbol": symbol,
+                "3. Last Refreshed": next(iter(bars)),
+                "4. Interval": interval,
+                "5. Output Size": params.get("outputsize", "Compact").title(),
+                "6. Time Zone": "US/Eastern",
+            },
+            f"Time Series ({interval})": bars,
+        }
+    if function in _SERIES_KEYS:
+        count = 5000 if params.get("outputsize") == "full" else 100
+        return {
+            "Meta Data": {
+                "1. Information": f"{function} stand-in",
+                "2. Symbol": symbol,
+                "3. Last Refreshed": "2024-03-01",
+                "4. Output Size": params.get("outputsize", "Compact").title(),
+                "5. Time Zone": "US/Eastern",
+            },
+            _SERIES_KEYS[function]: make_bars(count, "ADJUSTED" in function),
+        }
+    if function in ("SMA", "EMA", "WMA", "DEMA", "TEMA"):
+        return {
+            "Meta Data": {
+                "1: Symbol": symbol,
+                "2: Indicator": function,
+                "3: Last Refreshed": "2024-03-01",
+                "4: Interval": params.get("interval", "weekly"),
+                "5: Time Period": int(params.get("time_period", "60")),
+                "6: Series Type": params.get("series_type", "open"),
+                "7: Time Zone": "US/Eastern",
+            },
+            f"Technical Analysis: {function}": {
+                day: {function: bar["1. open"]} for day, bar in make_bars(100).items()
+            },
+        }
+    return {"Error Message": f"Unknown function {function}"}
+
+
+class StandIn:
+    """Runs the stand-in upstream on a background thread.
+
+    Args:
+        latency (float, optional): Seconds to wait before answering. Defaults to 0.05.
+    """
+
+    def __init__(self, latency: float = 0.05) -> None:
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._cache: dict[tuple, bytes] = {}
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # ? Headers and body are written separately; with Nagle on, the body of a
+            # ? kept-alive connection waits for the delayed ACK of the headers (~40 ms).
+            disable_nagle_algorithm = True
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                params = dict(parse_qsl(urlsplit(self.path).query))
+                with standin._lock:
+                    standin.calls += 1
+                key = (
+                    params.get("apikey") == "free",
+                    *sorted((k, v) for k, v in params.items() if k != "apikey"),
+                )
+                body = standin._cache.get(key)
+                if body is None:
+                    body = json.dumps(make_payload(params)).encode()
+                    standin._cache[key] = body
+                time.sleep(standin.latency)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """The query endpoint of the stand-in.
+
+        Returns:
+            str: The URL to use as `AV_URL`.
+        """
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/query"
+
+    def __enter__(self) -> "StandIn":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,570 @@
+import asyncio
+import hashlib
+import logging
+import marshal
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from os import getenv
+from typing import Callable, Mapping, Protocol
+from urllib.parse import urlencode
+
+from dotenv import load_dotenv
+from scheduler import lane
+
+load_dotenv()
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+DEFAULT_TTLS: dict[str, int] = {
+    "GLOBAL_QUOTE": MINUTE,
+    "REALTIME_BULK_QUOTES": MINUTE,
+    "CURRENCY_EXCHANGE_RATE": MINUTE,
+    "TIME_SERIES_INTRADAY": 5 * MINUTE,
+    "CRYPTO_INTRADAY": 5 * MINUTE,
+    "TIME_SERIES_DAILY": HOUR,
+    "TIME_SERIES_DAILY_ADJUSTED": HOUR,
+    "DIGITAL_CURRENCY_DAILY": HOUR,
+    "SMA": HOUR,
+    "EMA": HOUR,
+    "WMA": HOUR,
+    "DEMA": HOUR,
+    "TEMA": HOUR,
+    "TIME_SERIES_WEEKLY": 6 * HOUR,
+    "TIME_SERIES_WEEKLY_ADJUSTED": 6 * HOUR,
+    "DIGITAL_CURRENCY_WEEKLY": 6 * HOUR,
+    "TIME_SERIES_MONTHLY": DAY,
+    "TIME_SERIES_MONTHLY_ADJUSTED": DAY,
+    "DIGITAL_CURRENCY_MONTHLY": DAY,
+    "OVERVIEW": DAY,
+    "BALANCE_SHEET": WEEK,
+    "CASH_FLOW": WEEK,
+    "INCOME_STATEMENT": WEEK,
+    "EARNINGS": WEEK,
+    # ? Economic indicators and commodities are published daily at most.
+    "REAL_GDP": DAY,
+    "REAL_GDP_PER_CAPITA": DAY,
+    "TREASURY_YIELD": DAY,
+    "FEDERAL_FUNDS_RATE": DAY,
+    "CPI": DAY,
+    "INFLATION": DAY,
+    "RETAIL_SALES": DAY,
+    "DURABLES": DAY,
+    "UNEMPLOYMENT": DAY,
+    "NONFARM_PAYROLL": DAY,
+    "WTI": DAY,
+    "BRENT": DAY,
+    "NATURAL_GAS": DAY,
+    "COPPER": DAY,
+    "ALUMINUM": DAY,
+    "WHEAT": DAY,
+    "CORN": DAY,
+    "COTTON": DAY,
+    "SUGAR": DAY,
+    "COFFEE": DAY,
+    "ALL_COMMODITIES": DAY,
+}
+
+_UNCACHEABLE_KEYS = ("Error Message", "Information", "Note")
+
+
+def load_ttls() -> dict[str, int]:
+    """Reads the TTLs per function, overridden by `AV_CACHE_TTLS`.
+
+    `AV_CACHE_TTLS` is a comma-separated list of `FUNCTION=seconds`, e.g.
+    `AV_CACHE_TTLS=GLOBAL_QUOTE=15,BALANCE_SHEET=86400`. A TTL of `0` disables caching
+    for that function.
+
+    Returns:
+        dict[str, int]: The TTLs in seconds by function.
+    """
+    ttls = dict(DEFAULT_TTLS)
+    for item in (getenv("AV_CACHE_TTLS") or "").split(","):
+        function, _, seconds = item.partition("=")
+        if seconds:
+            ttls[function.strip().upper()] = int(seconds)
+    return ttls
+
+
+def cache_key(params: Mapping[str, str]) -> str:
+    """The cache key of a normalized request.
+
+    The API key is left out: Alpha Vantage serves the same data to every key, so
+    entries are shared between all users (and, with a shared backend, all workers).
+
+    Args:
+        params (Mapping[str, str]): The normalized query string parameters.
+
+    Returns:
+        str: The key.
+    """
+    return urlencode([(k, v) for k, v in params.items() if k != "apikey"])
+
+
+@dataclass(frozen=True)
+class Entry:
+    """A cached response."""
+
+    payload: dict
+    stored_at: float
+    expires_at: float
+    size: int
+
+
+_MAGIC = b"AVC1"
+_HEADER = struct.Struct("<4sdd")
+
+
+def encode_entry(payload: dict, stored_at: float, expires_at: float) -> bytes:
+    """Serializes an entry into the compact binary format shared by all backends.
+
+    The layout is a fixed header (magic, `stored_at`, `expires_at`) followed by the
+    zlib-compressed `marshal` encoding of the payload. `marshal` only handles plain
+    data and decodes several times faster than JSON; like the interpreter's own
+    `.pyc` files it is tied to the Python version, so all workers sharing a backend
+    must run the same one, and the backend must only be writable by them.
+
+    Args:
+        payload (dict): The decoded response.
+        stored_at (float): When the response was fetched (epoch seconds).
+        expires_at (float): When the response goes stale (epoch seconds).
+
+    Returns:
+        bytes: The encoded entry.
+    """
+    return _HEADER.pack(_MAGIC, stored_at, expires_at) + zlib.compress(
+        marshal.dumps(payload), 1
+    )
+
+
+def decode_entry(raw: bytes) -> Entry | None:
+    """Deserializes an entry written by `encode_entry`.
+
+    Args:
+        raw (bytes): The encoded entry.
+
+    Returns:
+        Entry | None: The entry, or `None` if `raw` is not in the expected format,
+            truncated or corrupt.
+    """
+    if len(raw) < _HEADER.size:
+        return None
+    magic, stored_at, expires_at = _HEADER.unpack_from(raw)
+    if magic != _MAGIC:
+        return None
+    try:
+        payload = marshal.loads(zlib.decompress(raw[_HEADER.size :]))
+    except (zlib.error, ValueError, EOFError, TypeError):
+        return None
+    return Entry(
+        payload=payload, stored_at=stored_at, expires_at=expires_at, size=len(raw)
+    )
+
+
+class CacheBackend(Protocol):
+    """Storage shared by the workers, holding encoded entries.
+
+    Methods are blocking; `ResponseCache` calls them from a worker thread.
+    """
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, ttl: int) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class FileBackend:
+    """One file per entry under `directory`, e.g. on a filesystem shared by workers.
+
+    Writes go to a temporary file that is renamed into place, so readers in other
+    processes never observe a partial entry. The modification time of a file is set to
+    its expiry: expired files are misses, and are deleted by `sweep`, which writes run
+    every `sweep_interval` seconds.
+
+    Args:
+        directory (str): Where entries are written; created if missing.
+        sweep_interval (float, optional): Seconds between sweeps. Defaults to an hour.
+    """
+
+    def __init__(self, directory: str, sweep_interval: float = HOUR) -> None:
+        self.directory = directory
+        self.sweep_interval = sweep_interval
+        self._swept_at = time.time()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            with open(self._path(key), "rb") as f:
+                if os.fstat(f.fileno()).st_mtime <= time.time():
+                    return None
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        now = time.time()
+        with open(tmp, "wb") as f:
+            f.write(value)
+        os.utime(tmp, (now, now + ttl))
+        os.replace(tmp, path)
+        if now - self._swept_at > self.sweep_interval:
+            self._swept_at = now
+            self.sweep()
+
+    def sweep(self) -> int:
+        """Deletes the expired entries, and temporary files left behind by writers
+        that died more than `sweep_interval` seconds ago.
+
+        Returns:
+            int: The number of files deleted.
+        """
+        now = time.time()
+        deleted = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    expires_at = entry.stat().st_mtime
+                    if entry.name.endswith(".tmp"):
+                        expires_at += self.sweep_interval
+                    if expires_at <= now:
+                        os.remove(entry.path)
+                        deleted += 1
+                except FileNotFoundError:
+                    pass
+        return deleted
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class RedisBackend:
+    """Entries stored in Redis (or anything speaking its protocol) with native expiry.
+
+    Args:
+        client: A `redis.Redis`-compatible client (`get`, `set(..., ex=)`, `delete`).
+        prefix (str, optional): Namespace of the keys. Defaults to "av:".
+    """
+
+    def __init__(self, client, prefix: str = "av:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        """Connects to the Redis server at `url`.
+
+        Args:
+            url (str): e.g. `redis://localhost:6379/0`.
+
+        Returns:
+            RedisBackend: The backend.
+        """
+        import redis  # pylint: disable=import-outside-toplevel
+
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.client.set(self.prefix + key, value, ex=max(int(ttl), 1))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+
+class GuardedBackend:
+    """A backend whose failures are logged and counted instead of raised.
+
+    A Redis outage or a full disk then only costs the shared tier: reads miss, writes
+    are dropped, and the in-process tier keeps serving.
+
+    Args:
+        backend (CacheBackend): The backend.
+    """
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _guard[T](self, call: Callable[[], T], default: T) -> T:
+        try:
+            return call()
+        except Exception as error:  # pylint: disable=broad-except
+            with self._lock:
+                self.errors += 1
+            logging.warning(
+                f"Cache backend {type(self.backend).__name__} failed: {error!r}"
+            )
+            return default
+
+    def get(self, key: str) -> bytes | None:
+        return self._guard(lambda: self.backend.get(key), None)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._guard(lambda: self.backend.set(key, value, ttl), None)
+
+    def delete(self, key: str) -> None:
+        self._guard(lambda: self.backend.delete(key), None)
+
+
+def load_backend() -> CacheBackend | None:
+    """Builds the shared backend configured in the environment.
+
+    `AV_CACHE_BACKEND` selects `redis` (at `AV_REDIS_URL`) or `file` (under
+    `AV_CACHE_DIR`). When unset, the backend is inferred from whichever of the two
+    variables is present; without either, only the in-process tier is used.
+
+    Returns:
+        CacheBackend | None: The backend.
+    """
+    backend = (getenv("AV_CACHE_BACKEND") or "").lower()
+    if backend == "redis" or (not backend and getenv("AV_REDIS_URL")):
+        return RedisBackend.from_url(getenv("AV_REDIS_URL", "redis://localhost:6379/0"))
+    if backend == "file" or (not backend and getenv("AV_CACHE_DIR")):
+        return FileBackend(getenv("AV_CACHE_DIR", ".av_cache"))
+    return None
+
+
+class MemoryLRU:
+    """In-process LRU of entries, bounded by the encoded byte size of their payloads.
+
+    Args:
+        max_bytes (int): The budget of all entries.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Entry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Entry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old.size
+            self._entries[key] = entry
+            self.bytes += entry.size
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted.size
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old.size
+
+
+class ResponseCache:
+    """Two-tier cache of upstream responses with a TTL per Alpha Vantage `function`.
+
+    Lookups try the in-process LRU first, then the shared backend (see
+    `load_backend`), promoting shared hits into memory. With a shared backend, every
+    uvicorn worker behind `app.py` reads and fills the same entries; its failures are
+    logged and counted, and leave the memory tier serving (see `GuardedBackend`).
+    Error and rate-limit responses are never stored.
+
+    Expired entries are kept for a grace period: up to `max_stale` seconds past
+    expiry they may be served while they are refreshed in the background, and up to
+    `stale_if_error` seconds when the upstream call fails (see `upstream.fetch_json`).
+
+    Configuration (environment):
+        AV_CACHE_MAX_BYTES: Memory budget of the LRU. Defaults to 256 MiB.
+        AV_CACHE_BACKEND, AV_REDIS_URL, AV_CACHE_DIR: The shared tier.
+        AV_CACHE_DEFAULT_TTL: TTL of functions without their own. Defaults to 300.
+        AV_CACHE_TTLS: Per-function overrides, see `load_ttls`.
+        AV_CACHE_MAX_STALE: Seconds past expiry an entry is served while it is
+            refreshed. Defaults to 0 (disabled).
+        AV_CACHE_STALE_IF_ERROR: Seconds past expiry an entry is served when the
+            upstream call fails or the quota is spent. Defaults to a day.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int | None = None,
+        backend: CacheBackend | None = None,
+        ttls: dict[str, int] | None = None,
+        default_ttl: int | None = None,
+        max_stale: int | None = None,
+        stale_if_error: int | None = None,
+    ) -> None:
+        self.memory = MemoryLRU(
+            max_bytes or int(getenv("AV_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+        )
+        backend = backend if backend is not None else load_backend()
+        self.backend = GuardedBackend(backend) if backend is not None else None
+        self.ttls = ttls if ttls is not None else load_ttls()
+        self.default_ttl = (
+            default_ttl
+            if default_ttl is not None
+            else int(getenv("AV_CACHE_DEFAULT_TTL", "300"))
+        )
+        self.max_stale = (
+            max_stale
+            if max_stale is not None
+            else int(getenv("AV_CACHE_MAX_STALE", "0"))
+        )
+        self.stale_if_error = (
+            stale_if_error
+            if stale_if_error is not None
+            else int(getenv("AV_CACHE_STALE_IF_ERROR", str(DAY)))
+        )
+        self.memory_hits = 0
+        self.shared_hits = 0
+        self.stale_hits = 0
+        self.stale_fallbacks = 0
+        self.misses = 0
+        self.expired = 0
+        self.lane_lookups: Counter[str] = Counter()
+        self.lane_hits: Counter[str] = Counter()
+
+    def ttl(self, function: str | None) -> int:
+        """The TTL of `function` in seconds."""
+        return self.ttls.get((function or "").upper(), self.default_ttl)
+
+    @property
+    def grace(self) -> int:
+        """Seconds an entry is kept past its expiry."""
+        return max(self.max_stale, self.stale_if_error, 0)
+
+    async def lookup(self, params: Mapping[str, str]) -> Entry | None:
+        """Returns the cached entry of a request, fresh or within its grace period.
+
+        Args:
+            params (Mapping[str, str]): The normalized query string parameters.
+
+        Returns:
+            Entry | None: The entry; its payload is shared and must not be mutated.
+        """
+        if self.ttl(params.get("function")) <= 0:
+            return None
+        key = cache_key(params)
+        now = time.time()
+        entry = self.memory.get(key)
+        shared = False
+        if entry is not None and entry.expires_at + self.grace <= now:
+            self.memory.delete(key)
+            self.expired += 1
+            entry = None
+        if entry is None and self.backend is not None:
+            raw = await asyncio.to_thread(self.backend.get, key)
+            entry = decode_entry(raw) if raw else None
+            if raw and entry is None:
+                await asyncio.to_thread(self.backend.delete, key)
+            if entry is not None and entry.expires_at + self.grace > now:
+                shared = True
+                self.memory.set(key, entry)
+            else:
+                entry = None
+        self.lane_lookups[lane.get()] += 1
+        if entry is None:
+            self.misses += 1
+        elif entry.expires_at <= now:
+            self.stale_hits += 1
+        else:
+            self.lane_hits[lane.get()] += 1
+            if shared:
+                self.shared_hits += 1
+            else:
+                self.memory_hits += 1
+        return entry
+
+    async def get(self, params: Mapping[str, str]) -> dict | None:
+        """Returns the fresh cached response of a request, if any.
+
+        Args:
+            params (Mapping[str, str]): The normalized query string parameters.
+
+        Returns:
+            dict | None: The cached response. It is shared and must not be mutated.
+        """
+        entry = await self.lookup(params)
+        if entry is None or entry.expires_at <= time.time():
+            return None
+        return entry.payload
+
+    async def set(self, params: Mapping[str, str], payload: dict) -> None:
+        """Stores a response under the TTL of its function.
+
+        Args:
+            params (Mapping[str, str]): The normalized query string parameters.
+            payload (dict): The decoded response.
+        """
+        ttl = self.ttl(params.get("function"))
+        if ttl <= 0 or not payload or any(k in payload for k in _UNCACHEABLE_KEYS):
+            return
+        key = cache_key(params)
+        now = time.time()
+        encoded = encode_entry(payload, now, now + ttl)
+        self.memory.set(
+            key,
+            Entry(
+                payload=payload, stored_at=now, expires_at=now + ttl, size=len(encoded)
+            ),
+        )
+        if self.backend is not None:
+            await asyncio.to_thread(self.backend.set, key, encoded, ttl + self.grace)
+
+    def stats(self) -> dict[str, int | float | str | dict | None]:
+        """Hit, miss and eviction counters, and the size of the memory tier.
+
+        Fresh-hit rates are also broken down by scheduler lane, so the hit rate seen
+        by interactive callers is not diluted by background prefetching.
+
+        Returns:
+            dict[str, int | float | str | dict | None]: The statistics.
+        """
+        hits = self.memory_hits + self.shared_hits
+        lookups = hits + self.stale_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "shared_hits": self.shared_hits,
+            "stale_hits": self.stale_hits,
+            "stale_fallbacks": self.stale_fallbacks,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "hit_rate_by_lane": {
+                name: self.lane_hits[name] / count
+                for name, count in self.lane_lookups.items()
+            },
+            "expired": self.expired,
+            "evictions": self.memory.evictions,
+            "entries": len(self.memory),
+            "bytes": self.memory.bytes,
+            "max_bytes": self.memory.max_bytes,
+            "backend": type(self.backend.backend).__name__ if self.backend else None,
+            "backend_errors": self.backend.errors if self.backend else 0,
+        }
@@ -1,17 +1,16 @@
-from typing import Tuple, Callable, List
-from os import getenv
-from requests import get
+from typing import Tuple, Callable, List, Awaitable
 from dotenv import load_dotenv
 from strawberry.types.info import Info as _Info, RootValueType
 from strawberry_permissions import GraphQLContext
-from strawberry_interfaces import TimeSeriesInterface, TimeSeriesData, TimeSeriesAdjustedData, TimeSeriesMetadata, TimeSeriesAdjustedInterface, DigitalCurrencyIntradayInterface, CommoditiesInterface, CommodoitiesDataInterface, DigitalCurrencyInterface, DigitalCurrencyMetadata, DigitalCurrencySeries
+from series import SeriesFrame
+from strawberry_interfaces import TimeSeriesInterface, TimeSeriesMetadata, TimeSeriesAdjustedInterface, DigitalCurrencyIntradayInterface, CommoditiesInterface, DigitalCurrencyInterface, DigitalCurrencyMetadata
 
 type ReturnTuple = Tuple[str | None, str | None, str | None]
 type Info = _Info[GraphQLContext, RootValueType]
 type TSeries = TimeSeriesAdjustedInterface | TimeSeriesInterface
 load_dotenv()
 
-def _extract_time_series_adjusted[**P](fn: Callable[P, dict]) -> Callable[P, TimeSeriesAdjustedInterface]: #! pylint: disable=e0602
+def _extract_time_series_adjusted[**P](fn: Callable[P, Awaitable[dict]]) -> Callable[P, Awaitable[TimeSeriesAdjustedInterface]]: #! pylint: disable=e0602
     """
     This function creates a wrapper function that extracts the adjusted time series data from the Alpha Vantage API response.
 
@@ -39,7 +38,7 @@ def _extract_time_series_adjusted[**P](fn: Callable[P, dict]) -> Callable[P, Tim
             time_zone=series.get("5. Time Zone"),
         )
         return n
-    def wrapper(*args: P.args, **kwargs: P.kwargs) -> TimeSeriesAdjustedInterface:
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> TimeSeriesAdjustedInterface:
         """
         This function is the wrapper function that calls the given function and extracts the adjusted time series data.
 
@@ -50,35 +49,20 @@ def _extract_time_series_adjusted[**P](fn: Callable[P, dict]) -> Callable[P, Tim
         Returns:
             TimeSeriesAdjustedInterface: The adjusted time series data.
         """
-        data: dict = fn(*args, **kwargs)
+        data: dict = await fn(*args, **kwargs)
         vals = list(data.values())
         metadata: dict[str,str] = vals[0]
         assert metadata is not None, "No Meta Data found"
         series: dict[str, dict[str,float]] = vals[1]
         assert series is not None, "No Time Series found"
-        series_items = series.items() # date -> {series}
         made_metadata: TimeSeriesMetadata = _make_metadata(metadata)
-        l: List[TimeSeriesAdjustedData] = []
-        for date, time_series in series_items:
-            l.append(
-                TimeSeriesAdjustedData(
-                    date=date,
-                    open=time_series.get("1. open"),
-                    high=time_series.get("2. high"),
-                    low=time_series.get("3. low"),
-                    close=time_series.get("4. close"),
-                    adjusted_close=time_series.get("5. adjusted close"),
-                    volume=time_series.get("6. volume"),
-                    dividend_amount=time_series.get("7. dividend amount"),
-                )
-            )
         return TimeSeriesAdjustedInterface(
             metadata=made_metadata,
-            data=l
+            frame=SeriesFrame.of(series)
         )
     return wrapper
 
-def _extract_time_series[**P](fn: Callable[P, dict]) -> Callable[P, TimeSeriesInterface]: # !! pylint: disable=e0602
+def _extract_time_series[**P](fn: Callable[P, Awaitable[dict]]) -> Callable[P, Awaitable[TimeSeriesInterface]]: # !! pylint: disable=e0602
     """
     This function creates a wrapper function that extracts the time series data from the Alpha Vantage API response.
 
@@ -106,7 +90,7 @@ def _extract_time_series[**P](fn: Callable[P, dict]) -> Callable[P, TimeSeriesIn
             time_zone=series.get("5. Time Zone"),
         )
         return n
-    def wrapper(*args: P.args, **kwargs: P.kwargs) -> TimeSeriesInterface:
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> TimeSeriesInterface:
         """
         This function is the wrapper function that calls the given function and extracts the time series data.
 
@@ -117,33 +101,20 @@ def _extract_time_series[**P](fn: Callable[P, dict]) -> Callable[P, TimeSeriesIn
         Returns:
             TimeSeriesInterface: The time series data.
         """
-        data: dict = fn(*args, **kwargs)
+        data: dict = await fn(*args, **kwargs)
         vals = list(data.values())
         metadata: dict[str,str] = vals[0]
         assert metadata is not None, "No Meta Data found"
         series: dict[str, dict[str,float]] = vals[1]
         assert series is not None, "No Time Series found"
-        series_items = series.items() # date -> {series}
         made_metadata: TimeSeriesMetadata = _make_metadata(metadata)
-        l: List[TimeSeriesData] = []
-        for date, time_series in series_items:
-            l.append(
-                TimeSeriesData(
-                    date=date,
-                    open=time_series.get("1. open"),
-                    high=time_series.get("2. high"),
-                    low=time_series.get("3. low"),
-                    close=time_series.get("4. close"),
-                    volume=time_series.get("5. volume"),
-                )
-            )
         return TimeSeriesInterface(
             metadata=made_metadata,
-            data=l
+            frame=SeriesFrame.of(series)
         )
     return wrapper
 
-def _extract_crypto_intraday[**P](fn: Callable[P, dict]) -> Callable[P, DigitalCurrencyIntradayInterface]:  #! pylint: disable=e0602
+def _extract_crypto_intraday[**P](fn: Callable[P, Awaitable[dict]]) -> Callable[P, Awaitable[DigitalCurrencyIntradayInterface]]:  #! pylint: disable=e0602
     """
     This function extracts the intraday data for a digital currency from the Alpha Vantage API response.
 
@@ -153,8 +124,8 @@ def _extract_crypto_intraday[**P](fn: Callable[P, dict]) -> Callable[P, DigitalC
     Returns:
         Callable[[P], DigitalCurrencyIntradayInterface]: A function that returns the intraday data for a digital currency.
     """
-    def wrapper(*args: P.args, **kwargs: P.kwargs) -> DigitalCurrencyIntradayInterface:
-        data: dict = fn(*args, **kwargs)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> DigitalCurrencyIntradayInterface:
+        data: dict = await fn(*args, **kwargs)
         metadata: dict = data.get("Meta Data")
         assert metadata is not None, "No Meta Data found"
         interval: str | None = kwargs.get("interval")
@@ -162,18 +133,6 @@ def _extract_crypto_intraday[**P](fn: Callable[P, dict]) -> Callable[P, DigitalC
         ts_key = f"Time Series Crypto ({interval})"
         series: dict | None = data.get(ts_key)
         assert series is not None, "No Time Series found"
-        series_items: dict = series.items()
-        l: List[TimeSeriesInterface] = []
-        for k, v in series_items:
-            n = TimeSeriesInterface(
-                date=k,
-                open=v.get("1. open"),
-                high=v.get("2. high"),
-                low=v.get("3. low"),
-                close=v.get("4. close"),
-                volume=v.get("5. volume"),
-            )
-            l.append(n)
         n = DigitalCurrencyIntradayInterface(
             metadata=DigitalCurrencyMetadata(
                 information=metadata.get("1. Information"),
@@ -184,12 +143,12 @@ def _extract_crypto_intraday[**P](fn: Callable[P, dict]) -> Callable[P, DigitalC
                 last_updated=metadata.get("6. Last Refreshed"),
                 time_zone=metadata.get("9. Time Zone"),
             ),
-            series=l,
+            frame=SeriesFrame.of(series),
         )
         return n
     return wrapper
 
-def _extract_digital_currencies[**P](fn: Callable[P, dict]) -> Callable[P, DigitalCurrencyInterface]:  #! pylint: disable=e0602
+def _extract_digital_currencies[**P](fn: Callable[P, Awaitable[dict]]) -> Callable[P, Awaitable[DigitalCurrencyInterface]]:  #! pylint: disable=e0602
     """
     This function extracts the intraday data for a digital currency from the Alpha Vantage API response.
 
@@ -207,31 +166,14 @@ def _extract_digital_currencies[**P](fn: Callable[P, dict]) -> Callable[P, Digit
         if d.get("Time Series (Digital Currency Daily)") is not None:
             return d.get("Time Series (Digital Currency Daily)")
         return None
-    def wrapper(*args: P.args, **kwargs: P.kwargs) -> DigitalCurrencyInterface:
-        data: dict = fn(*args, **kwargs)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> DigitalCurrencyInterface:
+        data: dict = await fn(*args, **kwargs)
         metadata: dict = data.get("Meta Data")
         assert metadata is not None, "No Meta Data found"
         series: dict | None = _get_series(data)
         assert series is not None, "No Time Series found"
-        series_items: dict = series.items()
-        l: List[DigitalCurrencySeries] = []
         market: str | None = kwargs.get("market")
         assert market is not None, "No market specified"
-        for k, v in series_items:
-            n = DigitalCurrencySeries(
-                date=k,
-                open_market=v.get(f"1a. open ({market.upper()})"),
-                open_usd=v.get("1b. open (USD)"),
-                high_market=v.get(f"2a. high ({market.upper()})"),
-                high_usd=v.get("2b. high (USD)"),
-                low_market=v.get(f"3a. low ({market.upper()})"),
-                low_usd=v.get("3b. low (USD)"),
-                close_market=v.get(f"4a. close ({market.upper()})"),
-                close_usd=v.get("4b. close (USD)"),
-                volume=v.get("5. volume"),
-                market_cap_usd=v.get("6. market cap (USD)"),
-            )
-            l.append(n)
         n = DigitalCurrencyInterface(
             metadata=DigitalCurrencyMetadata(
                 information=metadata.get("1. Information"),
@@ -242,11 +184,12 @@ def _extract_digital_currencies[**P](fn: Callable[P, dict]) -> Callable[P, Digit
                 last_updated=metadata.get("6. Last Refreshed"),
                 time_zone=metadata.get("7. Time Zone"),
             ),
-            series=l,
+            market=market,
+            frame=SeriesFrame.of(series),
         )
         return n
     return wrapper
-def _extract_commodoties[**P](fn: Callable[P, dict]) -> Callable[P, CommoditiesInterface]:  #! pylint: disable=e0602
+def _extract_commodoties[**P](fn: Callable[P, Awaitable[dict]]) -> Callable[P, Awaitable[CommoditiesInterface]]:  #! pylint: disable=e0602
     """
     This function extracts the intraday data for a digital currency from the Alpha Vantage API response.
 
@@ -256,19 +199,16 @@ def _extract_commodoties[**P](fn: Callable[P, dict]) -> Callable[P, CommoditiesI
     Returns:
         Callable[[P], CommoditiesInterface]: A function that returns the intraday data for a digital currency.
     """
-    def _process_data(l: List[dict]):
-        return [
-            CommodoitiesDataInterface(date=v.get("date"), value=v.get("value"))
-            for v in l
-        ]
-    
-    def wrapper(*args: P.args, **kwargs: P.kwargs) -> CommoditiesInterface:
-        data: dict = fn(*args, **kwargs)
+    def _process_data(l: List[dict]) -> SeriesFrame:
+        return SeriesFrame({v.get("date"): v for v in l})
+
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> CommoditiesInterface:
+        data: dict = await fn(*args, **kwargs)
         n = CommoditiesInterface(
             name=data.get("name"),
             interval=data.get("interval"),
             unit=data.get("unit"),
-            data=_process_data(data.get("data")),
+            frame=_process_data(data.get("data")),
         )
         return n
     return wrapper
@@ -285,7 +225,7 @@ def _make_api_call[**P](fn: Callable[P, ReturnTuple]):  # ! pylint: disable=e060
         Callable[..., ReturnTuple]: The wrapped function.
     """
 
-    def wrapper(*args: P.args, **kwargs: P.kwargs):
+    async def wrapper(*args: P.args, **kwargs: P.kwargs):
         """
         This function is the inner wrapper that makes the API call and handles the response.
 
@@ -296,21 +236,18 @@ def _make_api_call[**P](fn: Callable[P, ReturnTuple]):  # ! pylint: disable=e060
         Returns:
             The return value of the function that makes the API call.
         """
-        uri = getenv("AV_URL")
         info: Info | None = kwargs.get("info") if kwargs.get("info") else None
         api_key = (
             info.context.request.headers.get("ALPHAVANTAGE_API_KEY") if info else None
         )
         assert info, "API Key and URI are required"
-        _args = kwargs.items()
-        uri += f"?apikey={api_key}"
+        params: dict[str, str] = {"apikey": api_key}
         # ? https://alphavantage.co/query?apikey={apikey}function=TIME_SERIES_WEEKLY&symbol=IBM&apikey=demo
-        for k, v in _args:
+        for k, v in kwargs.items():
             if k == "apikey" or k == "validation_model" or k == "info":
                 continue
-            uri += f"&{k}={v}"
-        response = get(uri, timeout=10)
-        as_json: dict = response.json()
+            params[k] = v
+        as_json: dict = await info.context.loaders.load(params)
         assert as_json.get("Error Message") is None, f"Error: {as_json.get("Error Message")}"
         a, b, c = fn(*args, **kwargs)
         current = as_json
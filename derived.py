@@ -0,0 +1,51 @@
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+
+class DerivedResponses:
+    """Responses built locally from another response, reused while it is served.
+
+    Cached responses are shared dicts, so a source served again from the cache is the
+    same object and what was built from it is only built once. The `max_size` most
+    recent are kept; each holds its source, so the identity of a kept source cannot be
+    reused by another dict.
+
+    Args:
+        max_size (int, optional): The number of derived responses kept. Defaults to 64.
+    """
+
+    def __init__(self, max_size: int = 64) -> None:
+        self.max_size = max_size
+        self._built: OrderedDict[tuple[int, str], tuple[dict, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def get(
+        self, source: dict, name: str, build: Callable[[dict], dict | None]
+    ) -> dict | None:
+        """Returns the response `name` derived from `source`, building it once.
+
+        Args:
+            source (dict): The response it is derived from.
+            name (str): What is derived, e.g. the function it stands in for.
+            build (Callable[[dict], dict | None]): Builds it from `source`; `None`
+                results are not kept.
+
+        Returns:
+            dict | None: The derived response, which must not be mutated.
+        """
+        key = (id(source), name)
+        with self._lock:
+            found = self._built.get(key)
+            if found is not None and found[0] is source:
+                self._built.move_to_end(key)
+                return found[1]
+        derived = build(source)
+        if derived is not None:
+            with self._lock:
+                self.builds += 1
+                self._built[key] = (source, derived)
+                while len(self._built) > self.max_size:
+                    self._built.popitem(last=False)
+        return derived
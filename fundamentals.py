@@ -0,0 +1,113 @@
+from typing import Mapping, Sequence
+
+import numpy as np
+from series import parse_column
+
+RATIOS = (
+    "gross_margin",
+    "operating_margin",
+    "net_margin",
+    "free_cash_flow",
+    "debt_to_equity",
+    "revenue_growth_yoy",
+    "revenue_growth_qoq",
+    "net_income_growth_yoy",
+    "net_income_growth_qoq",
+)
+
+
+def columns(
+    reports: Sequence[Mapping[str, str]], dates: Sequence[str], names: Sequence[str]
+) -> dict[str, np.ndarray]:
+    """Parses the `names` figures of the reports ending on `dates`.
+
+    Reports are matched by `fiscalDateEnding`, so statements that upstream returns
+    with a different history line up; dates without a report are NaN.
+
+    Args:
+        reports (Sequence[Mapping[str, str]]): The reports, as upstream returns them.
+        dates (Sequence[str]): The fiscal dates of the rows.
+        names (Sequence[str]): The upstream field names.
+
+    Returns:
+        dict[str, np.ndarray]: One float column per name.
+    """
+    by_date = {report.get("fiscalDateEnding"): report for report in reports}
+    rows = [by_date.get(date, {}) for date in dates]
+    return {name: parse_column([row.get(name) for row in rows]) for name in names}
+
+
+def growth(values: np.ndarray, lag: int) -> np.ndarray:
+    """Change of each newest-first value from the one `lag` rows older.
+
+    Divides by the magnitude of the older value, so a loss shrinking reads as growth.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) > lag:
+        base = values[lag:]
+        out[:-lag] = (values[:-lag] - base) / np.abs(base)
+    return out
+
+
+def ratios(
+    income: Sequence[Mapping[str, str]],
+    cash_flow: Sequence[Mapping[str, str]],
+    balance: Sequence[Mapping[str, str]],
+    quarterly: bool,
+) -> tuple[list[str], dict[str, np.ndarray]]:
+    """Computes margins, free cash flow, leverage and growth over a report history.
+
+    Every ratio is one vectorized operation over the whole history. Year-over-year
+    growth compares with the report four quarters back for quarterly reports, and
+    quarter-over-quarter growth is NaN for annual ones.
+
+    Args:
+        income (Sequence[Mapping[str, str]]): The `INCOME_STATEMENT` reports.
+        cash_flow (Sequence[Mapping[str, str]]): The `CASH_FLOW` reports.
+        balance (Sequence[Mapping[str, str]]): The `BALANCE_SHEET` reports.
+        quarterly (bool): Whether the reports are `quarterlyReports`.
+
+    Returns:
+        tuple[list[str], dict[str, np.ndarray]]: The fiscal dates, newest first, as in
+            the income statements, and each of `RATIOS` aligned with them; ratios that
+            cannot be computed are NaN.
+    """
+    dates = [report["fiscalDateEnding"] for report in income]
+    inc = columns(
+        income,
+        dates,
+        ("totalRevenue", "grossProfit", "operatingIncome", "netIncome"),
+    )
+    cf = columns(cash_flow, dates, ("operatingCashflow", "capitalExpenditures"))
+    bs = columns(
+        balance,
+        dates,
+        (
+            "shortLongTermDebtTotal",
+            "shortTermDebt",
+            "longTermDebt",
+            "totalShareholderEquity",
+        ),
+    )
+    revenue, net_income = inc["totalRevenue"], inc["netIncome"]
+    debt = bs["shortLongTermDebtTotal"]
+    debt = np.where(
+        np.isnan(debt), np.nan_to_num(bs["shortTermDebt"]) + bs["longTermDebt"], debt
+    )
+    yoy = 4 if quarterly else 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = {
+            "gross_margin": inc["grossProfit"] / revenue,
+            "operating_margin": inc["operatingIncome"] / revenue,
+            "net_margin": net_income / revenue,
+            # ? Upstream reports capital expenditures as a positive outflow.
+            "free_cash_flow": cf["operatingCashflow"] - cf["capitalExpenditures"],
+            "debt_to_equity": debt / bs["totalShareholderEquity"],
+            "revenue_growth_yoy": growth(revenue, yoy),
+            "revenue_growth_qoq": growth(revenue, 1 if quarterly else len(dates)),
+            "net_income_growth_yoy": growth(net_income, yoy),
+            "net_income_growth_qoq": growth(net_income, 1 if quarterly else len(dates)),
+        }
+    for values in out.values():
+        values[~np.isfinite(values)] = np.nan
+    return dates, out
@@ -0,0 +1,213 @@
+import asyncio
+import time
+from collections import OrderedDict
+from os import getenv
+from typing import TYPE_CHECKING, Mapping
+
+from dotenv import load_dotenv
+from cache import CacheBackend, Entry, MemoryLRU, cache_key, decode_entry, encode_entry
+
+if TYPE_CHECKING:
+    from upstream import Fetch
+
+load_dotenv()
+
+SERIES_KEYS: dict[str, str] = {
+    "TIME_SERIES_DAILY": "Time Series (Daily)",
+    "TIME_SERIES_DAILY_ADJUSTED": "Time Series (Daily)",
+}
+
+
+def _merge(stored: dict, compact: dict, series_key: str) -> dict | None:
+    """Appends the bars of a `compact` response to a stored `full` history.
+
+    Args:
+        stored (dict): The stored full response.
+        compact (dict): A fresh compact response (the last 100 bars).
+        series_key (str): The key of the bars in both responses.
+
+    Returns:
+        dict | None: The merged response, or `None` when the history cannot be
+            extended: the compact window no longer overlaps it, or a split or dividend
+            changed the adjusted closes of bars that were already stored.
+    """
+    old: dict[str, dict] = stored[series_key]
+    new: dict[str, dict] = compact[series_key]
+    if not new:
+        return stored
+    if not old:
+        return None
+    newest_old = max(old)
+    if min(new) > newest_old:
+        return None
+    for date, bar in new.items():
+        # ? The newest stored bar may have been a partial session; it is replaced anyway.
+        if date < newest_old and date in old:
+            if bar.get("5. adjusted close") != old[date].get("5. adjusted close"):
+                return None
+    merged = dict(new)
+    merged.update((date, bar) for date, bar in old.items() if date not in new)
+    meta = dict(compact["Meta Data"])
+    meta["4. Output Size"] = stored["Meta Data"].get("4. Output Size", "Full size")
+    return {"Meta Data": meta, series_key: merged}
+
+
+class HistoryStore:
+    """Per-symbol daily history, downloaded once with `full` and extended with `compact`.
+
+    A `full` request for a symbol seen before only costs a `compact` call (which is
+    itself cached); its bars are merged into the stored history when its
+    `3. Last Refreshed` moved. The history is downloaded again when the compact window
+    no longer overlaps it or the adjusted closes changed under it.
+
+    Configuration (environment):
+        AV_HISTORY_MAX_BYTES: Memory budget of the stored histories. Defaults to 256 MiB.
+        AV_HISTORY_TTL: Seconds a history is kept without being requested. Defaults
+            to 30 days.
+
+    Args:
+        backend (CacheBackend | None, optional): Shared tier, so workers share histories.
+        max_checked (int, optional): Symbols whose last check is remembered, most
+            recent first. Defaults to 4096.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int | None = None,
+        backend: CacheBackend | None = None,
+        max_checked: int = 4096,
+    ) -> None:
+        self.memory = MemoryLRU(
+            max_bytes or int(getenv("AV_HISTORY_MAX_BYTES", str(256 * 1024 * 1024)))
+        )
+        self.backend = backend
+        self.ttl = int(getenv("AV_HISTORY_TTL", str(30 * 24 * 60 * 60)))
+        self.max_checked = max_checked
+        self._checked_at: OrderedDict[str, float] = OrderedDict()
+        self.seeded = 0
+        self.reseeded = 0
+        self.refreshed = 0
+        self.unchanged = 0
+        self.bars_merged = 0
+
+    @staticmethod
+    def handles(params: Mapping[str, str]) -> bool:
+        """Whether `params` request a full daily history.
+
+        Args:
+            params (Mapping[str, str]): The normalized query string parameters.
+
+        Returns:
+            bool: `True` for `outputsize=full` daily series.
+        """
+        return (
+            params.get("function") in SERIES_KEYS and params.get("outputsize") == "full"
+        )
+
+    async def _load(self, key: str) -> dict | None:
+        entry = self.memory.get(key)
+        if entry is None and self.backend is not None:
+            raw = await asyncio.to_thread(self.backend.get, key)
+            entry = decode_entry(raw) if raw else None
+            if raw and entry is None:
+                await asyncio.to_thread(self.backend.delete, key)
+            if entry is not None:
+                self.memory.set(key, entry)
+        if entry is None or entry.expires_at <= time.time():
+            return None
+        return entry.payload
+
+    async def _save(self, key: str, payload: dict) -> None:
+        now = time.time()
+        encoded = encode_entry(payload, now, now + self.ttl)
+        self.memory.set(
+            key,
+            Entry(payload, stored_at=now, expires_at=now + self.ttl, size=len(encoded)),
+        )
+        if self.backend is not None:
+            await asyncio.to_thread(self.backend.set, key, encoded, self.ttl)
+
+    def _checked(self, key: str) -> None:
+        """Records that the history of `key` was just brought up to date."""
+        self._checked_at[key] = time.time()
+        self._checked_at.move_to_end(key)
+        if len(self._checked_at) > self.max_checked:
+            self._checked_at.popitem(last=False)
+
+    async def _seed(self, key: str, params: Mapping[str, str], fetch: "Fetch") -> dict:
+        payload = await fetch(params)
+        self._checked(key)
+        if SERIES_KEYS[params["function"]] in payload and "Meta Data" in payload:
+            await self._save(key, payload)
+        return payload
+
+    async def full(self, params: Mapping[str, str], fetch: "Fetch") -> dict:
+        """Serves a `full` daily request from the stored history.
+
+        Args:
+            params (Mapping[str, str]): The normalized query string parameters.
+            fetch (Fetch): Fetches one upstream response.
+
+        Returns:
+            dict: The full response, shaped exactly as Alpha Vantage returns it.
+        """
+        key = "history:" + cache_key(params)
+        series_key = SERIES_KEYS[params["function"]]
+        stored = await self._load(key)
+        if stored is None:
+            self.seeded += 1
+            return await self._seed(key, params, fetch)
+        compact = await fetch({**params, "outputsize": "compact"})
+        self._checked(key)
+        if series_key not in compact or "Meta Data" not in compact:
+            return stored
+        refreshed = compact["Meta Data"].get("3. Last Refreshed")
+        if refreshed == stored["Meta Data"].get("3. Last Refreshed"):
+            self.unchanged += 1
+            return stored
+        merged = _merge(stored, compact, series_key)
+        if merged is None:
+            self.reseeded += 1
+            return await self._seed(key, params, fetch)
+        self.refreshed += 1
+        self.bars_merged += len(compact[series_key])
+        await self._save(key, merged)
+        return merged
+
+    async def fresh(self, params: Mapping[str, str], max_age: float) -> dict | None:
+        """Returns a stored history brought up to date less than `max_age` seconds ago.
+
+        Only the checks of this worker count, so another worker may still find the
+        history stale.
+
+        Args:
+            params (Mapping[str, str]): The normalized parameters of a `full` request.
+            max_age (float): Seconds since the history was last checked upstream.
+
+        Returns:
+            dict | None: The full response, or `None` when there is no fresh history.
+        """
+        key = "history:" + cache_key(params)
+        checked_at = self._checked_at.get(key)
+        if checked_at is None or time.time() - checked_at > max_age:
+            return None
+        stored = await self._load(key)
+        if stored is None:
+            self._checked_at.pop(key, None)
+        return stored
+
+    def stats(self) -> dict[str, int]:
+        """Seed, refresh and merge counters of the store.
+
+        Returns:
+            dict[str, int]: The counters.
+        """
+        return {
+            "histories": len(self.memory),
+            "bytes": self.memory.bytes,
+            "seeded": self.seeded,
+            "reseeded": self.reseeded,
+            "refreshed": self.refreshed,
+            "unchanged": self.unchanged,
+            "bars_merged": self.bars_merged,
+        }
@@ -0,0 +1,117 @@
+import asyncio
+from os import getenv
+from typing import AsyncGenerator
+
+import aiohttp
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_URL = "https://www.alphavantage.co/query"
+
+
+async def _close_on_shutdown(
+    session: aiohttp.ClientSession,
+) -> AsyncGenerator[None, None]:
+    """Closes `session` when its loop finalizes this generator, started once."""
+    try:
+        yield
+    finally:
+        if not session.closed:
+            await session.close()
+
+
+class UpstreamClient:
+    """Keep-alive, pooled async HTTP client for the Alpha Vantage API.
+
+    One client is shared by every resolver in the worker, so concurrent GraphQL
+    fields reuse the same TCP/TLS connections instead of opening a new one per call.
+
+    Configuration (environment):
+        AV_URL: The Alpha Vantage query endpoint.
+        AV_POOL_SIZE: Total number of pooled connections. Defaults to 100.
+        AV_POOL_PER_HOST: Maximum connections to a single host. Defaults to 50.
+        AV_KEEPALIVE: Seconds an idle connection is kept open. Defaults to 30.
+        AV_TIMEOUT: Total timeout of one upstream call in seconds. Defaults to 10.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        pool_size: int | None = None,
+        per_host: int | None = None,
+        keepalive: float | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        self._base_url = base_url
+        self.pool_size = pool_size or int(getenv("AV_POOL_SIZE", "100"))
+        self.per_host = per_host or int(getenv("AV_POOL_PER_HOST", "50"))
+        self.keepalive = keepalive or float(getenv("AV_KEEPALIVE", "30"))
+        self.timeout = timeout or float(getenv("AV_TIMEOUT", "10"))
+        self._session: aiohttp.ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._closer: AsyncGenerator[None, None] | None = None
+        self.calls = 0
+
+    @property
+    def base_url(self) -> str:
+        """The upstream endpoint, read lazily so `AV_URL` may be set after import.
+
+        Returns:
+            str: The Alpha Vantage query endpoint.
+        """
+        return self._base_url or getenv("AV_URL") or DEFAULT_URL
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Returns the pooled session, creating it on the running event loop.
+
+        A session left by another loop is closed first; each session is also closed
+        when its loop shuts down its async generators (as `asyncio.run` does), while
+        its connections can still be closed on that loop.
+
+        Returns:
+            aiohttp.ClientSession: The pooled session.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._loop is not loop:
+            await self.close()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.per_host,
+                keepalive_timeout=self.keepalive,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._loop = loop
+            self._closer = _close_on_shutdown(self._session)
+            await anext(self._closer)
+        return self._session
+
+    async def get_json(self, params: dict[str, str]) -> dict:
+        """Issues one GET against the upstream endpoint and decodes the JSON body.
+
+        Args:
+            params (dict[str, str]): The query string parameters.
+
+        Returns:
+            dict: The decoded response.
+        """
+        session = await self._get_session()
+        self.calls += 1
+        async with session.get(self.base_url, params=params) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def close(self) -> None:
+        """Closes the pooled session, if one is open on the running loop."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+client = UpstreamClient()
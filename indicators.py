@@ -0,0 +1,467 @@
+from dataclasses import dataclass
+from os import getenv
+from typing import Callable
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from dotenv import load_dotenv
+from series import SeriesFrame
+from upstream import Fetch, fetch_json
+
+load_dotenv()
+
+
+NAMES: dict[str, str] = {
+    "SMA": "Simple Moving Average (SMA)",
+    "EMA": "Exponential Moving Average (EMA)",
+    "WMA": "Weighted Moving Average (WMA)",
+    "DEMA": "Double Exponential Moving Average (DEMA)",
+    "TEMA": "Triple Exponential Moving Average (TEMA)",
+    "RSI": "Relative Strength Index (RSI)",
+    "MACD": "Moving Average Convergence/Divergence (MACD)",
+    "BBANDS": "Bollinger Bands (BBANDS)",
+    "ATR": "Average True Range (ATR)",
+    "STOCH": "Stochastic (STOCH)",
+}
+
+DEFAULT_PERIODS: dict[str, int] = {"RSI": 14, "BBANDS": 20, "ATR": 14}
+
+SERIES_TYPES: dict[str, str] = {
+    "open": "1. open",
+    "high": "2. high",
+    "low": "3. low",
+    "close": "4. close",
+}
+
+INTRADAY_INTERVALS: tuple[str, ...] = ("1min", "5min", "15min", "30min", "60min")
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average. The first `period - 1` values are NaN.
+
+    Args:
+        values (np.ndarray): The prices, oldest first.
+        period (int): The number of prices averaged.
+
+    Returns:
+        np.ndarray: The averages, aligned with `values`.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        out[period - 1 :] = np.convolve(values, np.full(period, 1 / period), "valid")
+    return out
+
+
+def wma(values: np.ndarray, period: int) -> np.ndarray:
+    """Linearly weighted moving average, the newest price weighing `period`.
+
+    Args:
+        values (np.ndarray): The prices, oldest first.
+        period (int): The number of prices averaged.
+
+    Returns:
+        np.ndarray: The averages, aligned with `values`.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        # ? `convolve` flips the kernel, so the largest weight goes first.
+        weights = np.arange(period, 0, -1) / (period * (period + 1) / 2)
+        out[period - 1 :] = np.convolve(values, weights, "valid")
+    return out
+
+
+def _smooth(values: np.ndarray, period: int, k: float) -> np.ndarray:
+    """Exponential smoothing seeded with the simple average of the first `period`
+    values; leading NaN (the warm-up of what is being smoothed) are skipped."""
+    out = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    start = int(valid[0]) if len(valid) else len(values)
+    seed = start + period - 1
+    if seed >= len(values):
+        return out
+    average = float(np.mean(values[start : seed + 1]))
+    averages = [average]
+    # ? Each value depends on the previous one, so this is the one loop in the engine.
+    for value in values[seed + 1 :].tolist():
+        average += k * (value - average)
+        averages.append(average)
+    out[seed:] = averages
+    return out
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average with `k = 2 / (period + 1)`, seeded like TA-Lib.
+
+    Args:
+        values (np.ndarray): The prices, oldest first.
+        period (int): The period of the average.
+
+    Returns:
+        np.ndarray: The averages, aligned with `values`.
+    """
+    return _smooth(values, period, 2 / (period + 1))
+
+
+def wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's smoothing (`k = 1 / period`), used by RSI and ATR."""
+    return _smooth(values, period, 1 / period)
+
+
+# ? The moving averages `technical_average` computes, as `IndicatorPass` does.
+AVERAGES: tuple[str, ...] = ("SMA", "EMA", "WMA", "DEMA", "TEMA")
+
+
+@dataclass(frozen=True)
+class Spec:
+    """One indicator of a batch, with Alpha Vantage's parameters.
+
+    `time_period` defaults to 60 for the moving averages (as the single-indicator
+    fields do), 14 for RSI and ATR and 20 for BBANDS. MACD uses the `*_period`
+    parameters, STOCH the `*k_period`/`slowd_period` ones, and ATR and STOCH read the
+    high, low and close prices whatever the `series_type`.
+    """
+
+    function: str
+    time_period: int | None = None
+    series_type: str = "close"
+    fast_period: int = 12
+    slow_period: int = 26
+    signal_period: int = 9
+    nbdevup: float = 2.0
+    nbdevdn: float = 2.0
+    fastk_period: int = 5
+    slowk_period: int = 3
+    slowd_period: int = 3
+
+    @property
+    def period(self) -> int:
+        """The `time_period`, or the default of the function."""
+        return self.time_period or DEFAULT_PERIODS.get(self.function, 60)
+
+    @property
+    def label(self) -> str:
+        """The function and its parameters, e.g. `EMA(20,close)`."""
+        match self.function:
+            case "MACD":
+                args = (
+                    self.fast_period,
+                    self.slow_period,
+                    self.signal_period,
+                    self.series_type,
+                )
+            case "BBANDS":
+                args = (self.period, self.nbdevup, self.nbdevdn, self.series_type)
+            case "STOCH":
+                args = (self.fastk_period, self.slowk_period, self.slowd_period)
+            case "ATR":
+                args = (self.period,)
+            case _:
+                args = (self.period, self.series_type)
+        return f"{self.function}({','.join(map(str, args))})"
+
+
+class IndicatorPass:
+    """Computes any number of indicators over the bars of one frame.
+
+    Prices are parsed once per column and intermediates are shared between the
+    indicators of the pass: moving averages of the same prices and period (an EMA is
+    the first stage of DEMA, TEMA and MACD, an SMA the middle Bollinger band), price
+    columns and the smoothed series built on them. All arrays are oldest first.
+
+    Args:
+        frame (SeriesFrame): The bars, newest first.
+    """
+
+    def __init__(self, frame: SeriesFrame) -> None:
+        self.frame = frame
+        self._memo: dict[tuple, np.ndarray] = {}
+        self.hits = 0
+
+    def _cached(self, key: tuple, make: Callable[[], np.ndarray]) -> np.ndarray:
+        values = self._memo.get(key)
+        if values is None:
+            values = self._memo[key] = make()
+        else:
+            self.hits += 1
+        return values
+
+    def prices(self, series_type: str) -> np.ndarray:
+        """The `open`, `high`, `low` or `close` prices."""
+        assert series_type in SERIES_TYPES, f"Unsupported series type: {series_type}"
+        return self._cached(
+            ("prices", series_type),
+            lambda: self.frame.column(SERIES_TYPES[series_type])[::-1].astype(
+                np.float64
+            ),
+        )
+
+    def sma(self, series_type: str, period: int) -> np.ndarray:
+        """Simple moving average of the prices."""
+        return self._cached(
+            ("SMA", series_type, period),
+            lambda: sma(self.prices(series_type), period),
+        )
+
+    def ema(
+        self, series_type: str, period: int, depth: int = 1, skip: int = 0
+    ) -> np.ndarray:
+        """EMA applied `depth` times; the first `skip` prices are left out of the seed."""
+
+        def make() -> np.ndarray:
+            if depth > 1:
+                return ema(self.ema(series_type, period, depth - 1, skip), period)
+            prices = self.prices(series_type)
+            if skip:
+                prices = np.concatenate([np.full(skip, np.nan), prices[skip:]])
+            return ema(prices, period)
+
+        return self._cached(("EMA", series_type, period, depth, skip), make)
+
+    def true_range(self) -> np.ndarray:
+        """The true range of every bar but the first."""
+
+        def make() -> np.ndarray:
+            high, low = self.prices("high"), self.prices("low")
+            close = np.concatenate([[np.nan], self.prices("close")[:-1]])
+            ranges = np.fmax(high - low, np.fmax(abs(high - close), abs(low - close)))
+            ranges[:1] = np.nan
+            return ranges
+
+        return self._cached(("TRANGE",), make)
+
+    def _lines(self, spec: Spec) -> dict[str, np.ndarray]:
+        """The output lines of one indicator, named as Alpha Vantage names them."""
+        n, series_type = spec.period, spec.series_type
+        assert n > 0, "time_period must be positive"
+        match spec.function:
+            case "SMA":
+                return {"SMA": self.sma(series_type, n)}
+            case "EMA":
+                return {"EMA": self.ema(series_type, n)}
+            case "WMA":
+                return {"WMA": wma(self.prices(series_type), n)}
+            case "DEMA":
+                first, second = self.ema(series_type, n), self.ema(series_type, n, 2)
+                return {"DEMA": 2 * first - second}
+            case "TEMA":
+                first, second = self.ema(series_type, n), self.ema(series_type, n, 2)
+                third = self.ema(series_type, n, 3)
+                return {"TEMA": 3 * first - 3 * second + third}
+            case "RSI":
+                changes = np.diff(self.prices(series_type), prepend=np.nan)
+                gains = wilder(np.maximum(changes, 0.0), n)
+                losses = wilder(np.maximum(-changes, 0.0), n)
+                total = gains + losses
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    rsi = np.where(total == 0, 0.0, 100 * gains / total)
+                return {"RSI": np.where(np.isnan(total), np.nan, rsi)}
+            case "MACD":
+                fast, slow = spec.fast_period, spec.slow_period
+                assert 0 < fast < slow, "fast_period must be below slow_period"
+                # ? TA-Lib seeds the fast EMA where the slow one starts.
+                macd = self.ema(series_type, fast, skip=slow - fast) - self.ema(
+                    series_type, slow
+                )
+                signal = ema(macd, spec.signal_period)
+                return {
+                    "MACD": macd,
+                    "MACD_Signal": signal,
+                    "MACD_Hist": macd - signal,
+                }
+            case "BBANDS":
+                middle = self.sma(series_type, n)
+                deviation = np.full(len(middle), np.nan)
+                prices = self.prices(series_type)
+                if len(prices) >= n:
+                    deviation[n - 1 :] = sliding_window_view(prices, n).std(axis=1)
+                return {
+                    "Real Upper Band": middle + spec.nbdevup * deviation,
+                    "Real Middle Band": middle,
+                    "Real Lower Band": middle - spec.nbdevdn * deviation,
+                }
+            case "ATR":
+                return {"ATR": wilder(self.true_range(), n)}
+            case "STOCH":
+                k = spec.fastk_period
+                high, low = self.prices("high"), self.prices("low")
+                highest = np.full(len(high), np.nan)
+                lowest = np.full(len(low), np.nan)
+                if len(high) >= k:
+                    highest[k - 1 :] = sliding_window_view(high, k).max(axis=1)
+                    lowest[k - 1 :] = sliding_window_view(low, k).min(axis=1)
+                spread = highest - lowest
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    fast_k = np.where(
+                        spread == 0,
+                        0.0,
+                        100 * (self.prices("close") - lowest) / spread,
+                    )
+                fast_k[np.isnan(spread)] = np.nan
+                slow_k = sma(fast_k, spec.slowk_period)
+                return {"SlowK": slow_k, "SlowD": sma(slow_k, spec.slowd_period)}
+        raise AssertionError(f"Unsupported indicator: {spec.function}")
+
+    def compute(self, spec: Spec, decimals: int | None = 4) -> dict[str, np.ndarray]:
+        """Computes one indicator.
+
+        Like TA-Lib, the lines of an indicator start together, once all of them have
+        warmed up.
+
+        Args:
+            spec (Spec): The indicator.
+            decimals (int | None, optional): Rounding, as upstream rounds to four
+                decimals. Defaults to 4.
+
+        Returns:
+            dict[str, np.ndarray]: The lines by name, in the order of `frame.dates`
+                (newest first), NaN during warm-up.
+        """
+        lines = self._lines(spec)
+        warm = np.zeros(len(self.frame), dtype=bool)
+        for values in lines.values():
+            warm |= np.isnan(values)
+        out = {}
+        for name, values in lines.items():
+            values = np.where(warm, np.nan, values)[::-1]
+            out[name] = values if decimals is None else np.round(values, decimals)
+        return out
+
+
+def series_request(symbol: str, interval: str) -> tuple[dict[str, str], str]:
+    """The price series an indicator of `interval` is computed from.
+
+    Daily series are requested in full, so they are served from the history store and
+    the averages are seeded from the start of the history, as upstream does.
+
+    Args:
+        symbol (str): The symbol.
+        interval (str): `1min` to `60min`, `daily`, `weekly` or `monthly`.
+
+    Returns:
+        tuple[dict[str, str], str]: The request parameters (without `apikey`) and the
+            key of the bars in the response.
+    """
+    if interval in INTRADAY_INTERVALS:
+        return (
+            {
+                "function": "TIME_SERIES_INTRADAY",
+                "symbol": symbol,
+                "interval": interval,
+                "outputsize": "full",
+            },
+            f"Time Series ({interval})",
+        )
+    series: dict[str, tuple[dict[str, str], str]] = {
+        "daily": (
+            {"function": "TIME_SERIES_DAILY", "outputsize": "full"},
+            "Time Series (Daily)",
+        ),
+        "weekly": ({"function": "TIME_SERIES_WEEKLY"}, "Weekly Time Series"),
+        "monthly": ({"function": "TIME_SERIES_MONTHLY"}, "Monthly Time Series"),
+    }
+    assert interval in series, f"Unsupported interval: {interval}"
+    params, key = series[interval]
+    return {**params, "symbol": symbol}, key
+
+
+def compute(
+    function: str, frame: SeriesFrame, time_period: int, series_type: str
+) -> np.ndarray:
+    """Computes one moving average over the bars of a frame.
+
+    Args:
+        function (str): One of `AVERAGES`, e.g. "EMA".
+        frame (SeriesFrame): The bars, newest first.
+        time_period (int): The period of the average.
+        series_type (str): `open`, `high`, `low` or `close`.
+
+    Returns:
+        np.ndarray: The averages in the order of `frame.dates`; NaN during warm-up.
+    """
+    assert function in AVERAGES, f"Unsupported indicator: {function}"
+    spec = Spec(function=function, time_period=time_period, series_type=series_type)
+    return IndicatorPass(frame).compute(spec, decimals=None)[function]
+
+
+async def price_frame(
+    key: str, symbol: str, interval: str, fetch: Fetch = fetch_json
+) -> tuple[SeriesFrame, dict[str, str]]:
+    """Fetches the price series indicators of `interval` are computed from.
+
+    Args:
+        key (str): The Alpha Vantage API key.
+        symbol (str): The symbol.
+        interval (str): `1min` to `60min`, `daily`, `weekly` or `monthly`.
+        fetch (Fetch, optional): Fetches the price series. Defaults to `fetch_json`.
+
+    Returns:
+        tuple[SeriesFrame, dict[str, str]]: The bars and the `Meta Data` of the series.
+    """
+    params, series_key = series_request(symbol, interval)
+    response = await fetch({**params, "apikey": key})
+    assert (
+        response.get("Error Message") is None
+    ), f"Error: {response.get("Error Message")}"
+    series: dict | None = response.get(series_key)
+    assert series is not None, "No Time Series found"
+    return SeriesFrame.of(series), response.get("Meta Data", {})
+
+
+async def technical_average(
+    key: str,
+    function: str,
+    symbol: str,
+    interval: str,
+    time_period: int,
+    series_type: str,
+    fetch: Fetch = fetch_json,
+) -> tuple[dict[str, dict[str, str]], dict[str, str | int]]:
+    """Computes a moving average locally from the (cached) `TIME_SERIES_*` response.
+
+    The result has the shape the `alpha_vantage` library returns for the upstream
+    indicator: the values keyed by date, newest first, as strings with four decimals,
+    and the `Meta Data` of the indicator.
+
+    Args:
+        key (str): The Alpha Vantage API key the price series is fetched with.
+        function (str): `SMA`, `EMA`, `WMA`, `DEMA` or `TEMA`.
+        symbol (str): The symbol.
+        interval (str): `1min` to `60min`, `daily`, `weekly` or `monthly`.
+        time_period (int): The period of the average.
+        series_type (str): `open`, `high`, `low` or `close`.
+        fetch (Fetch, optional): Fetches the price series. Defaults to `fetch_json`.
+
+    Returns:
+        tuple[dict[str, dict[str, str]], dict[str, str | int]]: `data, metadata`.
+    """
+    frame, meta = await price_frame(key, symbol, interval, fetch)
+    values = compute(function, frame, time_period, series_type)
+    intraday = interval in INTRADAY_INTERVALS
+    data = {
+        # ? Upstream indicators key intraday values by minute, without seconds.
+        (date[:16] if intraday else date): {function: f"{value:.4f}"}
+        for date, value in zip(frame.dates, values.tolist())
+        if value == value
+    }
+    metadata = {
+        "1: Symbol": symbol,
+        "2: Indicator": NAMES[function],
+        "3: Last Refreshed": next(
+            (v for k, v in meta.items() if k.endswith("Last Refreshed")), ""
+        ),
+        "4: Interval": interval,
+        "5: Time Period": time_period,
+        "6: Series Type": series_type,
+        "7: Time Zone": next(
+            (v for k, v in meta.items() if k.endswith("Time Zone")), "US/Eastern"
+        ),
+    }
+    return data, metadata
+
+
+def local() -> bool:
+    """Whether averages are computed locally (`AV_INDICATOR_MODE=local`) instead of
+    requested from upstream (`upstream`, the default)."""
+    mode = getenv("AV_INDICATOR_MODE", "upstream")
+    assert mode in ("upstream", "local"), f"Unknown AV_INDICATOR_MODE: {mode}"
+    return mode == "local"
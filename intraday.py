@@ -0,0 +1,222 @@
+import re
+from itertools import islice
+from os import getenv
+from typing import TYPE_CHECKING, Mapping
+
+import numpy as np
+from dotenv import load_dotenv
+from derived import DerivedResponses
+from series import SeriesFrame, Window
+
+if TYPE_CHECKING:
+    from upstream import Fetch
+
+load_dotenv()
+
+UPSTREAM_INTERVALS: tuple[str, ...] = ("1min", "5min", "15min", "30min", "60min")
+COMPACT_SIZE = 100
+
+
+def minutes(interval: str) -> int | None:
+    """The length of an interval such as `5min` or `2h` in minutes.
+
+    Returns:
+        int | None: The minutes, or `None` when `interval` is not an intraday interval.
+    """
+    match = re.fullmatch(r"(\d+)(min|h)", interval)
+    if match is None:
+        return None
+    size = int(match[1]) * (60 if match[2] == "h" else 1)
+    return size if 0 < size < 24 * 60 else None
+
+
+def aggregate(
+    frame: SeriesFrame, size: int, limit: int | None = None, base: int = 1
+) -> dict[str, dict]:
+    """Aggregates intraday bars into bars of `size` minutes in one vectorized pass.
+
+    Buckets are aligned on midnight and a bar is keyed by the start of its bucket, as
+    upstream keys its own (the `60min` bar of 19:00 covers 19:00 to 19:59). A bar opens
+    at the first open of its bucket, closes at the last close, spans the highest high
+    and lowest low, and sums the volumes.
+
+    Args:
+        frame (SeriesFrame): The finer bars, newest first.
+        size (int): The minutes of a bar.
+        limit (int | None, optional): Builds the newest `limit` bars only, reading no
+            more finer bars than they can hold. Defaults to all of them.
+        base (int, optional): The minutes of a finer bar, which bounds how many fall
+            in a bucket. Defaults to 1.
+
+    Returns:
+        dict[str, dict]: The bars keyed by timestamp, newest first, in upstream's
+            layout.
+    """
+    if limit is not None and (limit + 1) * (size // base) < len(frame):
+        # ? The oldest bucket of the window may be cut short; the window holds at least
+        # ? `limit + 1` buckets, so it is left out.
+        frame = frame.window(Window(limit=(limit + 1) * (size // base)))
+    if not len(frame):
+        return {}
+    day, minute = np.divmod(
+        np.array(frame.dates, dtype="datetime64[m]").astype(np.int64), 24 * 60
+    )
+    ids = day * 24 * 60 + minute // size * size
+    # ? Newest first: a bucket starts at its last bar and ends at its first.
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    ends = np.r_[starts[1:], len(ids)] - 1
+    keep = slice(0, limit)
+    labels = np.datetime_as_string(ids[starts].astype("datetime64[m]"), unit="s")[keep]
+    columns = {
+        "1. open": frame.column("1. open")[ends],
+        "2. high": np.fmax.reduceat(frame.column("2. high"), starts),
+        "3. low": np.fmin.reduceat(frame.column("3. low"), starts),
+        "4. close": frame.column("4. close")[starts],
+    }
+    formatted = {
+        name: [f"{v:.4f}" for v in values[keep]] for name, values in columns.items()
+    }
+    volume = np.add.reduceat(np.nan_to_num(frame.column("5. volume")), starts)
+    formatted["5. volume"] = [str(int(v)) for v in volume[keep]]
+    names = list(formatted)
+    return {
+        label.replace("T", " "): dict(zip(names, row))
+        for label, row in zip(labels.tolist(), zip(*formatted.values()))
+    }
+
+
+class IntradayAggregator:
+    """Serves every intraday interval of a symbol from one fetch of the finest one.
+
+    `TIME_SERIES_INTRADAY` requests fetch the `full` series of `AV_INTRADAY_BASE`
+    (through the cache, so once per symbol and TTL) and aggregate it locally, so a
+    chart showing five intervals costs one call instead of five. `compact` requests
+    get the latest 100 bars, as upstream serves them. Intervals upstream does not
+    offer, such as `2h` or `4h` (any number of minutes or hours under a day), are
+    always built this way, from `1min` bars when the base does not divide them (see
+    `source_interval`). Derived responses are kept while their base keeps being
+    served.
+
+    Configuration (environment):
+        AV_INTRADAY_BASE: The interval fetched from upstream. Defaults to `1min`; empty
+            requests the upstream intervals from upstream and only aggregates the others
+            (from `1min`).
+    """
+
+    def __init__(self, base: str | None = None, max_size: int = 64) -> None:
+        self.base = base if base is not None else getenv("AV_INTRADAY_BASE", "1min")
+        assert (
+            not self.base or self.base in UPSTREAM_INTERVALS
+        ), f"AV_INTRADAY_BASE must be one of {UPSTREAM_INTERVALS}"
+        self._derived = DerivedResponses(max_size)
+        self.aggregated = 0
+        self.fallbacks = 0
+
+    def source_interval(self, interval: str) -> str | None:
+        """The interval whose bars `interval` bars are built from.
+
+        Args:
+            interval (str): The requested interval.
+
+        Returns:
+            str | None: The base when it divides `interval`, else `1min` for intervals
+                upstream lacks; `None` when upstream serves `interval` better as it is
+                or it is not an intraday interval.
+        """
+        size = minutes(interval)
+        if size is None:
+            return None
+        if interval not in UPSTREAM_INTERVALS:
+            base = self.base or "1min"
+            return base if size % minutes(base) == 0 else "1min"
+        if not self.base or size % minutes(self.base):
+            return None
+        return self.base
+
+    def handles(self, params: Mapping[str, str]) -> bool:
+        """Whether `params` request intraday bars that are built from the base series.
+
+        Args:
+            params (Mapping[str, str]): The normalized query string parameters.
+
+        Returns:
+            bool: `True` for intervals upstream lacks, and, with a base, for every
+                interval but the base series itself.
+        """
+        if params.get("function") != "TIME_SERIES_INTRADAY":
+            return False
+        interval = params.get("interval", "")
+        if self.source_interval(interval) is None:
+            return False
+        return interval != self.base or params.get("outputsize") != "full"
+
+    @staticmethod
+    def _build(source: dict, base: str, interval: str, limit: int | None) -> dict:
+        meta, series = source["Meta Data"], source[f"Time Series ({base})"]
+        if interval == base:
+            bars = dict(islice(series.items(), limit))
+        else:
+            bars = aggregate(
+                SeriesFrame.of(series), minutes(interval), limit, minutes(base)
+            )
+        return {
+            "Meta Data": {
+                "1. Information": (
+                    f"Intraday ({interval}) open, high, low, close prices and volume"
+                ),
+                "2. Symbol": meta.get("2. Symbol"),
+                "3. Last Refreshed": next(iter(bars), meta.get("3. Last Refreshed")),
+                "4. Interval": interval,
+                "5. Output Size": "Full size" if limit is None else "Compact",
+                "6. Time Zone": meta.get("6. Time Zone"),
+            },
+            f"Time Series ({interval})": bars,
+        }
+
+    async def serve(self, params: Mapping[str, str], fetch: "Fetch") -> dict:
+        """Builds an intraday response from the base series.
+
+        Args:
+            params (Mapping[str, str]): The normalized query string parameters.
+            fetch (Fetch): Fetches one normalized request.
+
+        Returns:
+            dict: The response shaped as upstream returns it. When the base series
+                cannot be fetched, upstream intervals are requested as they are and
+                other intervals get the base response (an error or a notice).
+
+        Raises:
+            ValueError: If `interval` bars cannot be built here (see `handles`).
+        """
+        interval = params["interval"]
+        base = self.source_interval(interval)
+        if base is None:
+            raise ValueError(f"{interval} bars cannot be built from intraday bars")
+        request = {**params, "interval": base, "outputsize": "full"}
+        source = await fetch(dict(sorted(request.items())))
+        if f"Time Series ({base})" not in source or "Meta Data" not in source:
+            if interval in UPSTREAM_INTERVALS:
+                self.fallbacks += 1
+                return await fetch(params)
+            return source
+        self.aggregated += 1
+        if params.get("outputsize") == "full":
+            if interval == base:
+                return source
+            return self._derived.get(
+                source, interval, lambda s: self._build(s, base, interval, None)
+            )
+        return self._derived.get(
+            source,
+            f"{interval}:compact",
+            lambda s: self._build(s, base, interval, COMPACT_SIZE),
+        )
+
+    def stats(self) -> dict[str, int | str]:
+        """Requests aggregated, responses derived and fallbacks taken."""
+        return {
+            "base": self.base,
+            "aggregated": self.aggregated,
+            "derivations": self._derived.builds,
+            "fallbacks": self.fallbacks,
+        }
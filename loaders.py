@@ -0,0 +1,104 @@
+import asyncio
+from os import getenv
+from typing import Any, Mapping
+
+from dotenv import load_dotenv
+from strawberry.dataloader import DataLoader
+from quotes import bulk
+from upstream import Fetch, Params, fetch_json, normalize_params
+
+load_dotenv()
+
+# ? Also the bound of `batch.fan_out`, which imports it from here.
+CONCURRENCY = int(getenv("AV_BATCH_CONCURRENCY", "8"))
+
+type Key = tuple[tuple[str, str], ...]
+
+
+class Loaders:
+    """The upstream requests of one GraphQL request, batched per function.
+
+    Every resolver of a request loads its upstream data through one `DataLoader` per
+    upstream function. The requests collected while the resolvers of a tick run are
+    dispatched together: `GLOBAL_QUOTE` requests for several symbols as
+    `REALTIME_BULK_QUOTES` chunks (see `quotes.BulkQuotes.rows`), anything else as
+    concurrent calls; a rate limited bulk call fails the quotes of its batch instead.
+    Quotes of keys without bulk access are fetched one call per symbol, at most
+    `AV_BATCH_CONCURRENCY` at once. The same request is loaded once per GraphQL
+    request, whichever fields need it.
+
+    Args:
+        key (str | None): The Alpha Vantage API key of the request.
+        fetch (Fetch, optional): Fetches one normalized request. Defaults to
+            `fetch_json`.
+    """
+
+    def __init__(self, key: str | None, fetch: Fetch = fetch_json) -> None:
+        self.key = key
+        self.fetch = fetch
+        self._loaders: dict[str, DataLoader[Key, dict]] = {}
+        # ? (function, requests) of every batch dispatched.
+        self.batches: list[tuple[str, int]] = []
+
+    def loader(self, function: str) -> DataLoader[Key, dict]:
+        """The loader of the requests to `function`."""
+        loader = self._loaders.get(function)
+        if loader is None:
+
+            async def load_fn(keys: list[Key]) -> list[dict | BaseException]:
+                self.batches.append((function, len(keys)))
+                requests = [dict(key) for key in keys]
+                if function == "GLOBAL_QUOTE" and len(keys) > 1:
+                    quotes = await self._quotes(requests)
+                    if quotes is not None:
+                        return quotes
+                    return await self._gather(requests, CONCURRENCY)
+                return await self._gather(requests)
+
+            loader = self._loaders[function] = DataLoader(load_fn)
+        return loader
+
+    async def _gather(
+        self, requests: list[Params], concurrency: int | None = None
+    ) -> list[dict | BaseException]:
+        """Fetches `requests` concurrently, at most `concurrency` at once if given."""
+        if concurrency is None:
+            fetch = self.fetch
+        else:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def fetch(params: Params) -> dict:
+                async with semaphore:
+                    return await self.fetch(params)
+
+        return list(
+            await asyncio.gather(
+                *(fetch(params) for params in requests), return_exceptions=True
+            )
+        )
+
+    async def _quotes(self, requests: list[Params]) -> list[dict] | None:
+        """The `GLOBAL_QUOTE` responses of `requests` built from bulk quotes, or `None`
+        when the key has no bulk access."""
+        rows = await bulk.rows(
+            self.key, [params["symbol"] for params in requests], self.fetch
+        )
+        if rows is None:
+            return None
+        return [
+            {"Global Quote": rows.get(params["symbol"].upper(), {})}
+            for params in requests
+        ]
+
+    async def load(self, params: Mapping[str, Any]) -> dict:
+        """Loads one upstream request with the next batch of its function.
+
+        Args:
+            params (Mapping[str, Any]): The raw query string parameters; the key of the
+                request is used when they carry none.
+
+        Returns:
+            dict: The response, as `upstream.fetch_json` returns it.
+        """
+        normalized = normalize_params({"apikey": self.key, **params})
+        return await self.loader(normalized["function"]).load(tuple(normalized.items()))
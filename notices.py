@@ -0,0 +1,25 @@
+def _notice(response: dict) -> str:
+    """The lower-cased notice Alpha Vantage answered with instead of data, if any."""
+    return " ".join(
+        str(response.get(k) or "") for k in ("Information", "Note", "message")
+    ).lower()
+
+
+def is_rate_limited(response: dict) -> bool:
+    """Whether Alpha Vantage answered with a rate limit notice instead of data."""
+    notice = _notice(response)
+    return "rate limit" in notice or "call frequency" in notice
+
+
+def is_premium_notice(response: dict) -> bool:
+    """Whether Alpha Vantage answered that the key's plan lacks the function.
+
+    The rate limit notice advertises the premium plans too, so it is not one.
+    """
+    return "premium" in _notice(response) and not is_rate_limited(response)
+
+
+def is_notice(response: dict) -> bool:
+    """Whether the response is only a notice about the key (rate limit, plan), which
+    must not be cached for the other keys."""
+    return bool(response) and set(response) <= {"Information", "Note"}
@@ -0,0 +1,409 @@
+import asyncio
+import re
+from dataclasses import dataclass, field
+from itertools import islice
+from os import getenv
+from typing import Any, Callable, Mapping
+
+from dotenv import load_dotenv
+from graphql import (
+    FragmentDefinitionNode,
+    GraphQLObjectType,
+    GraphQLSchema,
+    OperationDefinitionNode,
+    get_named_type,
+)
+from graphql.execution.collect_fields import collect_fields, collect_sub_fields
+from graphql.execution.values import get_argument_values, get_variable_values
+import indicators
+from adjusted import SHARED
+from derived import DerivedResponses
+from intraday import COMPACT_SIZE
+from notices import is_rate_limited
+from quotes import as_global_quote, bulk
+from upstream import Fetch, adjusted, aggregator, normalize_params
+
+load_dotenv()
+
+type Params = dict[str, str]
+type Key = tuple[tuple[str, str], ...]
+type Build = Callable[[dict[str, Any], str], list[Params]]
+
+# ? Full series a `compact` request of the same function and symbol is sliced from.
+SLICEABLE = ("TIME_SERIES_DAILY", "TIME_SERIES_DAILY_ADJUSTED")
+WINDOW_ARGUMENTS = ("from", "to", "limit", "after")
+
+
+def snake(name: str) -> str:
+    """The upstream name of a GraphQL argument, e.g. `time_period` for `timePeriod`."""
+    return re.sub(r"([A-Z])", r"_\1", name).lower()
+
+
+def one(function: str, **fixed: str) -> Build:
+    """The single request of a field: `function`, every argument but the window ones
+    under its upstream name, and the `fixed` parameters."""
+
+    def build(args: dict[str, Any], _: str) -> list[Params]:
+        passed = {
+            snake(name): value
+            for name, value in args.items()
+            if name not in WINDOW_ARGUMENTS
+        }
+        return [{"function": function, **passed, **fixed}]
+
+    return build
+
+
+def per_symbol(function: str) -> Build:
+    """One request of `function` per symbol of a `*Batch` field."""
+
+    def build(args: dict[str, Any], _: str) -> list[Params]:
+        rest = {
+            snake(name): value
+            for name, value in args.items()
+            if name not in ("symbols", *WINDOW_ARGUMENTS)
+        }
+        return [
+            {"function": function, "symbol": symbol, **rest}
+            for symbol in args["symbols"]
+        ]
+
+    return build
+
+
+def statements(*functions: str) -> Build:
+    """The whole statement responses a figures or ratios field reads."""
+
+    def build(args: dict[str, Any], _: str) -> list[Params]:
+        return [
+            {"function": function, "symbol": args["symbol"]} for function in functions
+        ]
+
+    return build
+
+
+def average(function: str) -> Build:
+    """The indicator itself, or with `AV_INDICATOR_MODE=local` the price series it is
+    computed from."""
+
+    def build(args: dict[str, Any], _: str) -> list[Params]:
+        if indicators.local():
+            return [indicators.series_request(args["symbol"], args["interval"])[0]]
+        return one(function)(args, _)
+
+    return build
+
+
+def price_series(args: dict[str, Any], _: str) -> list[Params]:
+    """The price series an `indicators` field computes every spec from."""
+    return [indicators.series_request(args["symbol"], args["interval"])[0]]
+
+
+STATEMENTS = ("INCOME_STATEMENT", "CASH_FLOW", "BALANCE_SHEET")
+
+# ? (GraphQL type, field) -> the upstream requests its resolver issues.
+FIELDS: dict[tuple[str, str], Build] = {
+    ("TimeSeries", "intraday"): one("TIME_SERIES_INTRADAY"),
+    ("TimeSeries", "daily"): one("TIME_SERIES_DAILY"),
+    ("TimeSeries", "dailyBatch"): per_symbol("TIME_SERIES_DAILY"),
+    ("TimeSeries", "weekly"): one("TIME_SERIES_WEEKLY"),
+    ("TimeSeries", "monthly"): one("TIME_SERIES_MONTHLY"),
+    ("TimeSeriesAdjusted", "daily"): one("TIME_SERIES_DAILY_ADJUSTED"),
+    ("TimeSeriesAdjusted", "dailyBatch"): per_symbol("TIME_SERIES_DAILY_ADJUSTED"),
+    ("TimeSeriesAdjusted", "weekly"): one("TIME_SERIES_WEEKLY_ADJUSTED"),
+    ("TimeSeriesAdjusted", "monthly"): one("TIME_SERIES_MONTHLY_ADJUSTED"),
+    **{
+        ("TECHNICALAverages", name.lower()): average(name)
+        for name in ("SMA", "EMA", "WMA", "DEMA", "TEMA")
+    },
+    ("TECHNICALAverages", "indicators"): price_series,
+    ("FundementalDataType", "getCompanyOverview"): one("OVERVIEW"),
+    ("FundementalDataType", "overviewFigures"): one("OVERVIEW"),
+    ("FundementalDataType", "getBalanceSheetAnnual"): statements("BALANCE_SHEET"),
+    ("FundementalDataType", "getBalanceSheetQuarterly"): statements("BALANCE_SHEET"),
+    ("FundementalDataType", "balanceSheetFigures"): statements("BALANCE_SHEET"),
+    ("FundementalDataType", "getCashFlowAnnual"): statements("CASH_FLOW"),
+    ("FundementalDataType", "getCashFlowQuarterly"): statements("CASH_FLOW"),
+    ("FundementalDataType", "cashFlowFigures"): statements("CASH_FLOW"),
+    ("FundementalDataType", "getIncomeStatementAnnual"): statements("INCOME_STATEMENT"),
+    ("FundementalDataType", "getIncomeStatementQuarterly"): statements(
+        "INCOME_STATEMENT"
+    ),
+    ("FundementalDataType", "incomeStatementFigures"): statements("INCOME_STATEMENT"),
+    ("FundementalDataType", "ratios"): statements(*STATEMENTS),
+    ("FundementalDataType", "globalQuote"): one("GLOBAL_QUOTE"),
+    ("FundementalDataType", "globalQuoteBatch"): per_symbol("GLOBAL_QUOTE"),
+    ("FundementalDataType", "globalQuotes"): per_symbol("GLOBAL_QUOTE"),
+    ("CRYPTOSeries", "exchangeRate"): one("CURRENCY_EXCHANGE_RATE"),
+    ("CRYPTOSeries", "daily"): one("DIGITAL_CURRENCY_DAILY"),
+    ("CRYPTOSeries", "weekly"): one("DIGITAL_CURRENCY_WEEKLY"),
+    ("CRYPTOSeries", "monthly"): one("DIGITAL_CURRENCY_MONTHLY"),
+    ("CRYPTOSeries", "intraday"): one("CRYPTO_INTRADAY", market="USD"),
+    ("ECONOMICIndicators", "realGdp"): one("REAL_GDP"),
+    ("ECONOMICIndicators", "realGdpPerCapita"): one("REAL_GDP_PER_CAPITA"),
+    ("ECONOMICIndicators", "treasuryYield"): one("TREASURY_YIELD"),
+    ("ECONOMICIndicators", "federalFundsRate"): one("FEDERAL_FUNDS_RATE"),
+    ("ECONOMICIndicators", "cpi"): one("CPI"),
+    ("ECONOMICIndicators", "inflation"): one("INFLATION"),
+    ("ECONOMICIndicators", "retailSales"): one("RETAIL_SALES"),
+    ("ECONOMICIndicators", "durableGoods"): one("DURABLES"),
+    ("ECONOMICIndicators", "unemployment"): one("UNEMPLOYMENT"),
+    ("ECONOMICIndicators", "nonFarmPayroll"): one("NONFARM_PAYROLL"),
+    **{
+        ("COMMODOTIES", name): one(function)
+        for name, function in (
+            ("corn", "CORN"),
+            ("crudeOilWti", "WTI"),
+            ("crudeOilBrent", "BRENT"),
+            ("naturalGas", "NATURAL_GAS"),
+            ("copper", "COPPER"),
+            ("aluminum", "ALUMINUM"),
+            ("wheat", "WHEAT"),
+            ("cotton", "COTTON"),
+            ("sugar", "SUGAR"),
+            ("coffee", "COFFEE"),
+            ("allCommodities", "ALL_COMMODITIES"),
+        )
+    },
+}
+
+
+def compact(full: dict) -> dict | None:
+    """The `compact` response of a full daily series: its latest 100 bars.
+
+    Returns:
+        dict | None: The response, or `None` when `full` holds no series.
+    """
+    meta = full.get("Meta Data")
+    series_key = next((k for k in full if k.startswith("Time Series")), None)
+    if meta is None or series_key is None:
+        return None
+    return {
+        "Meta Data": {**meta, "4. Output Size": "Compact"},
+        series_key: dict(islice(full[series_key].items(), COMPACT_SIZE)),
+    }
+
+
+def quote_of(symbol: str) -> Callable[[dict], dict | None]:
+    """Picks the `GLOBAL_QUOTE` response of `symbol` out of a bulk quotes response, or
+    passes on its rate limit notice."""
+
+    def pick(response: dict) -> dict | None:
+        rows = response.get("data")
+        if not isinstance(rows, list):
+            return response if is_rate_limited(response) else None
+        for row in rows:
+            if str(row.get("symbol", "")).upper() == symbol.upper():
+                return {"Global Quote": as_global_quote(row)}
+        return None
+
+    return pick
+
+
+_slices = DerivedResponses()
+
+
+@dataclass
+class Request:
+    """One distinct upstream request of the plan and the fields that need it."""
+
+    params: Params
+    fields: list[str] = field(default_factory=list)
+    # ? The request this one is derived from, and how.
+    source: Key | None = None
+    derive: Callable[[dict], dict | None] | None = None
+
+
+class QueryPlan:
+    """The upstream requests of one operation, merged before it executes.
+
+    The plan is read from the selection set: every field backed by upstream data (see
+    `FIELDS`) contributes the requests its resolver will issue. Identical requests are
+    merged, `compact` daily series are sliced from the `full` series of the same symbol
+    when the document also asks for it, and the quotes of several symbols from the
+    `REALTIME_BULK_QUOTES` chunks the quote loader batches them into (see
+    `loaders.Loaders`). While the operation runs, `fetch` serves every request once, whatever
+    the cache TTL of its function, so the operation costs the calls listed by `calls`.
+    """
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self.requests: dict[Key, Request] = {}
+        self._fetched: dict[Key, asyncio.Future] = {}
+        self.unplanned: list[Params] = []
+
+    def add(self, path: str, params: Mapping[str, Any]) -> None:
+        """Adds the request a field at `path` issues."""
+        normalized = normalize_params({**params, "apikey": self.key})
+        request = self.requests.setdefault(
+            tuple(normalized.items()), Request(normalized)
+        )
+        request.fields.append(path)
+
+    def merge(self) -> None:
+        """Serves requests from broader ones of the plan where a response holds
+        another."""
+        symbols = sorted(
+            {
+                request.params["symbol"].upper()
+                for request in self.requests.values()
+                if request.params["function"] == "GLOBAL_QUOTE"
+            }
+        )
+        chunks: dict[str, Key] = {}
+        if len(symbols) > 1 and bulk.allowed(self.key):
+            # ? The chunks `quotes.BulkQuotes.rows` requests for the same symbols.
+            for i in range(0, len(symbols), bulk.chunk_size):
+                chunk = symbols[i : i + bulk.chunk_size]
+                params = normalize_params(
+                    {
+                        "function": "REALTIME_BULK_QUOTES",
+                        "symbol": ",".join(chunk),
+                        "apikey": self.key,
+                    }
+                )
+                key = tuple(params.items())
+                self.requests[key] = Request(params)
+                chunks.update((symbol, key) for symbol in chunk)
+        for request in self.requests.values():
+            params = request.params
+            if (
+                params["function"] in SLICEABLE
+                and params.get("outputsize", "compact") == "compact"
+            ):
+                full = tuple(normalize_params({**params, "outputsize": "full"}).items())
+                if full in self.requests:
+                    request.source, request.derive = full, compact
+            elif params["function"] == "GLOBAL_QUOTE":
+                chunk = chunks.get(params["symbol"].upper())
+                if chunk is not None:
+                    request.source, request.derive = chunk, quote_of(params["symbol"])
+
+    async def fetch(self, params: Params, fetch: Fetch) -> dict:
+        """Serves one normalized request of the operation.
+
+        Args:
+            params (Params): The normalized query string parameters.
+            fetch (Fetch): Fetches a request the plan does not serve.
+
+        Returns:
+            dict: The response, shared by every field that needs it.
+        """
+        key = tuple(params.items())
+        request = self.requests.get(key)
+        if request is None:
+            self.unplanned.append(params)
+        elif request.source is not None:
+            source = await self._once(self.requests[request.source].params, fetch)
+            derived = _slices.get(source, repr(key), request.derive)
+            if derived is not None:
+                return derived
+        return await self._once(params, fetch)
+
+    async def _once(self, params: Params, fetch: Fetch) -> dict:
+        key = tuple(params.items())
+        task = self._fetched.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch(params))
+            # ? Mark the exception as retrieved even if every field went away.
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._fetched[key] = task
+        return await asyncio.shield(task)
+
+    def calls(self) -> dict[Key, list[Request]]:
+        """The upstream calls the operation is planned to cost, each with the requests
+        it serves (see `upstream_request`)."""
+        calls: dict[Key, list[Request]] = {}
+        for request in self.requests.values():
+            source = self.requests[request.source] if request.source else request
+            via = upstream_request(source.params)
+            calls.setdefault(tuple(via.items()), []).append(request)
+        return calls
+
+    def report(self) -> dict[str, Any]:
+        """The plan, without the API key, as the `queryPlan` response extension."""
+
+        def shown(params: Mapping[str, str]) -> dict[str, str]:
+            return {k: v for k, v in params.items() if k != "apikey"}
+
+        calls = []
+        for key, served in self.calls().items():
+            call: dict[str, Any] = {
+                "params": shown(dict(key)),
+                "fields": [path for request in served for path in request.fields],
+            }
+            merged = [r.params for r in served if tuple(r.params.items()) != key]
+            if merged:
+                call["serves"] = [shown(params) for params in merged]
+            calls.append(call)
+        return {
+            "requests": len(self.requests),
+            "calls": calls,
+            "fetched": len(self._fetched),
+            "unplanned": [shown(params) for params in self.unplanned],
+        }
+
+
+def upstream_request(params: Params) -> Params:
+    """The request `params` are fetched with once intraday intervals are aggregated
+    from their base, or unadjusted series served from their adjusted one."""
+    if aggregator.handles(params):
+        base = aggregator.source_interval(params["interval"])
+        return normalize_params({**params, "interval": base, "outputsize": "full"})
+    if adjusted.handles(params):
+        return normalize_params({**params, "function": SHARED[params["function"]][0]})
+    return params
+
+
+def plan(
+    schema: GraphQLSchema,
+    operation: OperationDefinitionNode,
+    fragments: dict[str, FragmentDefinitionNode],
+    variables: dict[str, Any] | None,
+    key: str,
+) -> QueryPlan | None:
+    """Plans the upstream requests of a query operation.
+
+    Args:
+        schema (GraphQLSchema): The executable schema.
+        operation (OperationDefinitionNode): The operation about to be executed.
+        fragments (dict[str, FragmentDefinitionNode]): The fragments of the document.
+        variables (dict[str, Any] | None): The raw variables of the request.
+        key (str): The Alpha Vantage API key the operation is resolved with.
+
+    Returns:
+        QueryPlan | None: The merged plan, or `None` for operations that are not
+            queries or whose variables do not coerce (execution reports those).
+    """
+    if operation.operation.value != "query" or schema.query_type is None:
+        return None
+    coerced = get_variable_values(
+        schema, operation.variable_definitions or (), variables or {}
+    )
+    if isinstance(coerced, list):
+        return None
+    query = QueryPlan(key)
+    roots = collect_fields(
+        schema, fragments, coerced, schema.query_type, operation.selection_set
+    )
+    for root_key, root_nodes in roots.items():
+        root = schema.query_type.fields.get(root_nodes[0].name.value)
+        parent = get_named_type(root.type) if root is not None else None
+        if not isinstance(parent, GraphQLObjectType):
+            continue
+        children = collect_sub_fields(schema, fragments, coerced, parent, root_nodes)
+        for child_key, nodes in children.items():
+            build = FIELDS.get((parent.name, nodes[0].name.value))
+            if build is None:
+                continue
+            definition = parent.fields[nodes[0].name.value]
+            args = get_argument_values(definition, nodes[0], coerced)
+            for params in build(args, key):
+                query.add(f"{root_key}.{child_key}", params)
+    query.merge()
+    return query
+
+
+def enabled() -> bool:
+    """Whether operations are planned (`AV_QUERY_PLAN`, on by default)."""
+    return getenv("AV_QUERY_PLAN", "1").lower() not in ("0", "false", "no")
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import time
+from os import getenv
+
+from dotenv import load_dotenv
+from starlette.requests import Request
+from strawberry import Schema
+from scheduler import client_id, lane
+from strawberry_permissions import GraphQLContext, header_field
+from upstream import cache, scheduler
+
+load_dotenv()
+
+PREFETCH_QUERIES: dict[str, str] = {
+    "daily": "query($symbol: String!) { getTimeSeries { daily(symbol: $symbol) "
+    "{ metadata { symbol } } } }",
+    "globalQuote": "query($symbol: String!) { getFundementalData "
+    "{ globalQuote(symbol: $symbol) { symbol } } }",
+    "ema": "query($symbol: String!) { getTechnicalAverages { ema(symbol: $symbol) "
+    "{ MetaData { __typename } } } }",
+}
+
+
+def load_watchlist() -> list[str]:
+    """Reads the symbols to keep warm.
+
+    `AV_WATCHLIST` is a comma-separated list of symbols; `AV_WATCHLIST_FILE` names a
+    file with one symbol per line. Both may be combined.
+
+    Returns:
+        list[str]: The symbols, upper-cased and without duplicates.
+    """
+    symbols = (getenv("AV_WATCHLIST") or "").split(",")
+    path = getenv("AV_WATCHLIST_FILE")
+    if path:
+        with open(path, encoding="utf-8") as f:
+            symbols += f.read().split()
+    return list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+
+
+class Prefetcher:
+    """Keeps the response cache warm for the resolvers and symbols of a watchlist.
+
+    Every round executes, for each symbol, the GraphQL query of each configured
+    resolver (see `PREFETCH_QUERIES`), so the upstream calls are exactly the ones
+    interactive queries make and land in the same cache entries. Calls run in the
+    scheduler's background lane and are only issued while the key has spare quota
+    beyond the reserved share (see `scheduler.Scheduler.spare`); otherwise the round
+    pauses until tokens refill.
+
+    Configuration (environment):
+        AV_WATCHLIST, AV_WATCHLIST_FILE: The symbols, see `load_watchlist`.
+        AV_PREFETCH_KEY: The API key spent on prefetching. Defaults to
+            `ALPHAVANTAGE_API_KEY`.
+        AV_PREFETCH_RESOLVERS: Comma-separated names from `PREFETCH_QUERIES`.
+            Defaults to all of them.
+        AV_PREFETCH_INTERVAL: Seconds between the start of two rounds. Defaults to 900.
+        AV_PREFETCH_RESERVE: Fraction of the key's quota left to interactive calls.
+            Defaults to 0.5.
+
+    Args:
+        schema (Schema): The schema serving the interactive queries.
+    """
+
+    def __init__(
+        self,
+        schema: Schema,
+        symbols: list[str] | None = None,
+        key: str | None = None,
+        resolvers: list[str] | None = None,
+        interval: float | None = None,
+        reserve: float | None = None,
+    ) -> None:
+        self.schema = schema
+        self.symbols = symbols if symbols is not None else load_watchlist()
+        self.key = key or getenv("AV_PREFETCH_KEY") or getenv("ALPHAVANTAGE_API_KEY")
+        self.resolvers = resolvers or [
+            name.strip()
+            for name in (
+                getenv("AV_PREFETCH_RESOLVERS") or ",".join(PREFETCH_QUERIES)
+            ).split(",")
+            if name.strip()
+        ]
+        unknown = set(self.resolvers) - set(PREFETCH_QUERIES)
+        assert not unknown, f"Unknown prefetch resolvers: {sorted(unknown)}"
+        self.interval = (
+            interval
+            if interval is not None
+            else float(getenv("AV_PREFETCH_INTERVAL", "900"))
+        )
+        self.reserve = (
+            reserve
+            if reserve is not None
+            else float(getenv("AV_PREFETCH_RESERVE", "0.5"))
+        )
+        self.state = "idle"
+        self.rounds = 0
+        self.done = 0
+        self.errors = 0
+        self.last_round_s: float | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether there is a watchlist and a key to warm it with."""
+        return bool(self.symbols and self.resolvers and self.key)
+
+    def _context(self) -> GraphQLContext:
+        context = GraphQLContext()
+        context.request = Request(
+            {
+                "type": "http",
+                "method": "POST",
+                "path": "/graphql",
+                "headers": [(header_field.lower().encode(), self.key.encode())],
+                "client": ("prefetch", 0),
+            }
+        )
+        return context
+
+    async def _wait_for_quota(self) -> None:
+        """Sleeps until the key has a spare call."""
+        while scheduler.spare(self.key, self.reserve) < 1:
+            self.state = "waiting"
+            await asyncio.sleep(1)
+        self.state = "warming"
+
+    async def run_round(self) -> None:
+        """Warms every resolver for every symbol once."""
+        started = time.monotonic()
+        self.state, self.done = "warming", 0
+        for symbol in self.symbols:
+            for name in self.resolvers:
+                await self._wait_for_quota()
+                result = await self.schema.execute(
+                    PREFETCH_QUERIES[name],
+                    variable_values={"symbol": symbol},
+                    context_value=self._context(),
+                )
+                if result.errors:
+                    self.errors += 1
+                    logging.warning(
+                        "Prefetching %s for %s failed: %s", name, symbol, result.errors
+                    )
+                self.done += 1
+        self.rounds += 1
+        self.last_round_s = time.monotonic() - started
+        self.state = "idle"
+
+    async def _run(self) -> None:
+        lane.set("background")
+        client_id.set("prefetch")
+        while True:
+            started = time.monotonic()
+            await self.run_round()
+            await asyncio.sleep(max(self.interval - (time.monotonic() - started), 0))
+
+    def start(self) -> None:
+        """Starts the rounds in the background, if a watchlist is configured."""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancels the rounds."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        """Warm-up progress and the cache hit rate interactive callers achieved.
+
+        Returns:
+            dict: The statistics.
+        """
+        return {
+            "enabled": self.enabled,
+            "state": self.state,
+            "symbols": len(self.symbols),
+            "resolvers": self.resolvers,
+            "rounds": self.rounds,
+            "progress": f"{self.done}/{len(self.symbols) * len(self.resolvers)}",
+            "errors": self.errors,
+            "last_round_s": self.last_round_s,
+            "interactive_hit_rate": cache.stats()["hit_rate_by_lane"].get(
+                "interactive", 0.0
+            ),
+        }
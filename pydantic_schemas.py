@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field
+from typing import Annotated, Any, Optional
+
+from pydantic import BaseModel, BeforeValidator, Field, create_model
 
 
 class IncomeStatementSchema(BaseModel):
@@ -554,3 +556,68 @@ class TechIndicatorMetadataSchema(BaseModel):
             str: `SYMBOL:INDICATOR`
         """
         return f"{self.symbol}:{self.indicator}"
+
+
+def as_figure(value: Any) -> Any:
+    """Upstream marks missing figures with `"None"`, `"-"` or an empty string."""
+    return None if value in ("None", "-", "") else value
+
+
+Figure = Annotated[Optional[float], BeforeValidator(as_figure)]
+
+
+def figures_of(schema: type[BaseModel], text: set[str]) -> type[BaseModel]:
+    """Builds the numeric variant of a schema whose figures are all strings.
+
+    Args:
+        schema (type[BaseModel]): The schema.
+        text (set[str]): The fields kept as strings, such as dates and names.
+
+    Returns:
+        type[BaseModel]: `<Name>FiguresSchema`, with every other field a float that
+            is `None` when upstream has no value.
+    """
+    fields = {
+        name: (
+            (field.annotation, field)
+            if name in text
+            else (
+                Figure,
+                Field(
+                    default=None,
+                    title=field.title,
+                    validation_alias=field.validation_alias,
+                ),
+            )
+        )
+        for name, field in schema.model_fields.items()
+    }
+    name = schema.__name__.removesuffix("Schema")
+    return create_model(f"{name}FiguresSchema", __doc__=schema.__doc__, **fields)
+
+
+STATEMENT_TEXT = {"fiscal_date_ending", "reported_currency"}
+
+IncomeStatementFiguresSchema = figures_of(IncomeStatementSchema, STATEMENT_TEXT)
+CashFlowFiguresSchema = figures_of(CashFlowSchema, STATEMENT_TEXT)
+BalanceSheetFiguresSchema = figures_of(BalanceSheetSchema, STATEMENT_TEXT)
+OverviewFiguresSchema = figures_of(
+    OverviewSchema,
+    {
+        "symbol",
+        "asset_type",
+        "name",
+        "description",
+        "cik",
+        "exchange",
+        "currency",
+        "country",
+        "sector",
+        "industry",
+        "address",
+        "fiscal_year_end",
+        "latest_quarter",
+        "dividend_date",
+        "ex_dividend_date",
+    },
+)
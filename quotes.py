@@ -0,0 +1,161 @@
+import asyncio
+import time
+from os import getenv
+
+from dotenv import load_dotenv
+from notices import is_premium_notice, is_rate_limited
+from upstream import Fetch, fetch_json, scheduler
+
+load_dotenv()
+
+
+# ? REALTIME_BULK_QUOTES field -> `GLOBAL_QUOTE` field, as `GlobalQuoteSchema` reads it.
+BULK_FIELDS: dict[str, str] = {
+    "01. symbol": "symbol",
+    "02. open": "open",
+    "03. high": "high",
+    "04. low": "low",
+    "05. price": "close",
+    "06. volume": "volume",
+    "07. latest trading day": "timestamp",
+    "08. previous close": "previous_close",
+    "09. change": "change",
+    "10. change percent": "change_percent",
+}
+
+
+def as_global_quote(row: dict[str, str]) -> dict[str, str]:
+    """Renames the fields of one bulk quote to those of a `GLOBAL_QUOTE` response."""
+    quote = {alias: str(row.get(name, "")) for alias, name in BULK_FIELDS.items()}
+    quote["07. latest trading day"] = quote["07. latest trading day"][:10]
+    if quote["10. change percent"] and not quote["10. change percent"].endswith("%"):
+        quote["10. change percent"] += "%"
+    return quote
+
+
+class BulkQuoteError(Exception):
+    """Raised when a bulk call answered a rate limit notice or an error instead of
+    quotes; the key keeps its bulk access.
+
+    Args:
+        response (dict): The response of the failed call.
+    """
+
+    def __init__(self, response: dict) -> None:
+        super().__init__(
+            response.get("Error Message")
+            or response.get("Note")
+            or response.get("Information")
+            or f"Unexpected bulk quotes response: {response}"
+        )
+        self.response = response
+
+
+class BulkQuotes:
+    """Quotes of many symbols with `REALTIME_BULK_QUOTES`, up to 100 symbols per call.
+
+    Keys whose plan lacks the bulk endpoint are remembered for `AV_BULK_QUOTE_RETRY`
+    seconds (default a day); `rows` returns `None` for them so callers fall back to
+    one `GLOBAL_QUOTE` call per symbol. A rate limit notice or an error is only a
+    failed call: it empties the key's bucket (see `scheduler.Scheduler.throttled`) for a
+    rate limit, and raises `BulkQuoteError` rather than fanning out to per-symbol calls.
+
+    Configuration (environment):
+        AV_BULK_QUOTE_CHUNK: Symbols per bulk call. Defaults to 100, the upstream limit.
+        AV_BULK_QUOTE_RETRY: Seconds before a key without bulk access is tried again.
+    """
+
+    def __init__(self, chunk_size: int | None = None, retry: float | None = None):
+        self.chunk_size = chunk_size or int(getenv("AV_BULK_QUOTE_CHUNK", "100"))
+        self.retry = (
+            retry
+            if retry is not None
+            else float(getenv("AV_BULK_QUOTE_RETRY", str(24 * 60 * 60)))
+        )
+        self._denied_at: dict[str, float] = {}
+        self.bulk_calls = 0
+        self.denials = 0
+        self.fallbacks = 0
+        self.failures = 0
+
+    def allowed(self, key: str) -> bool:
+        """Whether bulk calls are worth trying for `key`."""
+        denied_at = self._denied_at.get(key)
+        return denied_at is None or time.monotonic() - denied_at > self.retry
+
+    async def rows(
+        self, key: str, symbols: list[str], fetch: Fetch = fetch_json
+    ) -> dict[str, dict[str, str]] | None:
+        """Fetches the quotes of `symbols`, chunks concurrently, as the `Global Quote`
+        of a `GLOBAL_QUOTE` response.
+
+        Chunks are built from the sorted distinct symbols, so the same set requested in
+        any order shares cache entries.
+
+        Args:
+            key (str): The Alpha Vantage API key.
+            symbols (list[str]): The symbols.
+            fetch (Fetch, optional): Fetches one chunk. Defaults to `fetch_json`.
+
+        Returns:
+            dict[str, dict[str, str]] | None: The quotes by upper-cased symbol (symbols
+                upstream did not know are missing), or `None` when the key has no bulk
+                access.
+
+        Raises:
+            BulkQuoteError: If a chunk answered a rate limit notice or an error.
+        """
+        if not self.allowed(key):
+            self.fallbacks += 1
+            return None
+        distinct = sorted({symbol.upper() for symbol in symbols})
+        chunks = [
+            distinct[i : i + self.chunk_size]
+            for i in range(0, len(distinct), self.chunk_size)
+        ]
+        self.bulk_calls += len(chunks)
+        responses = await asyncio.gather(
+            *(
+                fetch(
+                    {
+                        "function": "REALTIME_BULK_QUOTES",
+                        "symbol": ",".join(chunk),
+                        "apikey": key,
+                    }
+                )
+                for chunk in chunks
+            )
+        )
+        if any(is_premium_notice(response) for response in responses):
+            self._denied_at[key] = time.monotonic()
+            self.denials += 1
+            self.fallbacks += 1
+            return None
+        for response in responses:
+            if not isinstance(response.get("data"), list):
+                if is_rate_limited(response):
+                    scheduler.throttled(key)
+                self.failures += 1
+                raise BulkQuoteError(response)
+        return {
+            quote["01. symbol"].upper(): quote
+            for quote in (
+                as_global_quote(row)
+                for response in responses
+                for row in response["data"]
+            )
+        }
+
+    def stats(self) -> dict[str, int]:
+        """Bulk calls issued, keys found without bulk access, fallbacks taken and
+        failed calls."""
+        return {
+            "bulk_calls": self.bulk_calls,
+            "denials": self.denials,
+            "fallbacks": self.fallbacks,
+            "failures": self.failures,
+            "keys_without_bulk": len(self._denied_at),
+        }
+
+
+bulk = BulkQuotes()
@@ -0,0 +1,184 @@
+from os import getenv
+from typing import Awaitable, Callable, Literal, Mapping
+
+import numpy as np
+from dotenv import load_dotenv
+from derived import DerivedResponses
+from series import SeriesFrame
+
+load_dotenv()
+
+type Period = Literal["weekly", "monthly"]
+type Daily = Callable[[Mapping[str, str]], Awaitable[dict | None]]
+
+# ? Function -> (period, adjusted, series key, information).
+RESAMPLED: dict[str, tuple[Period, bool, str, str]] = {
+    "TIME_SERIES_WEEKLY": (
+        "weekly",
+        False,
+        "Weekly Time Series",
+        "Weekly Prices (open, high, low, close) and Volumes",
+    ),
+    "TIME_SERIES_WEEKLY_ADJUSTED": (
+        "weekly",
+        True,
+        "Weekly Adjusted Time Series",
+        "Weekly Adjusted Prices and Volumes",
+    ),
+    "TIME_SERIES_MONTHLY": (
+        "monthly",
+        False,
+        "Monthly Time Series",
+        "Monthly Prices (open, high, low, close) and Volumes",
+    ),
+    "TIME_SERIES_MONTHLY_ADJUSTED": (
+        "monthly",
+        True,
+        "Monthly Adjusted Time Series",
+        "Monthly Adjusted Prices and Volumes",
+    ),
+}
+
+DAILY_KEY = "Time Series (Daily)"
+
+
+def buckets(dates: list[str], period: Period) -> np.ndarray:
+    """The week or month of each date, as an integer that changes with the period.
+
+    Weeks run from Saturday to Friday, so a week is named after its last trading day
+    as upstream does.
+    """
+    days = np.array(dates, dtype="datetime64[D]")
+    if period == "monthly":
+        return days.astype("datetime64[M]").astype(np.int64)
+    # ? Day 0 (1970-01-01) is a Thursday, so Saturdays are the days where d + 5 is a
+    # ? multiple of seven.
+    return (days.astype(np.int64) + 5) // 7
+
+
+def resample(frame: SeriesFrame, period: Period, adjusted: bool) -> dict[str, dict]:
+    """Aggregates daily bars into weekly or monthly ones in one vectorized pass.
+
+    A bar opens at the first open of its period, closes at the last close, spans the
+    highest high and lowest low, and sums the volumes (and the dividends of adjusted
+    bars, whose adjusted close is the last one). It is keyed by its last trading day,
+    so the current period is keyed by the latest bar, as upstream does.
+
+    Args:
+        frame (SeriesFrame): The daily bars, newest first; an adjusted series when
+            `adjusted`.
+        period (Period): `weekly` or `monthly`.
+        adjusted (bool): Whether to build the adjusted layout.
+
+    Returns:
+        dict[str, dict]: The bars keyed by date, newest first, in upstream's layout.
+    """
+    dates = frame.dates
+    if not dates:
+        return {}
+    ids = buckets(dates, period)
+    # ? Newest first: a period starts at its last trading day and ends at its first.
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    ends = np.r_[starts[1:], len(ids)] - 1
+    volume_key = "6. volume" if "6. volume" in frame.series[dates[0]] else "5. volume"
+    volume = np.add.reduceat(np.nan_to_num(frame.column(volume_key)), starts)
+    columns = {
+        "1. open": frame.column("1. open")[ends],
+        "2. high": np.fmax.reduceat(frame.column("2. high"), starts),
+        "3. low": np.fmin.reduceat(frame.column("3. low"), starts),
+        "4. close": frame.column("4. close")[starts],
+    }
+    if adjusted:
+        columns["5. adjusted close"] = frame.column("5. adjusted close")[starts]
+    formatted = {name: [f"{v:.4f}" for v in values] for name, values in columns.items()}
+    volume_name = "6. volume" if adjusted else "5. volume"
+    formatted[volume_name] = [str(int(v)) for v in volume]
+    if adjusted:
+        dividends = np.add.reduceat(
+            np.nan_to_num(frame.column("7. dividend amount")), starts
+        )
+        formatted["7. dividend amount"] = [f"{v:.4f}" for v in dividends]
+    names = list(formatted)
+    rows = zip(*formatted.values())
+    return {
+        dates[start]: dict(zip(names, row)) for start, row in zip(starts.tolist(), rows)
+    }
+
+
+class Resampler:
+    """Serves weekly and monthly series from a fresh daily history.
+
+    `TIME_SERIES_WEEKLY`/`MONTHLY` (and their adjusted functions) are built from the
+    symbol's full daily history when the history store checked it upstream within the
+    daily TTL, instead of spending a call. Adjusted series need the adjusted history;
+    unadjusted ones use either. Derived responses are kept while their history keeps
+    being served.
+
+    Configuration (environment):
+        AV_RESAMPLE: `0` to always call upstream. Defaults to on.
+    """
+
+    def __init__(self, enabled: bool | None = None, max_size: int = 64) -> None:
+        self.enabled = (
+            enabled
+            if enabled is not None
+            else getenv("AV_RESAMPLE", "1").lower() not in ("0", "false", "no")
+        )
+        self._derived = DerivedResponses(max_size)
+        self.resampled = 0
+        self.misses = 0
+
+    def handles(self, params: Mapping[str, str]) -> bool:
+        """Whether `params` request a series that may be resampled from daily bars."""
+        return self.enabled and params.get("function") in RESAMPLED
+
+    @staticmethod
+    def _build(daily: dict, function: str) -> dict:
+        period, adjusted, series_key, information = RESAMPLED[function]
+        meta = daily["Meta Data"]
+        return {
+            "Meta Data": {
+                "1. Information": information,
+                "2. Symbol": meta.get("2. Symbol"),
+                "3. Last Refreshed": meta.get("3. Last Refreshed"),
+                "4. Time Zone": meta.get("5. Time Zone"),
+            },
+            series_key: resample(SeriesFrame.of(daily[DAILY_KEY]), period, adjusted),
+        }
+
+    async def serve(self, params: Mapping[str, str], daily: Daily) -> dict | None:
+        """Builds a weekly or monthly response from the daily history, if fresh.
+
+        Args:
+            params (Mapping[str, str]): The normalized query string parameters.
+            daily (Daily): Returns the fresh full daily response of normalized
+                parameters, or `None`.
+
+        Returns:
+            dict | None: The response shaped as upstream returns it, or `None` when no
+                fresh daily history is at hand.
+        """
+        function = params["function"]
+        adjusted = RESAMPLED[function][1]
+        sources = ["TIME_SERIES_DAILY_ADJUSTED"]
+        if not adjusted:
+            sources.insert(0, "TIME_SERIES_DAILY")
+        for source in sources:
+            request = {**params, "function": source, "outputsize": "full"}
+            found = await daily(dict(sorted(request.items())))
+            if found is not None and DAILY_KEY in found and "Meta Data" in found:
+                self.resampled += 1
+                return self._derived.get(
+                    found, function, lambda daily: self._build(daily, function)
+                )
+        self.misses += 1
+        return None
+
+    def stats(self) -> dict[str, int | bool]:
+        """Requests resampled, responses derived and requests left to upstream."""
+        return {
+            "enabled": self.enabled,
+            "resampled": self.resampled,
+            "derivations": self._derived.builds,
+            "misses": self.misses,
+        }
@@ -0,0 +1,301 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from os import getenv
+from typing import Literal
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+type Lane = Literal["interactive", "background"]
+
+LANES: tuple[Lane, ...] = ("interactive", "background")
+
+lane: ContextVar[Lane] = ContextVar("lane", default="interactive")
+client_id: ContextVar[str] = ContextVar("client_id", default="anonymous")
+
+
+class QuotaExceeded(Exception):
+    """Raised when an API key has spent its daily quota."""
+
+
+@dataclass(frozen=True)
+class Tier:
+    """The quota of an Alpha Vantage plan. `0` means unlimited."""
+
+    per_minute: float
+    per_day: int
+
+
+DEFAULT_TIERS: dict[str, Tier] = {
+    "free": Tier(per_minute=5, per_day=25),
+    "premium75": Tier(per_minute=75, per_day=0),
+    "premium150": Tier(per_minute=150, per_day=0),
+    "premium300": Tier(per_minute=300, per_day=0),
+    "premium600": Tier(per_minute=600, per_day=0),
+    "premium1200": Tier(per_minute=1200, per_day=0),
+    "unlimited": Tier(per_minute=0, per_day=0),
+}
+
+
+def _parse_mapping(value: str | None) -> dict[str, str]:
+    """Parses `a=1,b=2` style environment values."""
+    if not value:
+        return {}
+    pairs = (item.split("=", 1) for item in value.split(",") if "=" in item)
+    return {k.strip(): v.strip() for k, v in pairs}
+
+
+def key_id(key: str) -> str:
+    """Names an API key in statistics without revealing it: the first 12 hex digits of
+    its SHA-256."""
+    return hashlib.sha256(key.encode()).hexdigest()[:12]
+
+
+def load_tiers() -> dict[str, Tier]:
+    """Reads the known tiers, extended or overridden by `AV_TIERS`.
+
+    `AV_TIERS` is a comma-separated list of `name=per_minute/per_day`, e.g.
+    `AV_TIERS=team=30/0,free=5/25`.
+
+    Returns:
+        dict[str, Tier]: The tiers by name.
+    """
+    tiers = dict(DEFAULT_TIERS)
+    for name, quota in _parse_mapping(getenv("AV_TIERS")).items():
+        per_minute, _, per_day = quota.partition("/")
+        tiers[name] = Tier(per_minute=float(per_minute), per_day=int(per_day or 0))
+    return tiers
+
+
+@dataclass
+class _KeyState:
+    """The token bucket and wait queues of one API key."""
+
+    tier: Tier
+    tokens: float
+    refilled_at: float
+    day: str
+    used_today: int = 0
+    queues: dict[Lane, OrderedDict[str, deque[asyncio.Future]]] = field(
+        default_factory=lambda: {name: OrderedDict() for name in LANES}
+    )
+    dispatcher: asyncio.Task | None = None
+    waits: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+
+class Scheduler:
+    """Per-API-key token bucket that queues upstream calls within the key's quota.
+
+    Each key is assigned a tier (`AV_KEY_TIERS=key=tier,...`, otherwise
+    `AV_DEFAULT_TIER`, itself defaulting to `unlimited`, so only keys of a configured
+    tier are throttled). Calls beyond the per-minute rate
+    wait in a queue; calls beyond the daily quota raise `QuotaExceeded`. Waiting calls
+    are served interactive lane first, and round-robin between the clients sharing the
+    key inside each lane, so one busy client cannot starve another. Keys come from a
+    request header, so once more than `max_keys` are tracked, the idle ones (nothing
+    queued, bucket full, no daily quota spent) are forgotten.
+
+    Args:
+        tiers (dict[str, Tier] | None, optional): Defaults to `load_tiers()`.
+        key_tiers (dict[str, str] | None, optional): Defaults to `AV_KEY_TIERS`.
+        default_tier (str | None, optional): Defaults to `AV_DEFAULT_TIER`.
+        max_keys (int, optional): Keys tracked before idle ones are forgotten.
+            Defaults to 1024.
+
+    Raises:
+        ValueError: If a tier named by `AV_KEY_TIERS` or `AV_DEFAULT_TIER` is unknown.
+    """
+
+    def __init__(
+        self,
+        tiers: dict[str, Tier] | None = None,
+        key_tiers: dict[str, str] | None = None,
+        default_tier: str | None = None,
+        max_keys: int = 1024,
+    ) -> None:
+        self.tiers = tiers or load_tiers()
+        self.key_tiers = (
+            key_tiers
+            if key_tiers is not None
+            else _parse_mapping(getenv("AV_KEY_TIERS"))
+        )
+        self.default_tier = default_tier or getenv("AV_DEFAULT_TIER", "unlimited")
+        unknown = sorted(
+            {self.default_tier, *self.key_tiers.values()}.difference(self.tiers)
+        )
+        if unknown:
+            raise ValueError(
+                f"Unknown tiers {', '.join(unknown)} in AV_KEY_TIERS or "
+                f"AV_DEFAULT_TIER; known tiers are {', '.join(sorted(self.tiers))}"
+            )
+        self.max_keys = max_keys
+        self._keys: dict[str, _KeyState] = {}
+        self._evict_above = max_keys
+
+    def _state(self, key: str) -> _KeyState:
+        """Returns the state of `key`, refilled up to now."""
+        state = self._keys.get(key)
+        now = time.monotonic()
+        today = datetime.now(timezone.utc).date().isoformat()
+        if state is None:
+            tier = self.tiers[self.key_tiers.get(key, self.default_tier)]
+            state = _KeyState(
+                tier=tier, tokens=tier.per_minute, refilled_at=now, day=today
+            )
+            self._keys[key] = state
+            if len(self._keys) > self._evict_above:
+                self._evict(key, now, today)
+        if state.day != today:
+            state.day, state.used_today = today, 0
+        rate = state.tier.per_minute / 60
+        state.tokens = min(
+            state.tier.per_minute, state.tokens + (now - state.refilled_at) * rate
+        )
+        state.refilled_at = now
+        return state
+
+    def _evict(self, keep: str, now: float, today: str) -> None:
+        """Forgets the idle keys other than `keep`."""
+        for key, state in list(self._keys.items()):
+            full = not state.tier.per_minute or (
+                state.tokens + (now - state.refilled_at) * state.tier.per_minute / 60
+                >= state.tier.per_minute
+            )
+            spent = state.tier.per_day and state.day == today and state.used_today
+            busy = state.dispatcher is not None and not state.dispatcher.done()
+            idle = full and not spent and not busy and not self._queued(state)
+            if idle and key != keep:
+                del self._keys[key]
+        # ? The next sweep waits for as many new keys as are still tracked.
+        self._evict_above = max(self.max_keys, 2 * len(self._keys))
+
+    def _take(self, state: _KeyState) -> None:
+        """Spends one token and one unit of the daily quota."""
+        if state.tier.per_day and state.used_today >= state.tier.per_day:
+            raise QuotaExceeded(
+                f"Daily quota of {state.tier.per_day} calls is exhausted."
+            )
+        state.used_today += 1
+        if state.tier.per_minute:
+            state.tokens -= 1
+
+    def _queued(self, state: _KeyState) -> int:
+        return sum(len(q) for queues in state.queues.values() for q in queues.values())
+
+    async def acquire(self, key: str) -> None:
+        """Waits until `key` may issue one upstream call.
+
+        The lane and client are read from the `lane` and `client_id` context variables.
+
+        Args:
+            key (str): The Alpha Vantage API key.
+
+        Raises:
+            QuotaExceeded: If the daily quota of the key is spent.
+        """
+        state = self._state(key)
+        if not state.tier.per_minute or (state.tokens >= 1 and not self._queued(state)):
+            self._take(state)
+            return
+        future = asyncio.get_running_loop().create_future()
+        state.queues[lane.get()].setdefault(client_id.get(), deque()).append(future)
+        if state.dispatcher is None or state.dispatcher.done():
+            state.dispatcher = asyncio.create_task(self._dispatch(key))
+        queued_at = time.monotonic()
+        await future
+        waited = time.monotonic() - queued_at
+        state.waits += 1
+        state.wait_total += waited
+        state.wait_max = max(state.wait_max, waited)
+
+    def _next_waiter(self, state: _KeyState) -> asyncio.Future | None:
+        """Pops the next waiter: interactive first, round-robin across clients."""
+        for name in LANES:
+            clients = state.queues[name]
+            while clients:
+                client, waiters = next(iter(clients.items()))
+                future = waiters.popleft()
+                if waiters:
+                    clients.move_to_end(client)
+                else:
+                    del clients[client]
+                if not future.done():
+                    return future
+        return None
+
+    async def _dispatch(self, key: str) -> None:
+        """Releases queued calls of `key` as tokens become available."""
+        while True:
+            state = self._state(key)
+            while state.tokens >= 1:
+                future = self._next_waiter(state)
+                if future is None:
+                    return
+                try:
+                    self._take(state)
+                except QuotaExceeded as error:
+                    future.set_exception(error)
+                    continue
+                future.set_result(None)
+            if not self._queued(state):
+                return
+            await asyncio.sleep((1 - state.tokens) * 60 / state.tier.per_minute)
+
+    def spare(self, key: str, reserve: float = 0.0) -> float:
+        """Calls `key` can issue now without touching the share kept for interactive use.
+
+        Args:
+            key (str): The Alpha Vantage API key.
+            reserve (float, optional): Fraction of the per-minute bucket and of the
+                daily quota kept for interactive calls. Defaults to 0.
+
+        Returns:
+            float: The spare calls; `0` while interactive calls are queued.
+        """
+        state = self._state(key)
+        if any(state.queues["interactive"].values()):
+            return 0.0
+        spare = float("inf")
+        if state.tier.per_minute:
+            spare = state.tokens - reserve * state.tier.per_minute
+        if state.tier.per_day:
+            spare = min(spare, state.tier.per_day * (1 - reserve) - state.used_today)
+        return max(spare, 0.0)
+
+    def throttled(self, key: str) -> None:
+        """Empties the bucket of `key` after Alpha Vantage reported a rate limit.
+
+        Args:
+            key (str): The Alpha Vantage API key.
+        """
+        self._state(key).tokens = 0
+
+    def stats(self) -> dict[str, dict]:
+        """Queue depth, wait time and quota use per tracked API key.
+
+        Returns:
+            dict[str, dict]: The statistics by `key_id`.
+        """
+        out: dict[str, dict] = {}
+        for key, state in self._keys.items():
+            out[key_id(key)] = {
+                "tier": self.key_tiers.get(key, self.default_tier),
+                "tokens": round(state.tokens, 2),
+                "used_today": state.used_today,
+                "queue_depth": {
+                    name: sum(len(q) for q in state.queues[name].values())
+                    for name in LANES
+                },
+                "waits": state.waits,
+                "wait_avg_s": state.wait_total / state.waits if state.waits else 0.0,
+                "wait_max_s": state.wait_max,
+            }
+        return out
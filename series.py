@@ -0,0 +1,215 @@
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+from os import getenv
+from typing import Any, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MISSING: tuple[str, ...] = ("None", "none", "null", "", "-", ".")
+
+
+def parse_column(values: Sequence[str | None], dtype: type = np.float64) -> np.ndarray:
+    """Parses the string values of one field of every bar in a single vectorized pass.
+
+    Alpha Vantage sends every number as a string and marks gaps with `"None"`, `"-"`
+    or `"."` (economic series); those, and missing values, become NaN.
+
+    Args:
+        values (Sequence[str | None]): The raw values.
+        dtype (type, optional): `np.float64`, or `np.int64` for counts such as volumes;
+            integers fall back to `float64` when a value is missing or fractional.
+            Defaults to `np.float64`.
+
+    Returns:
+        np.ndarray: The parsed values.
+    """
+    try:
+        # ? NumPy parses numeric strings itself; this is the path of clean columns.
+        return np.array(values, dtype=dtype)
+    except (TypeError, ValueError):
+        pass
+    raw = np.array(values, dtype=np.str_)
+    missing = np.isin(raw, MISSING)
+    return np.where(missing, "nan", raw).astype(np.float64)
+
+
+def to_list(values: np.ndarray) -> list[Any]:
+    """Converts parsed values to Python numbers, with NaN as `None`.
+
+    Args:
+        values (np.ndarray): The parsed values.
+
+    Returns:
+        list[Any]: The values, ready to be serialized.
+    """
+    out = values.tolist()
+    if values.dtype.kind == "f":
+        for i in np.flatnonzero(np.isnan(values)).tolist():
+            out[i] = None
+    return out
+
+
+@dataclass(frozen=True)
+class Window:
+    """A date range and page of a series. Bounds are inclusive; `after` is a cursor.
+
+    Dates compare as strings, so a date bound also covers the intraday timestamps of
+    that day.
+    """
+
+    start: str | None = None
+    end: str | None = None
+    limit: int | None = None
+    after: str | None = None
+
+
+class SeriesFrame:
+    """Column-oriented view of the bars of one Alpha Vantage time series.
+
+    Alpha Vantage returns a series as `{date: {"1. open": "...", ...}}`. A frame keeps
+    that mapping untouched (it is shared with the response cache) and parses a column
+    into a NumPy array the first time it is requested, so resolvers only pay for the
+    columns a query selects. `window` narrows a frame to a date range by binary search,
+    so only the bars in the range are ever parsed or materialized.
+
+    Args:
+        series (dict[str, dict[str, str]]): The bars keyed by date, newest first.
+    """
+
+    _recent: OrderedDict[int, "SeriesFrame"] = OrderedDict()
+    _recent_size = int(getenv("AV_FRAME_CACHE_SIZE", "64"))
+    _lock = threading.Lock()
+
+    def __init__(self, series: dict[str, dict[str, str]]) -> None:
+        self.series = series
+        self.next_cursor: str | None = None
+        self._base: SeriesFrame | None = None
+        self._start = 0
+        self._stop = len(series)
+        self._dates: list[str] | None = None
+        self._ascending: list[str] | None = None
+        self._columns: dict[str, np.ndarray] = {}
+
+    @classmethod
+    def of(cls, series: dict[str, dict[str, str]]) -> "SeriesFrame":
+        """The frame of `series`, reused while the same payload keeps being served.
+
+        Cached responses are shared dicts, so a series served again from the response
+        cache is the same object, and its columns are only parsed once. The
+        `AV_FRAME_CACHE_SIZE` (default 64) most recent frames are kept; each holds its
+        series, so the identity of a cached one cannot be reused by another dict.
+
+        Args:
+            series (dict[str, dict[str, str]]): The bars keyed by date, newest first.
+
+        Returns:
+            SeriesFrame: The frame.
+        """
+        with cls._lock:
+            frame = cls._recent.get(id(series))
+            if frame is not None and frame.series is series:
+                cls._recent.move_to_end(id(series))
+                return frame
+            frame = cls(series)
+            cls._recent[id(series)] = frame
+            while len(cls._recent) > cls._recent_size:
+                cls._recent.popitem(last=False)
+            return frame
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @property
+    def span(self) -> slice:
+        """The positions of the bars of this frame among those of the whole series."""
+        return slice(self._start, self._stop)
+
+    @property
+    def dates(self) -> list[str]:
+        """The dates of the bars, newest first."""
+        if self._dates is None:
+            if self._base is None:
+                self._dates = list(self.series)
+            else:
+                self._dates = self._base.dates[self._start : self._stop]
+        return self._dates
+
+    def window(self, window: Window) -> "SeriesFrame":
+        """Narrows the frame to the bars of `window`.
+
+        Args:
+            window (Window): The range and page.
+
+        Returns:
+            SeriesFrame: A view of the bars in the window. Its `next_cursor` is the date
+                of its last bar when `limit` left more bars of the range out.
+        """
+        if window == Window():
+            return self
+        dates = self.dates
+        if self._ascending is None:
+            self._ascending = dates[::-1]
+        ascending, count = self._ascending, len(dates)
+        start, stop = 0, count
+        if window.end is not None:
+            start = count - bisect_right(ascending, window.end + "\x7f")
+        if window.after is not None:
+            start = max(start, count - bisect_left(ascending, window.after))
+        if window.start is not None:
+            stop = count - bisect_left(ascending, window.start)
+        stop = max(start, stop)
+        end = stop if window.limit is None else min(stop, start + max(window.limit, 0))
+        base = self._base or self
+        view = SeriesFrame(self.series)
+        view._base = base
+        view._start = self._start + start
+        view._stop = self._start + end
+        if start < end < stop:
+            view.next_cursor = dates[end - 1]
+        return view
+
+    def column(self, key: str) -> np.ndarray:
+        """The values of one field of every bar.
+
+        Volumes are parsed as `int64` when they are all whole numbers.
+
+        Args:
+            key (str): The field as Alpha Vantage names it, e.g. "4. close".
+
+        Returns:
+            np.ndarray: The values, in the order of `dates`.
+        """
+        values = self._columns.get(key)
+        if values is None:
+            parsed = self._base._columns.get(key) if self._base is not None else None
+            if parsed is not None:
+                values = parsed[self._start : self._stop]
+            else:
+                bars = islice(self.series.values(), self._start, self._stop)
+                values = parse_column(
+                    [bar.get(key) for bar in bars],
+                    np.int64 if "volume" in key else np.float64,
+                )
+            self._columns[key] = values
+        return values
+
+    def values(self, key: str) -> list[Any]:
+        """The values of one field as Python numbers, with gaps as `None`.
+
+        Args:
+            key (str): The field as Alpha Vantage names it.
+
+        Returns:
+            list[Any]: The values, in the order of `dates`.
+        """
+        return to_list(self.column(key))
+
+    def bars(self) -> list[dict[str, str]]:
+        """The raw bars, in the order of `dates`."""
+        return list(islice(self.series.values(), self._start, self._stop))
@@ -0,0 +1,59 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent identical upstream calls into one.
+
+    The first caller of a key starts the call; every caller that arrives while it is
+    in flight awaits the same task and receives the same parsed result (or exception).
+    The shared task is shielded, so one caller being cancelled does not cancel it for
+    the others.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+        self.issued = 0
+        self.coalesced = 0
+
+    async def do[T](
+        self, key: Hashable, fn: Callable[[], Awaitable[T]]
+    ) -> T:  #! pylint: disable=e0602
+        """Runs `fn` unless a call for `key` is already in flight, then awaits it.
+
+        Args:
+            key (Hashable): Identifies calls that return the same result.
+            fn (Callable[[], Awaitable[T]]): Starts the call.
+
+        Returns:
+            T: The result of the single call.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            self.issued += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        """Drops a finished call so the next caller issues a fresh one."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # ? Mark the exception as retrieved even if every caller went away.
+            task.exception()
+
+    def stats(self) -> dict[str, int]:
+        """Issued vs. coalesced call counters.
+
+        Returns:
+            dict[str, int]: The counters.
+        """
+        return {
+            "issued": self.issued,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,152 @@
+from typing import Optional
+
+from graphql import FragmentDefinitionNode, get_operation_ast
+from strawberry.annotation import StrawberryAnnotation
+from strawberry.arguments import StrawberryArgument
+from strawberry.extensions import FieldExtension, SchemaExtension
+import planner
+from scheduler import client_id
+from series import Window
+from upstream import DataAge, data_age, query_plan
+
+
+class UpstreamScope(SchemaExtension):
+    """Tags the upstream calls of an operation with the client that requested it.
+
+    The scheduler uses the client to queue fairly between callers sharing one API key.
+    Clients are identified by the `X-Client-Id` header, falling back to their address.
+
+    The age of the data the operation was served from is reported in the response's
+    `extensions.dataAge`: `seconds` since the oldest upstream response was fetched, and
+    `stale` when any of them had expired (see `upstream.fetch_json`).
+    """
+
+    def __init__(self, *, execution_context=None):
+        super().__init__(execution_context=execution_context)
+        self.age = DataAge()
+
+    def on_operation(self):
+        request = getattr(self.execution_context.context, "request", None)
+        client = None
+        if request is not None:
+            client = request.headers.get("X-Client-Id") or (
+                request.client.host if request.client else None
+            )
+        token = client_id.set(client or "anonymous")
+        age_token = data_age.set(self.age)
+        yield
+        data_age.reset(age_token)
+        client_id.reset(token)
+
+    def get_results(self):
+        if not self.age.responses:
+            return {}
+        return {
+            "dataAge": {
+                "seconds": round(self.age.seconds, 3),
+                "stale": self.age.stale,
+            }
+        }
+
+
+class QueryPlanner(SchemaExtension):
+    """Plans the upstream requests of a query before it executes (see
+    `planner.QueryPlan`), so fields needing the same data share one call.
+
+    Requests with an `X-Debug-Plan: 1` header get the plan in the response's
+    `extensions.queryPlan`: the `calls` planned, with the fields each one serves and
+    the requests merged into it, how many distinct requests were `fetched` and any that
+    were `unplanned`.
+
+    Configuration (environment):
+        AV_QUERY_PLAN: `0` to resolve every field on its own. Defaults to on.
+    """
+
+    def __init__(self, *, execution_context=None):
+        super().__init__(execution_context=execution_context)
+        self.plan: planner.QueryPlan | None = None
+
+    def on_execute(self):
+        context = self.execution_context
+        request = getattr(context.context, "request", None)
+        key = request.headers.get("ALPHAVANTAGE_API_KEY") if request else None
+        document = context.graphql_document
+        operation = (
+            get_operation_ast(document, context.operation_name)
+            if document is not None
+            else None
+        )
+        if planner.enabled() and key and operation is not None:
+            fragments = {
+                definition.name.value: definition
+                for definition in document.definitions
+                if isinstance(definition, FragmentDefinitionNode)
+            }
+            self.plan = planner.plan(
+                context.schema._schema, operation, fragments, context.variables, key
+            )
+        token = query_plan.set(self.plan)
+        yield
+        query_plan.reset(token)
+
+    def get_results(self):
+        request = getattr(self.execution_context.context, "request", None)
+        if self.plan is None or request is None:
+            return {}
+        if request.headers.get("X-Debug-Plan", "").lower() not in ("1", "true"):
+            return {}
+        return {"queryPlan": self.plan.report()}
+
+
+class Windowed(FieldExtension):
+    """Adds `from`, `to`, `limit` and `after` arguments to a field returning a series.
+
+    `from` and `to` are inclusive dates (or timestamps) bounding the bars, `limit`
+    caps how many of the newest bars in the range are returned and `after` continues
+    from the `nextCursor` of a previous page. The window is applied by binary search on
+    the frame of the result (see `series.SeriesFrame.window`), before any bar is
+    parsed or turned into an object.
+
+    The field must return a `strawberry_interfaces.WindowedSeries`, or a list of them
+    (or of `BatchItem`s wrapping them), each of which is windowed.
+    """
+
+    ARGUMENTS: tuple[tuple[str, str | None, type, str], ...] = (
+        ("from_", "from", str, "Oldest date to return, inclusive."),
+        ("to", None, str, "Newest date to return, inclusive."),
+        ("limit", None, int, "Maximum number of bars, newest first."),
+        ("after", None, str, "The `nextCursor` of the previous page."),
+    )
+
+    def apply(self, field) -> None:
+        field.arguments = [
+            *field.arguments,
+            *(
+                StrawberryArgument(
+                    python_name=python_name,
+                    graphql_name=graphql_name,
+                    type_annotation=StrawberryAnnotation(Optional[kind]),
+                    default=None,
+                    description=description,
+                )
+                for python_name, graphql_name, kind, description in self.ARGUMENTS
+            ),
+        ]
+
+    async def resolve_async(
+        self,
+        next_,
+        source,
+        info,
+        *,
+        from_=None,
+        to=None,
+        limit=None,
+        after=None,
+        **kwargs
+    ):
+        result = await next_(source, info, **kwargs)
+        window = Window(start=from_, end=to, limit=limit, after=after)
+        if isinstance(result, list):
+            return [item.windowed(window) for item in result]
+        return result.windowed(window)
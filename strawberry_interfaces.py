@@ -1,9 +1,10 @@
-from typing import Literal, Annotated, List
+from typing import Generic, Literal, Annotated, List, Optional, Self, TypeVar
 from os import getenv
 import strawberry
 from pydantic import BaseModel, Field
 from strawberry.types.info import Info as _Info, RootValueType
 from strawberry_permissions import GraphQLContext
+from series import SeriesFrame, Window
 
 
 type Info = _Info[GraphQLContext, RootValueType]
@@ -39,6 +40,27 @@ class TimeSeriesMetadata:
     time_zone: str = strawberry.field(description="The time zone of the time series.")
 
 
+@strawberry.type
+class WindowedSeries:
+    """
+    Base of the results whose bars can be narrowed with `from`, `to`, `limit` and
+    `after` (see `strawberry_extensions.Windowed`). The bars are kept in a `SeriesFrame`
+    and only the ones inside the window are materialized.
+    """
+
+    frame: strawberry.Private[SeriesFrame]
+
+    @strawberry.field(
+        description="Pass as `after` to get the next page, when `limit` left bars out."
+    )
+    def next_cursor(self) -> Optional[str]:
+        return self.frame.next_cursor
+
+    def windowed(self, window: Window) -> Self:
+        self.frame = self.frame.window(window)
+        return self
+
+
 @strawberry.type
 class CommodoitiesDataInterface:
     """
@@ -54,7 +76,7 @@ class CommodoitiesDataInterface:
 
 
 @strawberry.type
-class CommoditiesInterface:
+class CommoditiesInterface(WindowedSeries):
     """
     This class represents a commodity.
 
@@ -62,13 +84,19 @@ class CommoditiesInterface:
         name (str): The name of the commodity.
         interval (str): The interval of the data points.
         unit (str): The unit of the commodity.
-        data (List[CommoditiesDataInterface]): The list of data points for the commodity.
+        frame (SeriesFrame): The data points of the commodity, keyed by date.
     """
 
     name: str = strawberry.field(default="")
     interval: str = strawberry.field(default="monthly")
     unit: str = strawberry.field(default="")
-    data: List[CommodoitiesDataInterface] = strawberry.field(default_factory=list)
+
+    @strawberry.field
+    def data(self) -> List[CommodoitiesDataInterface]:
+        return [
+            CommodoitiesDataInterface(date=date, value=point.get("value"))
+            for date, point in zip(self.frame.dates, self.frame.bars())
+        ]
 
 
 @strawberry.type
@@ -115,30 +143,63 @@ class DigitalCurrencySeries:
     """
 
     date: str
-    open_market: float = strawberry.field(default=0.0)
-    open_usd: float = strawberry.field(default=0.0)
-    high_market: float = strawberry.field(default=0.0)
-    high_usd: float = strawberry.field(default=0.0)
-    low_market: float = strawberry.field(default=0.0)
-    low_usd: float = strawberry.field(default=0.0)
-    close_market: float = strawberry.field(default=0.0)
-    close_usd: float = strawberry.field(default=0.0)
-    volume: float = strawberry.field(default=0.0)
-    market_cap_usd: float = strawberry.field(default=0.0)
+    open_market: Optional[float] = strawberry.field(default=0.0)
+    open_usd: Optional[float] = strawberry.field(default=0.0)
+    high_market: Optional[float] = strawberry.field(default=0.0)
+    high_usd: Optional[float] = strawberry.field(default=0.0)
+    low_market: Optional[float] = strawberry.field(default=0.0)
+    low_usd: Optional[float] = strawberry.field(default=0.0)
+    close_market: Optional[float] = strawberry.field(default=0.0)
+    close_usd: Optional[float] = strawberry.field(default=0.0)
+    volume: Optional[float] = strawberry.field(default=0.0)
+    market_cap_usd: Optional[float] = strawberry.field(default=0.0)
 
 
 @strawberry.type
-class DigitalCurrencyInterface:
+class DigitalCurrencyInterface(WindowedSeries):
     """
     This class represents a digital currency.
 
     Args:
         metadata (DigitalCurrencyMetadata): The metadata for the digital currency.
-        series (List[TimeSeriesInterface]): The list of time series data for the digital currency.
+        market (str): The market the prices are quoted in, besides USD.
+        frame (SeriesFrame): The bars of the digital currency.
     """
 
     metadata: DigitalCurrencyMetadata = strawberry.field()
-    series: List[DigitalCurrencySeries] = strawberry.field(default_factory=list)
+    market: strawberry.Private[str]
+
+    @strawberry.field
+    def series(self) -> List[DigitalCurrencySeries]:
+        f, m = self.frame, self.market.upper()
+        return [
+            DigitalCurrencySeries(
+                date=date,
+                open_market=om,
+                open_usd=ou,
+                high_market=hm,
+                high_usd=hu,
+                low_market=lm,
+                low_usd=lu,
+                close_market=cm,
+                close_usd=cu,
+                volume=v,
+                market_cap_usd=mc,
+            )
+            for date, om, ou, hm, hu, lm, lu, cm, cu, v, mc in zip(
+                f.dates,
+                f.values(f"1a. open ({m})"),
+                f.values("1b. open (USD)"),
+                f.values(f"2a. high ({m})"),
+                f.values("2b. high (USD)"),
+                f.values(f"3a. low ({m})"),
+                f.values("3b. low (USD)"),
+                f.values(f"4a. close ({m})"),
+                f.values("4b. close (USD)"),
+                f.values("5. volume"),
+                f.values("6. market cap (USD)"),
+            )
+        ]
 
 
 @strawberry.type
@@ -147,25 +208,28 @@ class TimeSeriesData:
     attributes."""
 
     date: str = strawberry.field(default="")
-    open: float = strawberry.field()
-    high: float = strawberry.field()
-    low: float = strawberry.field()
-    close: float = strawberry.field()
-    volume: float = strawberry.field()
+    open: Optional[float] = strawberry.field()
+    high: Optional[float] = strawberry.field()
+    low: Optional[float] = strawberry.field()
+    close: Optional[float] = strawberry.field()
+    volume: Optional[float] = strawberry.field()
 
 
 @strawberry.type
-class DigitalCurrencyIntradayInterface:
+class DigitalCurrencyIntradayInterface(WindowedSeries):
     """
     This class represents the intraday data for a digital currency.
 
     Args:
         metadata (DigitalCurrencyMetadata): The metadata for the digital currency.
-        series (List[TimeSeriesInterface]): The list of time series data for the digital currency.
+        frame (SeriesFrame): The bars of the digital currency.
     """
 
     metadata: DigitalCurrencyMetadata = strawberry.field()
-    series: List[TimeSeriesData] = strawberry.field(default_factory=list)
+
+    @strawberry.field
+    def series(self) -> List[TimeSeriesData]:
+        return time_series_rows(self.frame)
 
 
 @strawberry.type
@@ -177,17 +241,150 @@ class TimeSeriesAdjustedData(TimeSeriesData):
     assigned a type of `float` and is decorated with `strawberry.field()`.
     """
 
-    adjusted_close: float = strawberry.field()
-    dividend_amount: float = strawberry.field()
+    adjusted_close: Optional[float] = strawberry.field()
+    dividend_amount: Optional[float] = strawberry.field()
+
+
+def time_series_rows(frame: SeriesFrame) -> List[TimeSeriesData]:
+    """
+    Builds one `TimeSeriesData` per bar from the parsed columns of `frame`.
+    """
+    return [
+        TimeSeriesData(date=date, open=o, high=h, low=l, close=c, volume=v)
+        for date, o, h, l, c, v in zip(
+            frame.dates,
+            frame.values("1. open"),
+            frame.values("2. high"),
+            frame.values("3. low"),
+            frame.values("4. close"),
+            frame.values("5. volume"),
+        )
+    ]
+
+
+@strawberry.type
+class TimeSeriesColumns:
+    """
+    The bars of a time series as parallel arrays, one per field, newest first.
+
+    Resolving a few long lists is far cheaper than resolving every field of one object
+    per bar, so this is the shape to use for charting long histories. Only the selected
+    columns are parsed; gaps in the upstream data are `null`.
+    """
+
+    frame: strawberry.Private[SeriesFrame]
+
+    @strawberry.field(description="The dates of the bars.")
+    def date(self) -> List[str]:
+        return self.frame.dates
+
+    @strawberry.field(description="The open prices.")
+    def open(self) -> List[Optional[float]]:
+        return self.frame.values("1. open")
+
+    @strawberry.field(description="The high prices.")
+    def high(self) -> List[Optional[float]]:
+        return self.frame.values("2. high")
+
+    @strawberry.field(description="The low prices.")
+    def low(self) -> List[Optional[float]]:
+        return self.frame.values("3. low")
+
+    @strawberry.field(description="The close prices.")
+    def close(self) -> List[Optional[float]]:
+        return self.frame.values("4. close")
+
+    @strawberry.field(description="The traded volumes.")
+    def volume(self) -> List[Optional[float]]:
+        return self.frame.values("5. volume")
+
+
+@strawberry.type
+class TimeSeriesAdjustedColumns(TimeSeriesColumns):
+    """
+    The bars of an adjusted time series as parallel arrays, newest first.
+    """
+
+    @strawberry.field(description="The traded volumes.")
+    def volume(self) -> List[Optional[float]]:
+        return self.frame.values("6. volume")
+
+    @strawberry.field(description="The close prices adjusted for splits and dividends.")
+    def adjusted_close(self) -> List[Optional[float]]:
+        return self.frame.values("5. adjusted close")
+
+    @strawberry.field(description="The dividends paid.")
+    def dividend_amount(self) -> List[Optional[float]]:
+        return self.frame.values("7. dividend amount")
 
 
 @strawberry.type
-class TimeSeriesInterface:
+class TimeSeriesInterface(WindowedSeries):
     metadata: TimeSeriesMetadata = strawberry.field()
-    data: List[TimeSeriesData] = strawberry.field(default_factory=list)
+
+    @strawberry.field
+    def data(self) -> List[TimeSeriesData]:
+        return time_series_rows(self.frame)
+
+    @strawberry.field
+    def columns(self) -> TimeSeriesColumns:
+        return TimeSeriesColumns(frame=self.frame)
 
 
 @strawberry.type
-class TimeSeriesAdjustedInterface:
+class TimeSeriesAdjustedInterface(WindowedSeries):
     metadata: TimeSeriesMetadata = strawberry.field()
-    data: List[TimeSeriesAdjustedData] = strawberry.field(default_factory=list)
+
+    @strawberry.field
+    def data(self) -> List[TimeSeriesAdjustedData]:
+        f = self.frame
+        return [
+            TimeSeriesAdjustedData(
+                date=date,
+                open=o,
+                high=h,
+                low=l,
+                close=c,
+                adjusted_close=a,
+                volume=v,
+                dividend_amount=d,
+            )
+            for date, o, h, l, c, a, v, d in zip(
+                f.dates,
+                f.values("1. open"),
+                f.values("2. high"),
+                f.values("3. low"),
+                f.values("4. close"),
+                f.values("5. adjusted close"),
+                f.values("6. volume"),
+                f.values("7. dividend amount"),
+            )
+        ]
+
+    @strawberry.field
+    def columns(self) -> TimeSeriesAdjustedColumns:
+        return TimeSeriesAdjustedColumns(frame=self.frame)
+
+
+T = TypeVar("T")
+
+
+@strawberry.type
+class BatchItem(Generic[T]):
+    """
+    The result of one symbol of a batch field.
+
+    Args:
+        symbol (str): The requested symbol.
+        result (T | None): The result, when the symbol could be resolved.
+        error (str | None): Why the symbol could not be resolved.
+    """
+
+    symbol: str
+    result: Optional[T] = None
+    error: Optional[str] = None
+
+    def windowed(self, window: Window) -> Self:
+        if self.result is not None:
+            self.result = self.result.windowed(window)
+        return self
@@ -6,6 +6,7 @@ from strawberry.fastapi import BaseContext
 from strawberry.types.info import Info, RootValueType
 from functools import cached_property
 from requests import get
+from loaders import Loaders
 
 header_field = "ALPHAVANTAGE_API_KEY"
 
@@ -57,6 +58,15 @@ class GraphQLContext(BaseContext):
         os.environ.update({"ALPHAVANTAGE_API_KEY": key})
         return key
 
+    @cached_property
+    def loaders(self) -> Loaders:
+        """The upstream loaders of the request, batched per function.
+
+        Returns:
+            Loaders: The loaders, created with the request's API key.
+        """
+        return Loaders(self.request.headers.get(header_field))
+
 
 class IsAuthenticated(BasePermission):
     """IsAuthenticated permission class."""
@@ -1,5 +1,11 @@
-from typing import List, Literal, Unpack
+import asyncio
+import dataclasses
+from typing import List, Literal, Optional, Unpack
+import numpy as np
 import strawberry
+import indicators
+import fundamentals
+from pydantic import TypeAdapter
 from strawberry.types.info import Info as _Info, RootValueType
 from vantage_wrapper import Vantage
 from strawberry_interfaces import (
@@ -9,7 +15,12 @@ from strawberry_interfaces import (
     CommoditiesInterface,
     DigitalCurrencyInterface,
     DigitalCurrencyIntradayInterface,
+    WindowedSeries,
+    BatchItem,
 )
+from batch import fan_out
+from series import to_list
+from strawberry_extensions import Windowed
 from strawberry_permissions import GraphQLContext
 from strawberry_permissions import IsAuthenticated
 from pydantic_schemas import (
@@ -21,6 +32,10 @@ from pydantic_schemas import (
     CashFlowSchema,
     BalanceSheetSchema,
     GlobalQuoteSchema,
+    IncomeStatementFiguresSchema,
+    CashFlowFiguresSchema,
+    BalanceSheetFiguresSchema,
+    OverviewFiguresSchema,
 )
 from decorators import (
     _make_api_call,
@@ -30,7 +45,6 @@ from decorators import (
     _extract_time_series,
     _extract_time_series_adjusted,
 )
-from pandas import DataFrame
 
 type Intervals = Literal["1min", "5min", "15min", "30min", "60min"]
 type Info = _Info[GraphQLContext, RootValueType]
@@ -55,8 +69,8 @@ class TIME_SERIES_ADJUSTED:
     def _get(self, *args, **kwargs: Unpack[API_Parameters]):
         return (None, None, None)
 
-    @strawberry.field
-    def daily(
+    @strawberry.field(extensions=[Windowed()])
+    async def daily(
         self,
         info: Info,
         symbol: str,
@@ -75,7 +89,7 @@ class TIME_SERIES_ADJUSTED:
         :return: a list of TimeSeriesAdjustedInterface objects.
         """
 
-        data: TimeSeriesAdjustedInterface = self._get(
+        data: TimeSeriesAdjustedInterface = await self._get(
             info=info,
             symbol=symbol,
             outputsize=outputsize,
@@ -83,8 +97,34 @@ class TIME_SERIES_ADJUSTED:
         )
         return data
 
-    @strawberry.field
-    def monthly(self, info: Info, symbol: str) -> TimeSeriesAdjustedInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def daily_batch(
+        self,
+        info: Info,
+        symbols: List[str],
+        outputsize: str = "compact",
+    ) -> List[BatchItem[TimeSeriesAdjustedInterface]]:
+        """
+        The function `daily_batch` retrieves the daily adjusted series of several symbols
+        concurrently (see `batch.fan_out`). A symbol that fails carries an `error`
+        instead of failing the whole query.
+
+        :param symbols: the stock symbols.
+        :param outputsize: `compact` or `full`, as for `daily`.
+        :return: one item per symbol, in the order requested.
+        """
+        return await fan_out(
+            symbols,
+            lambda symbol: self._get(
+                info=info,
+                symbol=symbol,
+                outputsize=outputsize,
+                function="TIME_SERIES_DAILY_ADJUSTED",
+            ),
+        )
+
+    @strawberry.field(extensions=[Windowed()])
+    async def monthly(self, info: Info, symbol: str) -> TimeSeriesAdjustedInterface:
         """
         The function `monthly` retrieves monthly adjusted time series data for a given stock symbol and
         processes it.
@@ -95,15 +135,15 @@ class TIME_SERIES_ADJUSTED:
         :type symbol: str
         :return: a list of TimeSeriesAdjustedInterface objects.
         """
-        data: TimeSeriesAdjustedInterface = self._get(
+        data: TimeSeriesAdjustedInterface = await self._get(
             info=info,
             symbol=symbol,
             function="TIME_SERIES_MONTHLY_ADJUSTED",
         )
         return data
 
-    @strawberry.field
-    def weekly(self, info: Info, symbol: str) -> TimeSeriesAdjustedInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def weekly(self, info: Info, symbol: str) -> TimeSeriesAdjustedInterface:
         """
         The function `weekly` retrieves weekly adjusted time series data for a given stock symbol and
         processes it.
@@ -114,7 +154,7 @@ class TIME_SERIES_ADJUSTED:
         :type symbol: str
         :return: a list of TimeSeriesAdjustedInterface objects.
         """
-        data: TimeSeriesAdjustedInterface = self._get(
+        data: TimeSeriesAdjustedInterface = await self._get(
             info=info,
             symbol=symbol,
             function="TIME_SERIES_WEEKLY_ADJUSTED",
@@ -148,8 +188,8 @@ class TIME_SERIES:
     def _get(self, *args, **kwargs: Unpack[API_Parameters]):
         return (None, None, None)
 
-    @strawberry.field
-    def intraday(
+    @strawberry.field(extensions=[Windowed()])
+    async def intraday(
         self,
         info: Info,
         symbol: str,
@@ -166,14 +206,16 @@ class TIME_SERIES:
         :type symbol: str
         :param interval: The "interval" parameter specifies the time interval between each data point in
         the intraday time series. It can be set to values like "1min", "5min", "15min", "30min", or
-        "60min", depending on the desired granularity of the data, defaults to 15min
+        "60min", depending on the desired granularity of the data, or to any number of minutes or
+        hours under a day such as "2h" or "4h", which are aggregated locally (see
+        `intraday.IntradayAggregator`), defaults to 15min
         :type interval: str (optional)
         :param outputsize: The `outputsize` parameter determines the amount of data to be returned. It
         can have two possible values:, defaults to compact
         :type outputsize: str (optional)
         :return: a list of TimeSeriesInterface objects.
         """
-        data: TimeSeriesInterface = self._get(
+        data: TimeSeriesInterface = await self._get(
             function="TIME_SERIES_INTRADAY",
             info=info,
             symbol=symbol,
@@ -182,8 +224,8 @@ class TIME_SERIES:
         )
         return data
 
-    @strawberry.field
-    def daily(
+    @strawberry.field(extensions=[Windowed()])
+    async def daily(
         self, info: Info, symbol: str, outputsize: str = "compact"
     ) -> TimeSeriesInterface:
         """
@@ -198,7 +240,7 @@ class TIME_SERIES:
         :type outputsize: str (optional)
         :return: a list of TimeSeriesInterface objects.
         """
-        data: TimeSeriesInterface = self._get(
+        data: TimeSeriesInterface = await self._get(
             function="TIME_SERIES_DAILY",
             info=info,
             symbol=symbol,
@@ -206,8 +248,34 @@ class TIME_SERIES:
         )
         return data
 
-    @strawberry.field
-    def monthly(self, info: Info, symbol: str) -> TimeSeriesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def daily_batch(
+        self,
+        info: Info,
+        symbols: List[str],
+        outputsize: str = "compact",
+    ) -> List[BatchItem[TimeSeriesInterface]]:
+        """
+        The function `daily_batch` retrieves the daily series of several symbols
+        concurrently (see `batch.fan_out`). A symbol that fails carries an `error`
+        instead of failing the whole query.
+
+        :param symbols: the stock symbols.
+        :param outputsize: `compact` or `full`, as for `daily`.
+        :return: one item per symbol, in the order requested.
+        """
+        return await fan_out(
+            symbols,
+            lambda symbol: self._get(
+                function="TIME_SERIES_DAILY",
+                info=info,
+                symbol=symbol,
+                outputsize=outputsize,
+            ),
+        )
+
+    @strawberry.field(extensions=[Windowed()])
+    async def monthly(self, info: Info, symbol: str) -> TimeSeriesInterface:
         """
         The function retrieves monthly time series data for a given stock symbol and processes it.
 
@@ -217,13 +285,13 @@ class TIME_SERIES:
         :type symbol: str
         :return: a list of TimeSeriesInterface objects.
         """
-        data: TimeSeriesInterface = self._get(
+        data: TimeSeriesInterface = await self._get(
             function="TIME_SERIES_MONTHLY", info=info, symbol=symbol
         )
         return data
 
-    @strawberry.field
-    def weekly(self, info: Info, symbol: str) -> TimeSeriesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def weekly(self, info: Info, symbol: str) -> TimeSeriesInterface:
         """
         The function `weekly` retrieves weekly time series data for a given stock symbol and processes
         it.
@@ -234,7 +302,7 @@ class TIME_SERIES:
         :type symbol: str
         :return: a list of TimeSeriesInterface objects.
         """
-        data: TimeSeriesInterface = self._get(
+        data: TimeSeriesInterface = await self._get(
             function="TIME_SERIES_WEEKLY", info=info, symbol=symbol
         )
         return data
@@ -279,6 +347,73 @@ class TechIndicator:
     analysis: List[TechIndicatorAnalysis] = strawberry.field(name="Analysis")
 
 
+@strawberry.input
+class IndicatorSpec:
+    """One indicator of a batch. Parameters a function does not use are ignored."""
+
+    function: str = strawberry.field(
+        description="SMA, EMA, WMA, DEMA, TEMA, RSI, MACD, BBANDS, ATR or STOCH."
+    )
+    time_period: Optional[int] = strawberry.field(
+        default=None,
+        description="Defaults to 60 for averages, 14 for RSI and ATR, 20 for BBANDS.",
+    )
+    series_type: str = strawberry.field(default="close")
+    fast_period: int = strawberry.field(default=12, description="MACD.")
+    slow_period: int = strawberry.field(default=26, description="MACD.")
+    signal_period: int = strawberry.field(default=9, description="MACD.")
+    nbdevup: float = strawberry.field(default=2.0, description="BBANDS.")
+    nbdevdn: float = strawberry.field(default=2.0, description="BBANDS.")
+    fastk_period: int = strawberry.field(default=5, description="STOCH.")
+    slowk_period: int = strawberry.field(default=3, description="STOCH.")
+    slowd_period: int = strawberry.field(default=3, description="STOCH.")
+
+
+@strawberry.type
+class IndicatorLine:
+    """One output of an indicator, e.g. `MACD_Signal`, aligned with the batch's dates."""
+
+    name: str
+    values: List[Optional[float]] = strawberry.field(
+        description="Newest first; `null` while the indicator warms up."
+    )
+
+
+@strawberry.type
+class IndicatorResult:
+    function: str
+    label: str = strawberry.field(description="The function and its parameters.")
+    lines: List[IndicatorLine]
+
+
+@strawberry.type
+class IndicatorBatch(WindowedSeries):
+    """Several indicators computed in one pass over one price series."""
+
+    symbol: str
+    interval: str
+    computed: strawberry.Private[list[tuple[indicators.Spec, dict[str, np.ndarray]]]]
+
+    @strawberry.field(description="The dates of the values, newest first.")
+    def dates(self) -> List[str]:
+        return self.frame.dates
+
+    @strawberry.field(description="One result per spec, in the order requested.")
+    def results(self) -> List[IndicatorResult]:
+        span = self.frame.span
+        return [
+            IndicatorResult(
+                function=spec.function,
+                label=spec.label,
+                lines=[
+                    IndicatorLine(name=name, values=to_list(values[span]))
+                    for name, values in lines.items()
+                ],
+            )
+            for spec, lines in self.computed
+        ]
+
+
 type DataTuple = tuple[dict[str, dict[str, str]], dict[str, str]]
 
 
@@ -308,8 +443,79 @@ class TECHNICAL_AVERAGES:
         ]
         return TechIndicator(metadata=as_gql, analysis=analysis_list)
 
+    async def average(
+        self,
+        info: Info,
+        function: str,
+        symbol: str,
+        interval: str,
+        time_period: int,
+        series_type: str,
+    ) -> TechIndicator:
+        """Requests a moving average from Alpha Vantage or, with
+        `AV_INDICATOR_MODE=local`, computes it from the cached price series (see
+        `indicators.technical_average`), which costs no call when the series is cached.
+
+        Args:
+            function (str): `SMA`, `EMA`, `WMA`, `DEMA` or `TEMA`.
+
+        Returns:
+            TechIndicator: GraphQL Schema object.
+        """
+        vantage = Vantage(info)
+        if indicators.local():
+            data_tuple = await indicators.technical_average(
+                vantage.key,
+                function,
+                symbol,
+                interval,
+                time_period,
+                series_type,
+                info.context.loaders.load,
+            )
+        else:
+            # !! pylint: disable=W0632
+            data_tuple = await vantage.call(
+                getattr(vantage.tech_indicators, f"get_{function.lower()}"),
+                symbol=symbol,
+                interval=interval,
+                time_period=time_period,
+                series_type=series_type,
+            )
+        return self.process(data_tuple, function)
+
+    @strawberry.field(extensions=[Windowed()])
+    async def indicators(
+        self,
+        info: Info,
+        symbol: str,
+        specs: List[IndicatorSpec],
+        interval: str = "daily",
+    ) -> IndicatorBatch:
+        """
+        The function `indicators` computes several indicators from one price series.
+        The series is fetched (or served from the cache) once, whatever
+        `AV_INDICATOR_MODE`, and intermediate averages are shared between the specs.
+        :param symbol: the symbol of the stock.
+        :param interval: `1min` to `60min`, `daily`, `weekly` or `monthly`.
+        :param specs: the indicators.
+        :return: the values of every indicator, aligned with `dates`.
+        """
+        vantage = Vantage(info)
+        frame, _ = await indicators.price_frame(
+            vantage.key, symbol, interval, info.context.loaders.load
+        )
+        batch = indicators.IndicatorPass(frame)
+        computed = []
+        for spec in specs:
+            as_spec = indicators.Spec(**dataclasses.asdict(spec))
+            computed.append((as_spec, batch.compute(as_spec)))
+        return IndicatorBatch(
+            symbol=symbol, interval=interval, frame=frame, computed=computed
+        )
+
     @strawberry.field
-    def sma(
+    async def sma(
         self,
         info: Info,
         symbol: str,
@@ -323,18 +529,12 @@ class TECHNICAL_AVERAGES:
         :param interval: the interval of the data.
         :return: the SMA of the stock.
         """
-        vantage = Vantage(info)
-        # !! pylint: disable=W0632
-        data, metadata = vantage.tech_indicators.get_sma(
-            symbol=symbol,
-            interval=interval,
-            time_period=time_period,
-            series_type=series_type,
+        return await self.average(
+            info, "SMA", symbol, interval, time_period, series_type
         )
-        return self.process((data, metadata), "SMA")
 
     @strawberry.field
-    def ema(
+    async def ema(
         self,
         info: Info,
         symbol: str,
@@ -348,18 +548,12 @@ class TECHNICAL_AVERAGES:
         :param interval: the interval of the data.
         :return: the EMA of the stock.
         """
-        vantage = Vantage(info)
-        # !! pylint: disable=W0632
-        data, metadata = vantage.tech_indicators.get_ema(
-            symbol=symbol,
-            interval=interval,
-            time_period=time_period,
-            series_type=series_type,
+        return await self.average(
+            info, "EMA", symbol, interval, time_period, series_type
         )
-        return self.process((data, metadata), "EMA")
 
     @strawberry.field
-    def wma(
+    async def wma(
         self,
         info: Info,
         symbol: str,
@@ -370,18 +564,12 @@ class TECHNICAL_AVERAGES:
         """
         The function `wma` returns the Weighted Moving Average (WMA) of a stock.
         """
-        vantage = Vantage(info)
-        # !! pylint: disable=W0632
-        data, metadata = vantage.tech_indicators.get_wma(
-            symbol=symbol,
-            interval=interval,
-            time_period=time_period,
-            series_type=series_type,
+        return await self.average(
+            info, "WMA", symbol, interval, time_period, series_type
         )
-        return self.process((data, metadata), "WMA")
 
     @strawberry.field
-    def dema(
+    async def dema(
         self,
         info: Info,
         symbol: str,
@@ -392,18 +580,12 @@ class TECHNICAL_AVERAGES:
         """
         The function `dema` returns the Double Exponential Moving Average (DEMA) of a stock.
         """
-        vantage = Vantage(info)
-        # !! pylint: disable=W0632
-        data, metadata = vantage.tech_indicators.get_dema(
-            symbol=symbol,
-            interval=interval,
-            time_period=time_period,
-            series_type=series_type,
+        return await self.average(
+            info, "DEMA", symbol, interval, time_period, series_type
         )
-        return self.process((data, metadata), "DEMA")
 
     @strawberry.field
-    def tema(
+    async def tema(
         self,
         info: Info,
         symbol: str,
@@ -414,15 +596,9 @@ class TECHNICAL_AVERAGES:
         """
         The function `tema` returns the Triple Exponential Moving Average (TEMA) of a stock.
         """
-        vantage = Vantage(info)
-        # !! pylint: disable=W0632
-        data, metadata = vantage.tech_indicators.get_tema(
-            symbol=symbol,
-            interval=interval,
-            time_period=time_period,
-            series_type=series_type,
+        return await self.average(
+            info, "TEMA", symbol, interval, time_period, series_type
         )
-        return self.process((data, metadata), "TEMA")
 
 
 @strawberry.experimental.pydantic.type(CryptoMetadataSchema, all_fields=True)
@@ -447,7 +623,7 @@ class CryptoIntraday:
 @strawberry.type
 class CRYPTO_SERIES:
     @strawberry.field
-    def exchange_rate(
+    async def exchange_rate(
         self, info: Info, from_currency: str, to_currency: str
     ) -> CurrencyExchangeRateType:
         """
@@ -458,8 +634,10 @@ class CRYPTO_SERIES:
         """
         vantage = Vantage(info)
         # !! pylint: disable=W0632
-        data, _ = vantage.crypto_currencies.get_digital_currency_exchange_rate(
-            from_currency=from_currency, to_currency=to_currency
+        data, _ = await vantage.call(
+            vantage.crypto_currencies.get_digital_currency_exchange_rate,
+            from_currency=from_currency,
+            to_currency=to_currency,
         )
         data: dict[str, str]
         as_model = CurrencyExchangeRateSchema.model_validate(data)
@@ -478,41 +656,41 @@ class CRYPTO_SERIES:
     def _get_intraday(self, *args, **kwargs: Unpack[API_Parameters]):
         return (None, None, None)
 
-    @strawberry.field
-    def monthly(
+    @strawberry.field(extensions=[Windowed()])
+    async def monthly(
         self, info: Info, symbol: str = "BTC", market: str = "CNY"
     ) -> DigitalCurrencyInterface:
-        a = self._get(
+        a = await self._get(
             function="DIGITAL_CURRENCY_MONTHLY", symbol=symbol, market=market, info=info
         )
         return a
 
-    @strawberry.field
-    def weekly(
+    @strawberry.field(extensions=[Windowed()])
+    async def weekly(
         self, info: Info, symbol: str = "BTC", market: str = "CNY"
     ) -> DigitalCurrencyInterface:
-        a = self._get(
+        a = await self._get(
             function="DIGITAL_CURRENCY_WEEKLY", symbol=symbol, market=market, info=info
         )
         return a
 
-    @strawberry.field
-    def daily(
+    @strawberry.field(extensions=[Windowed()])
+    async def daily(
         self, info: Info, symbol: str = "BTC", market: str = "CNY"
     ) -> DigitalCurrencyInterface:
-        a = self._get(
+        a = await self._get(
             function="DIGITAL_CURRENCY_DAILY", symbol=symbol, market=market, info=info
         )
         return a
 
-    @strawberry.field
-    def intraday(
+    @strawberry.field(extensions=[Windowed()])
+    async def intraday(
         self,
         info: Info,
         symbol: str = "BTC",
         interval: str = "5min",
     ) -> DigitalCurrencyIntradayInterface:
-        a = self._get_intraday(
+        a = await self._get_intraday(
             function="CRYPTO_INTRADAY",
             symbol=symbol,
             market="USD",
@@ -545,6 +723,25 @@ class BalanceSheetType:
     pass
 
 
+_cash_flows = TypeAdapter(list[CashFlowSchema])
+_income_statements = TypeAdapter(list[IncomeStatementSchema])
+_balance_sheets = TypeAdapter(list[BalanceSheetSchema])
+
+
+def period(quarterly: bool) -> str:
+    """The key of the annual or the quarterly reports of a statement response."""
+    return "quarterlyReports" if quarterly else "annualReports"
+
+
+def as_statements[T](gqltype: type[T], models: list) -> list[T]:
+    """Builds statement types straight from validated models.
+
+    The statement schemas only hold flat strings, so the fields are passed as they are
+    instead of going through `from_pydantic`, which converts every field on its own.
+    """
+    return [gqltype(**model.__dict__) for model in models]
+
+
 @strawberry.experimental.pydantic.type(OverviewSchema, all_fields=True)
 class OverviewType:
     """
@@ -554,6 +751,48 @@ class OverviewType:
     pass
 
 
+@strawberry.experimental.pydantic.type(IncomeStatementFiguresSchema, all_fields=True)
+class IncomeStatementFiguresType:
+    """The figures of an income statement as numbers."""
+
+
+@strawberry.experimental.pydantic.type(CashFlowFiguresSchema, all_fields=True)
+class CashFlowFiguresType:
+    """The figures of a cash flow statement as numbers."""
+
+
+@strawberry.experimental.pydantic.type(BalanceSheetFiguresSchema, all_fields=True)
+class BalanceSheetFiguresType:
+    """The figures of a balance sheet as numbers."""
+
+
+@strawberry.experimental.pydantic.type(OverviewFiguresSchema, all_fields=True)
+class OverviewFiguresType:
+    """The company overview with its figures as numbers."""
+
+
+_cash_flow_figures = TypeAdapter(list[CashFlowFiguresSchema])
+_income_statement_figures = TypeAdapter(list[IncomeStatementFiguresSchema])
+_balance_sheet_figures = TypeAdapter(list[BalanceSheetFiguresSchema])
+
+
+@strawberry.type
+class FinancialRatios:
+    """Ratios of one report, computed from the three statements (see
+    `fundamentals.ratios`); `None` where a figure is missing."""
+
+    fiscal_date_ending: str
+    gross_margin: Optional[float]
+    operating_margin: Optional[float]
+    net_margin: Optional[float]
+    free_cash_flow: Optional[float]
+    debt_to_equity: Optional[float]
+    revenue_growth_yoy: Optional[float]
+    revenue_growth_qoq: Optional[float]
+    net_income_growth_yoy: Optional[float]
+    net_income_growth_qoq: Optional[float]
+
+
 @strawberry.experimental.pydantic.type(GlobalQuoteSchema, all_fields=True)
 class GlobalQuoteType:
     """The class GlobalQuoteType is defined."""
@@ -567,69 +806,72 @@ class FundementalDataType:
     The class `FundementalDataType` defines several methods that return fundamental data for a given stock
     """
 
-    def manipulate_cf(self, data: DataFrame) -> List[CashFlowType]:
+    def manipulate_cf(self, data: List[dict]) -> List[CashFlowType]:
         """
-        The function `manipulate_cf` takes a DataFrame as input, converts it to a dictionary, validates the
-        data using a CashFlowSchema model, and then converts the validated data to a list of CashFlowType
-        objects.
+        The function `manipulate_cf` validates the raw cash flow reports as a whole with
+        a CashFlowSchema list adapter and converts them to CashFlowType objects.
 
-        :param data: The `data` parameter is a DataFrame object
-        :type data: DataFrame
+        :param data: The reports, as upstream returns them.
+        :type data: List[dict]
         :return: The function `manipulate_cf` returns a list of `CashFlowType` objects.
         """
+        return as_statements(CashFlowType, _cash_flows.validate_python(data))
 
-        as_json = data.to_dict(orient="index")
-        items = as_json.values()
-        l: List[CashFlowType] = []
-        for i in items:
-            pymodel = CashFlowSchema.model_validate(i)
-            # !! pylint: disable=no-member
-            gqltype: CashFlowType = CashFlowType.from_pydantic(pymodel)
-            l.append(gqltype)
-        return l
-
-    def manipulate_is(self, data: DataFrame) -> List[IncomeStatementType]:
+    def manipulate_is(self, data: List[dict]) -> List[IncomeStatementType]:
         """
-        The function `manipulate_is` converts a DataFrame into a list of IncomeStatementType objects by
-        validating the data and converting it into the appropriate format.
+        The function `manipulate_is` validates the raw income statement reports as a whole
+        with an IncomeStatementSchema list adapter and converts them to IncomeStatementType
+        objects.
 
-        :param data: The `data` parameter is a DataFrame object
-        :type data: DataFrame
+        :param data: The reports, as upstream returns them.
+        :type data: List[dict]
         :return: The function `manipulate_is` returns a list of `IncomeStatementType` objects.
         """
-        as_json = data.to_dict(orient="index")
-        items = as_json.values()
-        l: List[IncomeStatementType] = []
-        for i in items:
-            pymodel = IncomeStatementSchema.model_validate(i)
-            # !! pylint: disable=no-member
-            gqltype: IncomeStatementType = IncomeStatementType.from_pydantic(pymodel)
-            l.append(gqltype)
-        return l
+        return as_statements(
+            IncomeStatementType, _income_statements.validate_python(data)
+        )
 
-    def manipulate_bs(self, data: DataFrame) -> List[BalanceSheetType]:
+    def manipulate_bs(self, data: List[dict]) -> List[BalanceSheetType]:
         """
-        The function `manipulate_bs` takes a DataFrame as input, converts it to a dictionary, validates the
-        data using a BalanceSheetSchema model, and then converts the validated data to a list of BalanceSheetType
+        The function `manipulate_bs` validates the raw balance sheet reports as a whole
+        with a BalanceSheetSchema list adapter and converts them to BalanceSheetType
         objects.
 
-        :param data: The `data` parameter is a DataFrame object
-        :type data: DataFrame
+        :param data: The reports, as upstream returns them.
+        :type data: List[dict]
         :return: The function `manipulate_bs` returns a list of `BalanceSheetType` objects.
         """
+        return as_statements(BalanceSheetType, _balance_sheets.validate_python(data))
 
-        as_json = data.to_dict(orient="index")
-        items = as_json.values()
-        l: List[BalanceSheetType] = []
-        for i in items:
-            pymodel = BalanceSheetSchema.model_validate(i)
-            # !! pylint: disable=no-member
-            gqltype: BalanceSheetType = BalanceSheetType.from_pydantic(pymodel)
-            l.append(gqltype)
-        return l
+    @_make_api_call
+    def _statements(self, *args, **kwargs: Unpack[API_Parameters]):
+        """
+        The function `_statements` returns a whole `BALANCE_SHEET`, `CASH_FLOW` or
+        `INCOME_STATEMENT` response, which holds both `annualReports` and `quarterlyReports`.
+        """
+        return (None, None, None)
+
+    async def reports(
+        self, info: Info, function: str, symbol: str, period: str
+    ) -> List[dict]:
+        """
+        The function `reports` returns one half of a financial statement response.
+
+        Both halves come from the same upstream response, cached once per (function, symbol)
+        and shared by concurrent resolvers (see `upstream.fetch_json`), so asking for the
+        annual and the quarterly statements of a symbol costs a single call.
+
+        :param function: `BALANCE_SHEET`, `CASH_FLOW` or `INCOME_STATEMENT`.
+        :param period: `annualReports` or `quarterlyReports`.
+        :return: the reports, one row each.
+        """
+        response: dict = await self._statements(
+            info=info, symbol=symbol, function=function
+        )
+        return response.get(period) or []
 
     @strawberry.field
-    def get_balance_sheet_annual(
+    async def get_balance_sheet_annual(
         self, info: Info, symbol: str
     ) -> List[BalanceSheetType]:
         """
@@ -641,14 +883,11 @@ class FundementalDataType:
         :type symbol: str
         :return: a list of BalanceSheetType objects.
         """
-        vantage = Vantage(info)
-        # !! pylint: disable=W0632
-        data, _ = vantage.fundamental_data.get_balance_sheet_annual(symbol)
-        data: DataFrame
+        data = await self.reports(info, "BALANCE_SHEET", symbol, "annualReports")
         return self.manipulate_bs(data)
 
     @strawberry.field
-    def get_balance_sheet_quarterly(
+    async def get_balance_sheet_quarterly(
         self, info: Info, symbol: str
     ) -> List[BalanceSheetType]:
         """
@@ -659,14 +898,22 @@ class FundementalDataType:
         :type symbol: str
         :return: a list of BalanceSheetType objects.
         """
-        vantage = Vantage(info)
-        # !! pylint: disable=W0632
-        data, _ = vantage.fundamental_data.get_balance_sheet_quarterly(symbol)
-        data: DataFrame
+        data = await self.reports(info, "BALANCE_SHEET", symbol, "quarterlyReports")
         return self.manipulate_bs(data)
 
+    async def overview(self, info: Info, symbol: str) -> dict[str, str]:
+        """Loads the `OVERVIEW` of one company with those of the request's other
+        fields (see `loaders.Loaders`), failing as the library does on a notice."""
+        data = await info.context.loaders.load(
+            {"function": "OVERVIEW", "symbol": symbol}
+        )
+        assert data, "No overview returned"
+        for notice in ("Error Message", "Information", "Note"):
+            assert notice not in data, data[notice]
+        return data
+
     @strawberry.field
-    def get_company_overview(self, info: Info, symbol: str) -> OverviewType:
+    async def get_company_overview(self, info: Info, symbol: str) -> OverviewType:
         """
         The function `get_company_overview` retrieves company overview data for a given symbol and
         returns it in a GraphQL-compatible format.
@@ -675,10 +922,7 @@ class FundementalDataType:
         :type symbol: str
         :return: an object of type `OverviewType`.
         """
-        vantage = Vantage(info)
-        # !! pylint: disable=W0632
-        data, _ = vantage.fundamental_data.get_company_overview(symbol)
-        data: dict[str, str]
+        data = await self.overview(info, symbol)
 
         pymodel = OverviewSchema.model_validate(data)
         # !! This is a bug in the schema.!!!!
@@ -688,7 +932,7 @@ class FundementalDataType:
         return gqltype
 
     @strawberry.field
-    def get_cash_flow_annual(self, info: Info, symbol: str) -> List[CashFlowType]:
+    async def get_cash_flow_annual(self, info: Info, symbol: str) -> List[CashFlowType]:
         """
         The function `get_cash_flow_annual` retrieves annual cash flow data for a given stock symbol and
         returns a manipulated version of the data.
@@ -698,14 +942,13 @@ class FundementalDataType:
         :type symbol: str
         :return: a list of CashFlowType objects.
         """
-        vantage = Vantage(info)
-        # !! pylint: disable=W0632
-        data, _ = vantage.fundamental_data.get_cash_flow_annual(symbol)
-        data: DataFrame
+        data = await self.reports(info, "CASH_FLOW", symbol, "annualReports")
         return self.manipulate_cf(data)
 
     @strawberry.field
-    def get_cash_flow_quarterly(self, info: Info, symbol: str) -> List[CashFlowType]:
+    async def get_cash_flow_quarterly(
+        self, info: Info, symbol: str
+    ) -> List[CashFlowType]:
         """
         The function `get_cash_flow_quarterly` retrieves quarterly cash flow data for a given stock symbol
         and returns a manipulated version of the data.
@@ -714,14 +957,11 @@ class FundementalDataType:
         :type symbol: str
         :return: a list of CashFlowType objects.
         """
-        vantage = Vantage(info)
-        # !! pylint: disable=W0632
-        data, _ = vantage.fundamental_data.get_cash_flow_quarterly(symbol)
-        data: DataFrame
+        data = await self.reports(info, "CASH_FLOW", symbol, "quarterlyReports")
         return self.manipulate_cf(data)
 
     @strawberry.field
-    def get_income_statement_annual(
+    async def get_income_statement_annual(
         self, info: Info, symbol: str
     ) -> List[IncomeStatementType]:
         """
@@ -733,14 +973,11 @@ class FundementalDataType:
         :type symbol: str
         :return: a list of IncomeStatementType objects.
         """
-        vantage = Vantage(info)
-        # !! pylint: disable=W0632
-        data, _ = vantage.fundamental_data.get_income_statement_annual(symbol)
-        data: DataFrame
+        data = await self.reports(info, "INCOME_STATEMENT", symbol, "annualReports")
         return self.manipulate_is(data)
 
     @strawberry.field
-    def get_income_statement_quarterly(
+    async def get_income_statement_quarterly(
         self, info: Info, symbol: str
     ) -> List[IncomeStatementType]:
         """
@@ -751,12 +988,87 @@ class FundementalDataType:
         :type symbol: str
         :return: a list of IncomeStatementType objects.
         """
-        vantage = Vantage(info)
-        # !! pylint: disable=W0632
-        data, _ = vantage.fundamental_data.get_income_statement_quarterly(symbol)
-        data: DataFrame
+        data = await self.reports(info, "INCOME_STATEMENT", symbol, "quarterlyReports")
         return self.manipulate_is(data)
 
+    @strawberry.field
+    async def overview_figures(self, info: Info, symbol: str) -> OverviewFiguresType:
+        """
+        The function `overview_figures` returns the company overview with its figures as
+        numbers; figures upstream does not have are `null`.
+        """
+        pymodel = OverviewFiguresSchema.model_validate(
+            await self.overview(info, symbol)
+        )
+        # !! pylint: disable=no-member
+        return OverviewFiguresType.from_pydantic(pymodel)
+
+    @strawberry.field
+    async def balance_sheet_figures(
+        self, info: Info, symbol: str, quarterly: bool = False
+    ) -> List[BalanceSheetFiguresType]:
+        """
+        The function `balance_sheet_figures` returns the annual or quarterly balance
+        sheets with their figures as numbers.
+        """
+        data = await self.reports(info, "BALANCE_SHEET", symbol, period(quarterly))
+        return as_statements(
+            BalanceSheetFiguresType, _balance_sheet_figures.validate_python(data)
+        )
+
+    @strawberry.field
+    async def cash_flow_figures(
+        self, info: Info, symbol: str, quarterly: bool = False
+    ) -> List[CashFlowFiguresType]:
+        """
+        The function `cash_flow_figures` returns the annual or quarterly cash flow
+        statements with their figures as numbers.
+        """
+        data = await self.reports(info, "CASH_FLOW", symbol, period(quarterly))
+        return as_statements(
+            CashFlowFiguresType, _cash_flow_figures.validate_python(data)
+        )
+
+    @strawberry.field
+    async def income_statement_figures(
+        self, info: Info, symbol: str, quarterly: bool = False
+    ) -> List[IncomeStatementFiguresType]:
+        """
+        The function `income_statement_figures` returns the annual or quarterly income
+        statements with their figures as numbers.
+        """
+        data = await self.reports(info, "INCOME_STATEMENT", symbol, period(quarterly))
+        return as_statements(
+            IncomeStatementFiguresType,
+            _income_statement_figures.validate_python(data),
+        )
+
+    @strawberry.field
+    async def ratios(
+        self, info: Info, symbol: str, quarterly: bool = False
+    ) -> List[FinancialRatios]:
+        """
+        The function `ratios` returns margins, free cash flow, debt to equity and growth
+        for every report of a company, newest first. The three statements are fetched
+        concurrently (each one call, shared with the statement fields) and the ratios
+        computed in one vectorized pass over the history (see `fundamentals.ratios`).
+        """
+        income, cash_flow, balance = await asyncio.gather(
+            *(
+                self.reports(info, function, symbol, period(quarterly))
+                for function in ("INCOME_STATEMENT", "CASH_FLOW", "BALANCE_SHEET")
+            )
+        )
+        dates, computed = fundamentals.ratios(income, cash_flow, balance, quarterly)
+        columns = {name: to_list(values) for name, values in computed.items()}
+        return [
+            FinancialRatios(
+                fiscal_date_ending=date,
+                **{name: values[i] for name, values in columns.items()},
+            )
+            for i, date in enumerate(dates)
+        ]
+
     @_make_api_call
     def _global_quote(self, *args, **kwargs: Unpack[API_Parameters]):
         """
@@ -764,11 +1076,9 @@ class FundementalDataType:
         """
         return ("Global Quote", None, None)
 
-    @strawberry.field
-    def global_quote(self, info: Info, symbol: str) -> GlobalQuoteType:
-        """Returns the global quote for a given stock symbol."""
-
-        as_model = self._global_quote(
+    async def quote(self, info: Info, symbol: str) -> GlobalQuoteType:
+        """Fetches the `GLOBAL_QUOTE` of one symbol."""
+        as_model = await self._global_quote(
             info=info,
             symbol=symbol,
             function="GLOBAL_QUOTE",
@@ -780,6 +1090,31 @@ class FundementalDataType:
         as_type: GlobalQuoteType = GlobalQuoteType.from_pydantic(as_model)
         return as_type
 
+    @strawberry.field
+    async def global_quote(self, info: Info, symbol: str) -> GlobalQuoteType:
+        """Returns the global quote for a given stock symbol."""
+        return await self.quote(info, symbol)
+
+    @strawberry.field
+    async def global_quote_batch(
+        self, info: Info, symbols: List[str]
+    ) -> List[BatchItem[GlobalQuoteType]]:
+        """Returns the global quotes of several symbols, loaded in one batch (see
+        `loaders.Loaders`) with `REALTIME_BULK_QUOTES`, one call per 100 symbols (see
+        `quotes.BulkQuotes`). Keys whose plan lacks the bulk endpoint fall back to one
+        `GLOBAL_QUOTE` call per symbol. A symbol that fails carries an `error`
+        instead."""
+        return await fan_out(
+            symbols, lambda symbol: self.quote(info, symbol), len(symbols)
+        )
+
+    @strawberry.field(deprecation_reason="Use `globalQuoteBatch`.")
+    async def global_quotes(
+        self, info: Info, symbols: List[str]
+    ) -> List[BatchItem[GlobalQuoteType]]:
+        """Returns the same items as `global_quote_batch`."""
+        return await self.global_quote_batch(info, symbols)
+
 
 @strawberry.type
 class ECONOMIC_INDICATORS:
@@ -796,8 +1131,10 @@ class ECONOMIC_INDICATORS:
         """
         return (None, None, None)
 
-    @strawberry.field
-    def real_gdp(self, info: Info, interval: str = "annual") -> CommoditiesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def real_gdp(
+        self, info: Info, interval: str = "annual"
+    ) -> CommoditiesInterface:
         """
         This method retrieves real gdp data from the Alpha Vantage API.
 
@@ -811,11 +1148,11 @@ class ECONOMIC_INDICATORS:
         Returns:
             CommoditiesInterface: The real gdp data, represented as a GraphQL object.
         """
-        n = self._get(function="REAL_GDP", info=info, interval=interval)
+        n = await self._get(function="REAL_GDP", info=info, interval=interval)
         return n
 
-    @strawberry.field
-    def real_gdp_per_capita(self, info: Info) -> CommoditiesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def real_gdp_per_capita(self, info: Info) -> CommoditiesInterface:
         """
         This method retrieves real gdp per capita data from the Alpha Vantage API.
 
@@ -827,11 +1164,11 @@ class ECONOMIC_INDICATORS:
         Returns:
             CommoditiesInterface: The real gdp per capita data, represented as a GraphQL object.
         """
-        n = self._get(function="REAL_GDP_PER_CAPITA", info=info)
+        n = await self._get(function="REAL_GDP_PER_CAPITA", info=info)
         return n
 
-    @strawberry.field
-    def treasury_yield(
+    @strawberry.field(extensions=[Windowed()])
+    async def treasury_yield(
         self, info: Info, interval: str = "monthly", maturity: str = "10year"
     ) -> CommoditiesInterface:
         """
@@ -849,13 +1186,13 @@ class ECONOMIC_INDICATORS:
         Returns:
             CommoditiesInterface: The treasury yield data, represented as a GraphQL object.
         """
-        n = self._get(
+        n = await self._get(
             function="TREASURY_YIELD", info=info, interval=interval, maturity=maturity
         )
         return n
 
-    @strawberry.field
-    def federal_funds_rate(
+    @strawberry.field(extensions=[Windowed()])
+    async def federal_funds_rate(
         self, info: Info, interval: str = "monthly"
     ) -> CommoditiesInterface:
         """
@@ -871,11 +1208,11 @@ class ECONOMIC_INDICATORS:
         Returns:
             CommoditiesInterface: The federal funds rate data, represented as a GraphQL object.
         """
-        n = self._get(function="FEDERAL_FUNDS_RATE", info=info, interval=interval)
+        n = await self._get(function="FEDERAL_FUNDS_RATE", info=info, interval=interval)
         return n
 
-    @strawberry.field
-    def cpi(self, info: Info, interval: str = "monthly") -> CommoditiesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def cpi(self, info: Info, interval: str = "monthly") -> CommoditiesInterface:
         """
         This method retrieves cpi data from the Alpha Vantage API.
 
@@ -889,11 +1226,11 @@ class ECONOMIC_INDICATORS:
         Returns:
             CommoditiesInterface: The cpi data, represented as a GraphQL object.
         """
-        n = self._get(function="CPI", info=info, interval=interval)
+        n = await self._get(function="CPI", info=info, interval=interval)
         return n
 
-    @strawberry.field
-    def inflation(self, info: Info) -> CommoditiesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def inflation(self, info: Info) -> CommoditiesInterface:
         """
         This method retrieves inflation data from the Alpha Vantage API.
 
@@ -904,11 +1241,11 @@ class ECONOMIC_INDICATORS:
         Returns:
             CommoditiesInterface: The inflation data, represented as a GraphQL object.
         """
-        n = self._get(function="INFLATION", info=info)
+        n = await self._get(function="INFLATION", info=info)
         return n
 
-    @strawberry.field
-    def retail_sales(self, info: Info) -> CommoditiesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def retail_sales(self, info: Info) -> CommoditiesInterface:
         """
         This method retrieves retail sales data from the Alpha Vantage API.
 
@@ -919,11 +1256,11 @@ class ECONOMIC_INDICATORS:
         Returns:
             CommoditiesInterface: The retail sales data, represented as a GraphQL object.
         """
-        n = self._get(function="RETAIL_SALES", info=info)
+        n = await self._get(function="RETAIL_SALES", info=info)
         return n
 
-    @strawberry.field
-    def durable_goods(self, info: Info) -> CommoditiesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def durable_goods(self, info: Info) -> CommoditiesInterface:
         """
         This method retrieves durable goods data from the Alpha Vantage API.
 
@@ -934,11 +1271,11 @@ class ECONOMIC_INDICATORS:
         Returns:
             CommoditiesInterface: The durable goods data, represented as a GraphQL object.
         """
-        n = self._get(function="DURABLES", info=info)
+        n = await self._get(function="DURABLES", info=info)
         return n
 
-    @strawberry.field
-    def unemployment(self, info: Info) -> CommoditiesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def unemployment(self, info: Info) -> CommoditiesInterface:
         """
         This method retrieves unemployment data from the Alpha Vantage API.
 
@@ -949,11 +1286,11 @@ class ECONOMIC_INDICATORS:
         Returns:
             CommoditiesInterface: The unemployment data, represented as a GraphQL object.
         """
-        n = self._get(function="UNEMPLOYMENT", info=info)
+        n = await self._get(function="UNEMPLOYMENT", info=info)
         return n
 
-    @strawberry.field
-    def non_farm_payroll(
+    @strawberry.field(extensions=[Windowed()])
+    async def non_farm_payroll(
         self, info: Info, interval: str = "monthly"
     ) -> CommoditiesInterface:
         """Get non farm payroll data.
@@ -965,7 +1302,7 @@ class ECONOMIC_INDICATORS:
         Returns:
             CommoditiesInterface
         """
-        n = self._get(function="NONFARM_PAYROLL", info=info, interval=interval)
+        n = await self._get(function="NONFARM_PAYROLL", info=info, interval=interval)
         return n
 
 
@@ -983,8 +1320,8 @@ class COMMODOTIES:
         """
         return (None, None, None)
 
-    @strawberry.field
-    def corn(self, info: Info, interval: str = "monthly") -> CommoditiesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def corn(self, info: Info, interval: str = "monthly") -> CommoditiesInterface:
         """
         This method retrieves corn data from the Alpha Vantage API.
 
@@ -998,11 +1335,11 @@ class COMMODOTIES:
         Returns:
             CornType: The corn data, represented as a GraphQL object.
         """
-        n = self._get(function="CORN", info=info, interval=interval)
+        n = await self._get(function="CORN", info=info, interval=interval)
         return n
 
-    @strawberry.field
-    def crude_oil_wti(
+    @strawberry.field(extensions=[Windowed()])
+    async def crude_oil_wti(
         self, info: Info, interval: str = "monthly"
     ) -> CommoditiesInterface:
         """
@@ -1018,11 +1355,11 @@ class COMMODOTIES:
         Returns:
             CommoditiesInterface: The WTI crude oil data, represented as a GraphQL object.
         """
-        n = self._get(function="WTI", info=info, interval=interval)
+        n = await self._get(function="WTI", info=info, interval=interval)
         return n
 
-    @strawberry.field
-    def crude_oil_brent(
+    @strawberry.field(extensions=[Windowed()])
+    async def crude_oil_brent(
         self, info: Info, interval: str = "monthly"
     ) -> CommoditiesInterface:
         """
@@ -1038,11 +1375,11 @@ class COMMODOTIES:
         Returns:
             CommoditiesInterface: The Brent crude oil data, represented as a GraphQL object.
         """
-        n = self._get(function="BRENT", info=info, interval=interval)
+        n = await self._get(function="BRENT", info=info, interval=interval)
         return n
 
-    @strawberry.field
-    def natural_gas(
+    @strawberry.field(extensions=[Windowed()])
+    async def natural_gas(
         self, info: Info, interval: str = "monthly"
     ) -> CommoditiesInterface:
         """
@@ -1058,11 +1395,13 @@ class COMMODOTIES:
         Returns:
             CommoditiesInterface: The natural gas data, represented as a GraphQL object.
         """
-        n = self._get(function="NATURAL_GAS", info=info, interval=interval)
+        n = await self._get(function="NATURAL_GAS", info=info, interval=interval)
         return n
 
-    @strawberry.field
-    def copper(self, info: Info, interval: str = "monthly") -> CommoditiesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def copper(
+        self, info: Info, interval: str = "monthly"
+    ) -> CommoditiesInterface:
         """
         This method retrieves copper data from the Alpha Vantage API.
 
@@ -1076,11 +1415,13 @@ class COMMODOTIES:
         Returns:
             CommoditiesInterface: The copper data, represented as a GraphQL object.
         """
-        n = self._get(function="COPPER", info=info, interval=interval)
+        n = await self._get(function="COPPER", info=info, interval=interval)
         return n
 
-    @strawberry.field
-    def aluminum(self, info: Info, interval: str = "monthly") -> CommoditiesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def aluminum(
+        self, info: Info, interval: str = "monthly"
+    ) -> CommoditiesInterface:
         """
         This method retrieves aluminum data from the Alpha Vantage API.
 
@@ -1094,11 +1435,13 @@ class COMMODOTIES:
         Returns:
             CommoditiesInterface: The aluminum data, represented as a GraphQL object.
         """
-        n = self._get(function="ALUMINUM", info=info, interval=interval)
+        n = await self._get(function="ALUMINUM", info=info, interval=interval)
         return n
 
-    @strawberry.field
-    def wheat(self, info: Info, interval: str = "monthly") -> CommoditiesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def wheat(
+        self, info: Info, interval: str = "monthly"
+    ) -> CommoditiesInterface:
         """
         This method retrieves wheat data from the Alpha Vantage API.
 
@@ -1112,11 +1455,13 @@ class COMMODOTIES:
         Returns:
             CommoditiesInterface: The wheat data, represented as a GraphQL object.
         """
-        n = self._get(function="WHEAT", info=info, interval=interval)
+        n = await self._get(function="WHEAT", info=info, interval=interval)
         return n
 
-    @strawberry.field
-    def cotton(self, info: Info, interval: str = "monthly") -> CommoditiesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def cotton(
+        self, info: Info, interval: str = "monthly"
+    ) -> CommoditiesInterface:
         """
         This method retrieves cotton data from the Alpha Vantage API.
 
@@ -1130,11 +1475,13 @@ class COMMODOTIES:
         Returns:
             CommoditiesInterface: The cotton data, represented as a GraphQL object.
         """
-        n = self._get(function="COTTON", info=info, interval=interval)
+        n = await self._get(function="COTTON", info=info, interval=interval)
         return n
 
-    @strawberry.field
-    def sugar(self, info: Info, interval: str = "monthly") -> CommoditiesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def sugar(
+        self, info: Info, interval: str = "monthly"
+    ) -> CommoditiesInterface:
         """
         This method retrieves sugar data from the Alpha Vantage API.
 
@@ -1148,11 +1495,13 @@ class COMMODOTIES:
         Returns:
             CommoditiesInterface: The sugar data, represented as a GraphQL object.
         """
-        n = self._get(function="SUGAR", info=info, interval=interval)
+        n = await self._get(function="SUGAR", info=info, interval=interval)
         return n
 
-    @strawberry.field
-    def coffee(self, info: Info, interval: str = "monthly") -> CommoditiesInterface:
+    @strawberry.field(extensions=[Windowed()])
+    async def coffee(
+        self, info: Info, interval: str = "monthly"
+    ) -> CommoditiesInterface:
         """
         This method retrieves coffee data from the Alpha Vantage API.
 
@@ -1166,11 +1515,11 @@ class COMMODOTIES:
         Returns:
             CommoditiesInterface: The coffee data, represented as a GraphQL object.
         """
-        n = self._get(function="COFFEE", info=info, interval=interval)
+        n = await self._get(function="COFFEE", info=info, interval=interval)
         return n
 
-    @strawberry.field
-    def all_commodities(
+    @strawberry.field(extensions=[Windowed()])
+    async def all_commodities(
         self, info: Info, interval: str = "monthly"
     ) -> CommoditiesInterface:
         """
@@ -1186,7 +1535,7 @@ class COMMODOTIES:
         Returns:
             CommoditiesInterface: The all commodities data, represented as a GraphQL object.
         """
-        n = self._get(function="ALL_COMMODITIES", info=info, interval=interval)
+        n = await self._get(function="ALL_COMMODITIES", info=info, interval=interval)
         return n
 
 
@@ -0,0 +1,80 @@
+import asyncio
+import importlib
+from typing import Callable
+
+import pytest
+from starlette.requests import Request
+from ..scheduler import Scheduler, Tier
+from ..strawberry_permissions import GraphQLContext
+
+# ? The app's modules import each other by top-level name, so patch those copies.
+upstream = importlib.import_module("upstream")
+
+
+class FakeUpstream:
+    """Answers upstream calls with `respond`, each after 10 ms, recording the calls
+    and the most in flight at once."""
+
+    def __init__(self, respond: Callable[[dict[str, str]], dict]) -> None:
+        self.respond = respond
+        self.calls: list[dict[str, str]] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def get_json(self, params: dict[str, str]) -> dict:
+        self.calls.append(params)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        return self.respond(params)
+
+
+@pytest.fixture
+def unlimited_scheduler() -> Scheduler:
+    """A scheduler that never throttles."""
+    return Scheduler(tiers={"u": Tier(0, 0)}, key_tiers={}, default_tier="u")
+
+
+@pytest.fixture
+def graphql_context() -> Callable[..., GraphQLContext]:
+    """Builds the context of a GraphQL request sent with the API key `k` and the
+    given extra headers."""
+
+    def make(headers: dict[str, str] | None = None) -> GraphQLContext:
+        context = GraphQLContext()
+        context.request = Request(
+            {
+                "type": "http",
+                "method": "POST",
+                "path": "/graphql",
+                "headers": [
+                    (name.lower().encode(), value.encode())
+                    for name, value in {
+                        "ALPHAVANTAGE_API_KEY": "k",
+                        **(headers or {}),
+                    }.items()
+                ],
+            }
+        )
+        return context
+
+    return make
+
+
+@pytest.fixture
+def fake_upstream(
+    monkeypatch, unlimited_scheduler
+) -> Callable[[Callable[[dict[str, str]], dict]], FakeUpstream]:
+    """Answers the app's upstream calls with a function of their parameters, without
+    throttling."""
+
+    def install(respond: Callable[[dict[str, str]], dict]) -> FakeUpstream:
+        fake = FakeUpstream(respond)
+        monkeypatch.setattr(upstream.client, "get_json", fake.get_json)
+        monkeypatch.setattr(upstream, "scheduler", unlimited_scheduler)
+        return fake
+
+    return install
@@ -0,0 +1,83 @@
+import asyncio
+
+from ..adjusted import AdjustedSharing
+
+WEEKLY = {"function": "TIME_SERIES_WEEKLY", "symbol": "IBM", "apikey": "k"}
+ADJUSTED = {
+    "Meta Data": {
+        "1. Information": "Weekly Adjusted Prices and Volumes",
+        "2. Symbol": "IBM",
+        "3. Last Refreshed": "2024-03-01",
+        "4. Time Zone": "US/Eastern",
+    },
+    "Weekly Adjusted Time Series": {
+        "2024-03-01": {
+            "1. open": "10.0",
+            "2. high": "12.0",
+            "3. low": "9.0",
+            "4. close": "11.0",
+            "5. adjusted close": "5.5",
+            "6. volume": "100",
+            "7. dividend amount": "0.0",
+        }
+    },
+}
+
+
+def test_unadjusted_series_is_derived_once_from_the_adjusted_response():
+    requested = []
+
+    async def fetch(params):
+        requested.append(params["function"])
+        return ADJUSTED
+
+    sharing = AdjustedSharing(enabled=True)
+    assert sharing.handles(WEEKLY)
+    first = asyncio.run(sharing.serve(WEEKLY, fetch))
+    second = asyncio.run(sharing.serve(WEEKLY, fetch))
+    assert requested == ["TIME_SERIES_WEEKLY_ADJUSTED"] * 2
+    assert first is second
+    assert list(first) == ["Meta Data", "Weekly Time Series"]
+    assert first["Meta Data"]["1. Information"].startswith("Weekly Prices")
+    assert first["Weekly Time Series"] == {
+        "2024-03-01": {
+            "1. open": "10.0",
+            "2. high": "12.0",
+            "3. low": "9.0",
+            "4. close": "11.0",
+            "5. volume": "100",
+        }
+    }
+    assert sharing.stats()["derivations"] == 1
+
+
+def test_keys_without_the_adjusted_function_fall_back():
+    requested = []
+
+    async def fetch(params):
+        requested.append(params["function"])
+        if params["function"].endswith("ADJUSTED"):
+            return {"Information": "This is a premium endpoint."}
+        return {"Meta Data": {}, "Weekly Time Series": {}}
+
+    sharing = AdjustedSharing(enabled=True)
+    response = asyncio.run(sharing.serve(WEEKLY, fetch))
+    assert "Weekly Time Series" in response
+    assert requested == ["TIME_SERIES_WEEKLY_ADJUSTED", "TIME_SERIES_WEEKLY"]
+    assert not sharing.handles(WEEKLY)
+    assert sharing.handles({**WEEKLY, "apikey": "premium"})
+    assert not AdjustedSharing(enabled=False).handles(WEEKLY)
+
+
+def test_rate_limited_keys_keep_sharing_without_a_second_call():
+    requested = []
+    notice = {"Note": "Our standard API rate limit is 25 requests per day."}
+
+    async def fetch(params):
+        requested.append(params["function"])
+        return notice
+
+    sharing = AdjustedSharing(enabled=True)
+    assert asyncio.run(sharing.serve(WEEKLY, fetch)) is notice
+    assert requested == ["TIME_SERIES_WEEKLY_ADJUSTED"]
+    assert sharing.handles(WEEKLY)
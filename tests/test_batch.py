@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+from .. import batch
+
+
+def test_fan_out_is_bounded_ordered_and_reports_errors_per_symbol(monkeypatch):
+    monkeypatch.setattr(batch, "CONCURRENCY", 3)
+    in_flight, peak = 0, 0
+
+    async def resolve(symbol):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if symbol == "BAD":
+            raise ValueError("No Time Series found")
+        return symbol.lower()
+
+    symbols = ["A", "B", "BAD", "C", "D", "E", "F"]
+    items = asyncio.run(batch.fan_out(symbols, resolve))
+    assert [item.symbol for item in items] == symbols
+    assert [item.result for item in items] == ["a", "b", None, "c", "d", "e", "f"]
+    assert items[2].error == "No Time Series found"
+    assert peak == 3
+
+
+def test_fan_out_caps_the_number_of_symbols(monkeypatch):
+    monkeypatch.setattr(batch, "MAX_SYMBOLS", 2)
+
+    async def resolve(symbol):
+        return symbol
+
+    with pytest.raises(AssertionError):
+        asyncio.run(batch.fan_out(["A", "B", "C"], resolve))
@@ -0,0 +1,145 @@
+import asyncio
+import os
+
+from ..cache import FileBackend, RedisBackend, ResponseCache, decode_entry, encode_entry
+
+DAILY = {"function": "TIME_SERIES_DAILY", "symbol": "IBM", "apikey": "a"}
+QUOTE = {"function": "GLOBAL_QUOTE", "symbol": "IBM", "apikey": "a"}
+PAYLOAD = {"Meta Data": {"2. Symbol": "IBM"}, "Time Series (Daily)": {}}
+
+
+def test_ttl_per_function_and_shared_between_keys():
+    cache = ResponseCache(ttls={"TIME_SERIES_DAILY": 60, "GLOBAL_QUOTE": 0})
+
+    async def main():
+        await cache.set(DAILY, PAYLOAD)
+        await cache.set(QUOTE, {"Global Quote": {}})
+        return (
+            await cache.get({**DAILY, "apikey": "b"}),
+            await cache.get(QUOTE),
+        )
+
+    daily, quote = asyncio.run(main())
+    assert daily is PAYLOAD
+    assert quote is None
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["entries"] == 1
+
+
+def test_errors_are_not_cached():
+    cache = ResponseCache()
+    asyncio.run(cache.set(DAILY, {"Information": "rate limit"}))
+    assert asyncio.run(cache.get(DAILY)) is None
+
+
+def test_lru_is_bounded_by_bytes():
+    payloads = {symbol: {"x": symbol * 200} for symbol in "ABC"}
+    size = len(encode_entry(payloads["A"], 0.0, 0.0))
+    cache = ResponseCache(max_bytes=int(size * 2.5))
+
+    async def main():
+        for symbol, payload in payloads.items():
+            await cache.set({**DAILY, "symbol": symbol}, payload)
+
+    asyncio.run(main())
+    stats = cache.stats()
+    assert stats["bytes"] == 2 * size
+    assert stats["evictions"] == 1
+
+
+class LocalRedis:
+    """In-memory stand-in for a Redis server, speaking the subset the backend uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key, (None, None))[0]
+
+    def set(self, key, value, ex=None):
+        assert isinstance(value, bytes) and ex > 0
+        self.data[key] = (value, ex)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def test_entries_round_trip_in_binary():
+    raw = encode_entry(PAYLOAD, 1.0, 2.0)
+    assert not raw.lstrip(b"AVC1").startswith(b"{")
+    entry = decode_entry(raw)
+    assert entry.payload == PAYLOAD
+    assert (entry.stored_at, entry.expires_at, entry.size) == (1.0, 2.0, len(raw))
+    assert decode_entry(b'{"not": "ours"}') is None
+
+
+def test_file_backend_is_shared_between_workers(tmp_path):
+    asyncio.run(ResponseCache(backend=FileBackend(str(tmp_path))).set(DAILY, PAYLOAD))
+    cache = ResponseCache(backend=FileBackend(str(tmp_path)))
+    assert asyncio.run(cache.get(DAILY)) == PAYLOAD
+    assert cache.stats()["shared_hits"] == 1
+
+
+def test_redis_backend_is_shared_between_workers():
+    server = LocalRedis()
+    writer = ResponseCache(backend=RedisBackend(server), ttls={"TIME_SERIES_DAILY": 60})
+    asyncio.run(writer.set(DAILY, PAYLOAD))
+    (key,) = server.data
+    assert key.startswith("av:") and server.data[key][1] == 60 + writer.grace
+    reader = ResponseCache(backend=RedisBackend(server))
+    assert asyncio.run(reader.get(DAILY)) == PAYLOAD
+    assert asyncio.run(reader.get(DAILY)) == PAYLOAD
+    stats = reader.stats()
+    assert (stats["shared_hits"], stats["memory_hits"]) == (1, 1)
+
+
+def test_corrupt_shared_entries_are_misses_and_removed(tmp_path):
+    backend = FileBackend(str(tmp_path))
+    asyncio.run(ResponseCache(backend=backend).set(DAILY, PAYLOAD))
+    (path,) = tmp_path.iterdir()
+    raw = path.read_bytes()
+    assert decode_entry(raw[:-4]) is None
+    expires_at = path.stat().st_mtime
+    path.write_bytes(raw[:-4])
+    os.utime(path, (expires_at, expires_at))
+    cache = ResponseCache(backend=backend)
+    assert asyncio.run(cache.get(DAILY)) is None
+    assert cache.stats()["misses"] == 1
+    assert not list(tmp_path.iterdir())
+
+
+class DownBackend:
+    """A shared tier that is unreachable."""
+
+    def get(self, key):
+        raise ConnectionError("down")
+
+    def set(self, key, value, ttl):
+        raise ConnectionError("down")
+
+    def delete(self, key):
+        raise ConnectionError("down")
+
+
+def test_backend_failures_fall_back_to_memory():
+    cache = ResponseCache(backend=DownBackend())
+
+    async def main():
+        await cache.set(DAILY, PAYLOAD)
+        return await cache.get(DAILY), await cache.get(QUOTE)
+
+    assert asyncio.run(main()) == (PAYLOAD, None)
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"]) == (1, 1)
+    assert stats["backend"] == "DownBackend"
+    assert stats["backend_errors"] == 2
+
+
+def test_file_backend_drops_expired_entries(tmp_path):
+    backend = FileBackend(str(tmp_path), sweep_interval=0)
+    backend.set("gone", b"old", 0)
+    assert backend.get("gone") is None
+    backend.set("kept", b"new", 60)
+    assert backend.get("kept") == b"new"
+    assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,142 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from .. import fundamentals
+from ..app import schema
+from ..pydantic_schemas import BalanceSheetSchema, CashFlowSchema, IncomeStatementSchema
+from .. import strawberry_types
+
+REPORT = {
+    field.validation_alias: "1" for field in BalanceSheetSchema.model_fields.values()
+}
+
+
+def test_annual_and_quarterly_statements_share_one_upstream_call(
+    fake_upstream, graphql_context
+):
+    upstream = fake_upstream(
+        lambda params: {
+            "symbol": "IBM",
+            "annualReports": [{**REPORT, "fiscalDateEnding": "2023-12-31"}],
+            "quarterlyReports": [
+                {**REPORT, "fiscalDateEnding": "2023-12-31"},
+                {**REPORT, "fiscalDateEnding": "2023-09-30"},
+            ],
+        }
+    )
+    query = """{ getFundementalData {
+        getBalanceSheetAnnual(symbol: "SHARE") { fiscalDateEnding }
+        getBalanceSheetQuarterly(symbol: "SHARE") { fiscalDateEnding }
+    } }"""
+    result = asyncio.run(schema.execute(query, context_value=graphql_context()))
+    assert not result.errors
+    data = result.data["getFundementalData"]
+    assert len(data["getBalanceSheetAnnual"]) == 1
+    assert len(data["getBalanceSheetQuarterly"]) == 2
+    assert [(c["function"], c["symbol"]) for c in upstream.calls] == [
+        ("BALANCE_SHEET", "SHARE")
+    ]
+
+
+def test_statements_match_the_pydantic_conversion():
+    for schema_type, gqltype in (
+        (BalanceSheetSchema, strawberry_types.BalanceSheetType),
+        (CashFlowSchema, strawberry_types.CashFlowType),
+        (IncomeStatementSchema, strawberry_types.IncomeStatementType),
+    ):
+        row = {
+            field.validation_alias: str(i)
+            for i, field in enumerate(schema_type.model_fields.values())
+        }
+        models = [schema_type.model_validate(row)]
+        assert strawberry_types.as_statements(gqltype, models) == [
+            gqltype.from_pydantic(models[0])
+        ]
+
+
+def quarter(date: str, revenue: float, net_income: float, **figures: str) -> dict:
+    return {
+        "fiscalDateEnding": date,
+        "reportedCurrency": "USD",
+        "totalRevenue": str(revenue),
+        "grossProfit": str(revenue / 2),
+        "operatingIncome": str(revenue / 4),
+        "netIncome": str(net_income),
+        **figures,
+    }
+
+
+def test_ratios_over_a_quarterly_history():
+    dates = [f"2023-{m:02d}-30" for m in (12, 9, 6, 3)] + ["2022-12-31"]
+    income = [
+        quarter(date, revenue, income)
+        for date, revenue, income in zip(
+            dates, (150, 140, 120, 110, 100), (30, 20, 10, 0, -10)
+        )
+    ]
+    cash_flow = [
+        {"fiscalDateEnding": d, "operatingCashflow": "50", "capitalExpenditures": "20"}
+        for d in dates[:2]
+    ]
+    balance = [
+        {
+            "fiscalDateEnding": dates[0],
+            "shortLongTermDebtTotal": "None",
+            "shortTermDebt": "10",
+            "longTermDebt": "90",
+            "totalShareholderEquity": "200",
+        }
+    ]
+    out_dates, ratios = fundamentals.ratios(income, cash_flow, balance, True)
+    assert out_dates == dates
+    assert ratios["gross_margin"].tolist() == [0.5] * 5
+    assert ratios["net_margin"][0] == 0.2
+    assert ratios["free_cash_flow"][:2].tolist() == [30.0, 30.0]
+    assert np.isnan(ratios["free_cash_flow"][2:]).all()
+    assert ratios["debt_to_equity"][0] == 0.5
+    assert ratios["revenue_growth_yoy"][0] == 0.5
+    assert np.isnan(ratios["revenue_growth_yoy"][1:]).all()
+    assert ratios["revenue_growth_qoq"][:4].tolist() == pytest.approx(
+        [1 / 14, 1 / 6, 1 / 11, 0.1]
+    )
+    # ? A loss turning into a profit is growth; growth from zero is undefined.
+    assert ratios["net_income_growth_yoy"][0] == 4.0
+    assert np.isnan(ratios["net_income_growth_qoq"][2])
+
+
+def test_figures_and_ratios_share_the_statement_calls(fake_upstream, graphql_context):
+    reports = [
+        quarter("2023-12-31", 200, 20, operatingCashflow="None"),
+        quarter("2022-12-31", 100, 10),
+    ]
+    upstream = fake_upstream(
+        lambda params: {"annualReports": reports, "quarterlyReports": []}
+    )
+    query = """{ getFundementalData {
+        incomeStatementFigures(symbol: "RATIO") { totalRevenue netIncome }
+        cashFlowFigures(symbol: "RATIO") { operatingCashFlow }
+        ratios(symbol: "RATIO") {
+            fiscalDateEnding grossMargin revenueGrowthYoy revenueGrowthQoq
+        }
+    } }"""
+    result = asyncio.run(schema.execute(query, context_value=graphql_context()))
+    assert not result.errors, result.errors
+    data = result.data["getFundementalData"]
+    assert data["incomeStatementFigures"][0] == {
+        "totalRevenue": 200.0,
+        "netIncome": 20.0,
+    }
+    assert data["cashFlowFigures"][0] == {"operatingCashFlow": None}
+    assert data["ratios"][0] == {
+        "fiscalDateEnding": "2023-12-31",
+        "grossMargin": 0.5,
+        "revenueGrowthYoy": 1.0,
+        "revenueGrowthQoq": None,
+    }
+    assert sorted(c["function"] for c in upstream.calls) == [
+        "BALANCE_SHEET",
+        "CASH_FLOW",
+        "INCOME_STATEMENT",
+    ]
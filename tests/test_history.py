@@ -0,0 +1,91 @@
+import asyncio
+from ..history import HistoryStore
+
+FULL = {"function": "TIME_SERIES_DAILY", "symbol": "IBM", "outputsize": "full"}
+
+
+def bar(close: str, adjusted: str | None = None) -> dict:
+    out = {"1. open": "1", "2. high": "2", "3. low": "0.5", "4. close": close}
+    if adjusted is not None:
+        out["5. adjusted close"] = adjusted
+    return out
+
+
+def response(refreshed: str, bars: dict) -> dict:
+    return {
+        "Meta Data": {"3. Last Refreshed": refreshed, "4. Output Size": "Full size"},
+        "Time Series (Daily)": bars,
+    }
+
+
+class Upstream:
+    def __init__(self, full: dict, compact: dict):
+        self.payloads = {"full": full, "compact": compact}
+        self.calls = []
+
+    async def __call__(self, params):
+        self.calls.append(params["outputsize"])
+        return self.payloads[params["outputsize"]]
+
+
+def test_full_is_fetched_once_then_extended_with_compact():
+    store = HistoryStore()
+    full = response("2024-03-04", {"2024-03-04": bar("10"), "2024-03-01": bar("9")})
+    compact = response(
+        "2024-03-06",
+        {"2024-03-06": bar("12"), "2024-03-05": bar("11"), "2024-03-04": bar("10.5")},
+    )
+    upstream = Upstream(full, compact)
+
+    first = asyncio.run(store.full(FULL, upstream))
+    merged = asyncio.run(store.full(FULL, upstream))
+    again = asyncio.run(store.full(FULL, upstream))
+
+    assert first is full
+    assert upstream.calls == ["full", "compact", "compact"]
+    assert list(merged["Time Series (Daily)"]) == [
+        "2024-03-06",
+        "2024-03-05",
+        "2024-03-04",
+        "2024-03-01",
+    ]
+    assert merged["Time Series (Daily)"]["2024-03-04"]["4. close"] == "10.5"
+    assert merged["Meta Data"]["3. Last Refreshed"] == "2024-03-06"
+    assert merged["Meta Data"]["4. Output Size"] == "Full size"
+    assert again is merged
+    assert store.stats()["refreshed"] == 1
+    assert store.stats()["unchanged"] == 1
+
+
+def test_history_is_reseeded_when_adjusted_closes_change():
+    params = {**FULL, "function": "TIME_SERIES_DAILY_ADJUSTED"}
+    store = HistoryStore()
+    full = response(
+        "2024-03-04",
+        {"2024-03-04": bar("10", "10"), "2024-03-01": bar("9", "9")},
+    )
+    compact = response(
+        "2024-03-05",
+        {
+            "2024-03-05": bar("11", "11"),
+            "2024-03-04": bar("10", "9.8"),
+            "2024-03-01": bar("9", "8.8"),
+        },
+    )
+    upstream = Upstream(full, compact)
+    asyncio.run(store.full(params, upstream))
+    asyncio.run(store.full(params, upstream))
+    assert upstream.calls == ["full", "compact", "full"]
+    assert store.stats()["reseeded"] == 1
+
+
+def test_checks_are_remembered_for_the_most_recent_symbols_only():
+    store = HistoryStore(max_checked=2)
+    upstream = Upstream(response("2024-03-04", {"2024-03-04": bar("10")}), {})
+    for symbol in ("A", "B", "A", "C"):
+        asyncio.run(store.full({**FULL, "symbol": symbol}, upstream))
+
+    async def fresh(symbol: str) -> bool:
+        return await store.fresh({**FULL, "symbol": symbol}, 60) is not None
+
+    assert [asyncio.run(fresh(s)) for s in "ABC"] == [True, False, True]
@@ -0,0 +1,40 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ..http_client import UpstreamClient
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):  # pylint: disable=invalid-name
+        body = json.dumps({"Global Quote": {}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_each_session_is_closed_with_its_loop():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = UpstreamClient(base_url=f"http://127.0.0.1:{server.server_port}/query")
+    sessions = []
+
+    async def call():
+        await client.get_json({"function": "GLOBAL_QUOTE", "symbol": "IBM"})
+        await client.get_json({"function": "GLOBAL_QUOTE", "symbol": "IBM"})
+        sessions.append(client._session)
+
+    try:
+        for _ in range(3):
+            asyncio.run(call())
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert len(set(map(id, sessions))) == 3
+    assert all(session.closed for session in sessions)
+    assert client.calls == 6
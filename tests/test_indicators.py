@@ -0,0 +1,280 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+from .. import indicators
+from ..pydantic_schemas import TechIndicatorMetadataSchema
+from ..series import SeriesFrame
+
+RAMP = np.arange(1.0, 21.0)
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "indicators").glob("*.json"))
+RECORDED = [pytest.param(path, id=path.stem) for path in FIXTURES] or [
+    pytest.param(None, id="unrecorded")
+]
+
+
+def reference_ema(values: list[float], period: int) -> list[float | None]:
+    """TA-Lib's EMA written out: SMA seed, then `prev + k * (value - prev)`."""
+    out: list[float | None] = [None] * len(values)
+    k = 2 / (period + 1)
+    prev = sum(values[:period]) / period
+    out[period - 1] = prev
+    for i in range(period, len(values)):
+        prev = prev + k * (values[i] - prev)
+        out[i] = prev
+    return out
+
+
+def average(function: str, values: np.ndarray, n: int) -> np.ndarray:
+    """One moving average of `values`, oldest first, as `IndicatorPass` computes it."""
+    frame = SeriesFrame(
+        {
+            f"d{i:04d}": {"4. close": str(v)}
+            for i, v in reversed(list(enumerate(values)))
+        }
+    )
+    spec = indicators.Spec(function, time_period=n)
+    return indicators.IndicatorPass(frame).compute(spec, None)[function][::-1]
+
+
+def test_averages_of_a_ramp_have_closed_forms():
+    # ? On a linear series the lags are exact: EMA lags (n-1)/2, WMA (n-1)/3, and
+    # ? DEMA/TEMA cancel the lag entirely.
+    n = 3
+    np.testing.assert_allclose(average("SMA", RAMP, n)[n - 1 :], RAMP[n - 1 :] - 1)
+    np.testing.assert_allclose(average("EMA", RAMP, n)[n - 1 :], RAMP[n - 1 :] - 1)
+    np.testing.assert_allclose(average("WMA", RAMP, n)[n - 1 :], RAMP[n - 1 :] - 2 / 3)
+    np.testing.assert_allclose(average("DEMA", RAMP, n)[2 * (n - 1) :], RAMP[4:])
+    np.testing.assert_allclose(average("TEMA", RAMP, n)[3 * (n - 1) :], RAMP[6:])
+
+
+def test_lookbacks_match_ta_lib():
+    n = 5
+    for function, lookback in (
+        ("SMA", 4),
+        ("EMA", 4),
+        ("WMA", 4),
+        ("DEMA", 8),
+        ("TEMA", 12),
+    ):
+        values = average(function, RAMP, n)
+        assert np.isnan(values[:lookback]).all(), function
+        assert not np.isnan(values[lookback:]).any(), function
+    assert np.isnan(average("EMA", RAMP[:4], n)).all()
+
+
+def test_ema_matches_the_reference_recursion():
+    rng = np.random.default_rng(7)
+    prices = 100 + np.cumsum(rng.normal(0, 1, 500))
+    expected = reference_ema(prices.tolist(), 20)
+    np.testing.assert_allclose(average("EMA", prices, 20)[19:], expected[19:])
+
+
+def reference_average(function: str, values: list[float], n: int) -> list[float]:
+    """TA-Lib's averages written out; each starts once it has warmed up."""
+    match function:
+        case "SMA":
+            return [
+                sum(values[i - n + 1 : i + 1]) / n for i in range(n - 1, len(values))
+            ]
+        case "WMA":
+            total = n * (n + 1) / 2
+            return [
+                sum((j + 1) * values[i - n + 1 + j] for j in range(n)) / total
+                for i in range(n - 1, len(values))
+            ]
+    first = reference_ema(values, n)[n - 1 :]
+    if function == "EMA":
+        return first
+    second = reference_ema(first, n)[n - 1 :]
+    if function == "DEMA":
+        return [2 * a - b for a, b in zip(first[n - 1 :], second)]
+    third = reference_ema(second, n)[n - 1 :]
+    return [
+        3 * a - 3 * b + c
+        for a, b, c in zip(first[2 * (n - 1) :], second[n - 1 :], third)
+    ]
+
+
+@pytest.mark.parametrize("function", ["SMA", "EMA", "WMA", "DEMA", "TEMA"])
+@pytest.mark.parametrize("interval", ["daily", "60min"])
+def test_local_averages_match_ta_lib_definitions(function, interval):
+    rng = np.random.default_rng(11)
+    prices = np.round(100 + np.cumsum(rng.normal(0, 1, 300)), 4)
+    stamps = np.datetime64("2024-01-02T10:00") + np.arange(300) * (
+        np.timedelta64(1, "h") if interval == "60min" else np.timedelta64(1, "D")
+    )
+    dates = [str(stamp).replace("T", " ") + ":00" for stamp in stamps]
+    if interval == "daily":
+        dates = [date[:10] for date in dates]
+    params, series_key = indicators.series_request("IBM", interval)
+
+    async def fetch(requested):
+        assert requested == {**params, "apikey": "k"}
+        bars = {d: {"4. close": f"{p:.4f}"} for d, p in zip(dates, prices)}
+        return {"Meta Data": {}, series_key: dict(reversed(bars.items()))}
+
+    data, _ = asyncio.run(
+        indicators.technical_average("k", function, "IBM", interval, 10, "close", fetch)
+    )
+    expected = reference_average(function, prices.tolist(), 10)
+    # ? Upstream keys intraday values by minute.
+    keys = [date[:16] if interval == "60min" else date for date in dates]
+    assert list(data) == keys[len(keys) - len(expected) :][::-1]
+    for key, value in zip(reversed(keys), reversed(expected)):
+        assert float(data[key][function]) == pytest.approx(value, abs=1e-4), key
+
+
+def test_technical_average_has_the_shape_of_the_upstream_response():
+    bars = {
+        f"2024-01-{day:02d}": {"1. open": "0", "4. close": f"{day}.0"}
+        for day in range(10, 0, -1)
+    }
+    requested = []
+
+    async def fetch(params):
+        requested.append(params)
+        return {
+            "Meta Data": {
+                "3. Last Refreshed": "2024-01-10",
+                "5. Time Zone": "US/Eastern",
+            },
+            "Time Series (Daily)": bars,
+        }
+
+    data, metadata = asyncio.run(
+        indicators.technical_average("k", "SMA", "IBM", "daily", 3, "close", fetch)
+    )
+    assert requested == [
+        {
+            "function": "TIME_SERIES_DAILY",
+            "outputsize": "full",
+            "symbol": "IBM",
+            "apikey": "k",
+        }
+    ]
+    assert list(data) == [f"2024-01-{day:02d}" for day in range(10, 2, -1)]
+    assert data["2024-01-10"] == {"SMA": "9.0000"}
+    meta = TechIndicatorMetadataSchema.model_validate(metadata)
+    assert (meta.indicator, meta.time_period, meta.last_refreshed) == (
+        "Simple Moving Average (SMA)",
+        3,
+        "2024-01-10",
+    )
+
+
+@pytest.mark.parametrize("path", RECORDED)
+def test_parity_with_recorded_upstream_responses(path):
+    """Fixtures are recorded with `benchmarks/record_indicators.py`."""
+    if path is None:
+        message = (
+            "No upstream recordings in tests/fixtures/indicators; record them with "
+            "benchmarks/record_indicators.py"
+        )
+        if os.getenv("AV_REQUIRE_RECORDINGS"):
+            pytest.fail(message)
+        pytest.skip(message)
+    recording = json.loads(path.read_text())
+    params = recording["params"]
+
+    async def fetch(_):
+        return recording["series"]
+
+    data, _ = asyncio.run(
+        indicators.technical_average(
+            "k",
+            params["function"],
+            params["symbol"],
+            params["interval"],
+            int(params["time_period"]),
+            params["series_type"],
+            fetch,
+        )
+    )
+    upstream = recording["indicator"][f"Technical Analysis: {params['function']}"]
+    # ? The oldest values depend on how much history upstream seeded from.
+    dates = sorted(set(data) & set(upstream), reverse=True)[:250]
+    assert dates
+    for date in dates:
+        ours = float(data[date][params["function"]])
+        theirs = float(upstream[date][params["function"]])
+        assert ours == pytest.approx(theirs, abs=2e-4, rel=1e-6), date
+
+
+def ramp_frame(count: int) -> SeriesFrame:
+    """Bars whose close rises by one a day, with a range of two around it."""
+    return SeriesFrame(
+        {
+            f"d{i:04d}": {
+                "1. open": str(i),
+                "2. high": str(i + 1),
+                "3. low": str(i - 1),
+                "4. close": str(i),
+            }
+            for i in range(count, 0, -1)
+        }
+    )
+
+
+def oldest_first(lines: dict) -> dict:
+    return {name: values[::-1] for name, values in lines.items()}
+
+
+def test_macd_bbands_atr_and_stoch_on_a_ramp():
+    batch = indicators.IndicatorPass(ramp_frame(60))
+    macd = oldest_first(batch.compute(indicators.Spec("MACD")))
+    assert np.isnan(macd["MACD"][:33]).all()
+    np.testing.assert_allclose(macd["MACD"][33:], 7.0)
+    np.testing.assert_allclose(macd["MACD_Signal"][33:], 7.0)
+    np.testing.assert_allclose(macd["MACD_Hist"][33:], 0.0, atol=1e-9)
+    bands = oldest_first(batch.compute(indicators.Spec("BBANDS", time_period=3)))
+    np.testing.assert_allclose(
+        bands["Real Upper Band"][2:] - bands["Real Middle Band"][2:],
+        round(2 * (2 / 3) ** 0.5, 4),
+        atol=1e-4,
+    )
+    atr = oldest_first(batch.compute(indicators.Spec("ATR")))["ATR"]
+    assert np.isnan(atr[:14]).all()
+    np.testing.assert_allclose(atr[14:], 2.0)
+    stoch = oldest_first(batch.compute(indicators.Spec("STOCH")))
+    assert np.isnan(stoch["SlowD"][:8]).all()
+    # ? The close sits one below the highest high of the last five bars.
+    np.testing.assert_allclose(stoch["SlowK"][8:], 100 * 5 / 6, atol=1e-4)
+    np.testing.assert_allclose(stoch["SlowD"][8:], 100 * 5 / 6, atol=1e-4)
+
+
+def test_rsi_matches_wilders_definition():
+    rng = np.random.default_rng(3)
+    prices = 100 + np.cumsum(rng.normal(0, 1, 200))
+    frame = SeriesFrame(
+        {
+            f"d{i:04d}": {"4. close": str(p)}
+            for i, p in reversed(list(enumerate(prices)))
+        }
+    )
+    rsi = oldest_first(
+        indicators.IndicatorPass(frame).compute(indicators.Spec("RSI"), None)
+    )["RSI"]
+    changes = np.diff(prices)
+    gain = np.clip(changes[:14], 0, None).mean()
+    loss = np.clip(-changes[:14], 0, None).mean()
+    expected = [100 * gain / (gain + loss)]
+    for change in changes[14:]:
+        gain = (gain * 13 + max(change, 0)) / 14
+        loss = (loss * 13 + max(-change, 0)) / 14
+        expected.append(100 * gain / (gain + loss))
+    assert np.isnan(rsi[:14]).all()
+    np.testing.assert_allclose(rsi[14:], expected)
+
+
+def test_a_pass_shares_averages_between_indicators():
+    batch = indicators.IndicatorPass(ramp_frame(100))
+    for function in ("EMA", "DEMA", "TEMA"):
+        batch.compute(indicators.Spec(function, time_period=26))
+    batch.compute(indicators.Spec("MACD"))
+    # ? DEMA and TEMA reuse the EMA, TEMA the EMA of the EMA, MACD the slow EMA.
+    assert batch.hits >= 4
+    assert indicators.Spec("BBANDS").label == "BBANDS(20,2.0,2.0,close)"
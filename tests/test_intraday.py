@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from ..intraday import IntradayAggregator, aggregate, minutes
+from ..series import SeriesFrame
+
+
+def one_minute_bars(day: str, start: int, stop: int) -> dict[str, dict[str, str]]:
+    """Bars of the minutes `start` to `stop` (exclusive) of `day`, newest first; the
+    price is the minute of the day, the volume one."""
+    return {
+        f"{day} {m // 60:02d}:{m % 60:02d}:00": {
+            "1. open": f"{m}.0000",
+            "2. high": f"{m + 0.5:.4f}",
+            "3. low": f"{m - 0.5:.4f}",
+            "4. close": f"{m + 0.25:.4f}",
+            "5. volume": "1",
+        }
+        for m in range(stop - 1, start - 1, -1)
+    }
+
+
+# ? 04:00 to 11:29 on one day and 19:00 to 19:59 on the previous one.
+BARS = {
+    **one_minute_bars("2024-03-01", 4 * 60, 11 * 60 + 30),
+    **one_minute_bars("2024-02-29", 19 * 60, 20 * 60),
+}
+
+
+def test_minutes_of_intervals():
+    assert [minutes(i) for i in ("1min", "60min", "2h", "4h")] == [1, 60, 120, 240]
+    assert minutes("daily") is None
+    assert minutes("24h") is None
+
+
+def test_bars_are_keyed_by_the_start_of_buckets_aligned_on_midnight():
+    bars = aggregate(SeriesFrame(BARS), 120)
+    assert list(bars) == [
+        "2024-03-01 10:00:00",
+        "2024-03-01 08:00:00",
+        "2024-03-01 06:00:00",
+        "2024-03-01 04:00:00",
+        "2024-02-29 18:00:00",
+    ]
+    assert bars["2024-03-01 10:00:00"] == {
+        "1. open": "600.0000",
+        "2. high": "689.5000",
+        "3. low": "599.5000",
+        "4. close": "689.2500",
+        "5. volume": "90",
+    }
+    assert bars["2024-02-29 18:00:00"]["5. volume"] == "60"
+
+
+def test_limit_reads_only_the_newest_bars_and_matches_the_full_aggregation():
+    frame = SeriesFrame(BARS)
+    full = aggregate(frame, 15)
+    for limit in (1, 3, 10):
+        limited = aggregate(SeriesFrame(BARS), 15, limit)
+        assert list(limited.items()) == list(full.items())[:limit]
+
+
+def test_intervals_are_served_from_one_fetch_of_the_base():
+    requested = []
+
+    async def fetch(params):
+        requested.append((params["interval"], params["outputsize"]))
+        return {
+            "Meta Data": {"2. Symbol": "IBM", "6. Time Zone": "US/Eastern"},
+            "Time Series (1min)": BARS,
+        }
+
+    aggregator = IntradayAggregator(base="1min")
+    params = {"function": "TIME_SERIES_INTRADAY", "symbol": "IBM"}
+    five = asyncio.run(
+        aggregator.serve({**params, "interval": "5min", "outputsize": "compact"}, fetch)
+    )
+    two_hours = asyncio.run(
+        aggregator.serve({**params, "interval": "2h", "outputsize": "full"}, fetch)
+    )
+    assert requested == [("1min", "full")] * 2
+    assert len(five["Time Series (5min)"]) == 100
+    assert five["Meta Data"]["3. Last Refreshed"] == "2024-03-01 11:25:00"
+    assert list(two_hours["Time Series (2h)"]) == list(
+        aggregate(SeriesFrame(BARS), 120)
+    )
+    assert not aggregator.handles({**params, "interval": "1min", "outputsize": "full"})
+    assert aggregator.handles({**params, "interval": "1min", "outputsize": "compact"})
+    assert IntradayAggregator(base="").handles({**params, "interval": "4h"})
+    assert not IntradayAggregator(base="").handles({**params, "interval": "5min"})
+
+
+def test_upstream_intervals_fall_back_when_the_base_is_unavailable():
+    async def fetch(params):
+        if params["interval"] == "1min":
+            return {"Information": "rate limited"}
+        return {"Meta Data": {}, "Time Series (5min)": {}}
+
+    aggregator = IntradayAggregator(base="1min")
+    params = {"function": "TIME_SERIES_INTRADAY", "symbol": "IBM"}
+    five = asyncio.run(aggregator.serve({**params, "interval": "5min"}, fetch))
+    assert "Time Series (5min)" in five
+    assert asyncio.run(aggregator.serve({**params, "interval": "2h"}, fetch)) == {
+        "Information": "rate limited"
+    }
+    assert aggregator.stats()["fallbacks"] == 1
+
+
+def test_intervals_the_base_does_not_divide_are_built_from_1min():
+    requested = []
+
+    async def fetch(params):
+        requested.append(params["interval"])
+        return {"Meta Data": {}, "Time Series (1min)": BARS}
+
+    aggregator = IntradayAggregator(base="5min")
+    params = {"function": "TIME_SERIES_INTRADAY", "symbol": "IBM"}
+    assert aggregator.source_interval("7min") == "1min"
+    assert aggregator.source_interval("90min") == "5min"
+    assert IntradayAggregator(base="60min").source_interval("90min") == "1min"
+    assert IntradayAggregator(base="15min").source_interval("5min") is None
+    seven = asyncio.run(
+        aggregator.serve({**params, "interval": "7min", "outputsize": "full"}, fetch)
+    )
+    assert requested == ["1min"]
+    assert list(seven["Time Series (7min)"]) == list(aggregate(SeriesFrame(BARS), 7))
+    with pytest.raises(ValueError):
+        asyncio.run(aggregator.serve({**params, "interval": "daily"}, fetch))
@@ -0,0 +1,110 @@
+import asyncio
+
+from ..app import schema
+from ..loaders import CONCURRENCY
+from ..pydantic_schemas import OverviewSchema
+from ..quotes import as_global_quote
+
+SYMBOLS = [f"S{i}" for i in range(30)]
+
+
+def respond(params: dict[str, str]) -> dict:
+    if params["function"] == "REALTIME_BULK_QUOTES":
+        return {
+            "data": [
+                {"symbol": symbol, "close": "1.5", "timestamp": "2024-03-01"}
+                for symbol in params["symbol"].split(",")
+            ]
+        }
+    if params["function"] == "OVERVIEW":
+        overview = {
+            field.validation_alias: "1"
+            for field in OverviewSchema.model_fields.values()
+        }
+        return {**overview, "Symbol": params["symbol"]}
+    bar = {
+        "1. open": "1",
+        "2. high": "1",
+        "3. low": "1",
+        "4. close": "1",
+        "5. volume": "1",
+    }
+    return {
+        "Meta Data": {"2. Symbol": params["symbol"]},
+        "Time Series (Daily)": {"2024-03-01": bar},
+    }
+
+
+def test_symbols_are_loaded_in_one_batch_per_function(fake_upstream, graphql_context):
+    upstream = fake_upstream(respond)
+    fundamentals = " ".join(
+        f'q{i}: globalQuote(symbol: "{s}") {{ price }} '
+        f'o{i}: getCompanyOverview(symbol: "{s}") {{ symbol }}'
+        for i, s in enumerate(SYMBOLS)
+    )
+    series = " ".join(
+        f'd{i}: daily(symbol: "{s}") {{ columns {{ close }} }}'
+        for i, s in enumerate(SYMBOLS)
+    )
+    query = (
+        f"{{ getFundementalData {{ {fundamentals} }} getTimeSeries {{ {series} }} }}"
+    )
+    loaded = graphql_context({"X-Debug-Plan": "1"})
+    result = asyncio.run(schema.execute(query, context_value=loaded))
+    assert not result.errors, result.errors
+    functions = [c["function"] for c in upstream.calls]
+    assert functions.count("REALTIME_BULK_QUOTES") == 1
+    assert functions.count("OVERVIEW") == functions.count("TIME_SERIES_DAILY") == 30
+    assert len(upstream.calls) == 61
+    assert upstream.peak == 61
+    assert sorted(loaded.loaders.batches) == [
+        ("GLOBAL_QUOTE", 30),
+        ("OVERVIEW", 30),
+        ("TIME_SERIES_DAILY", 30),
+    ]
+    data = result.data
+    assert data["getFundementalData"]["q29"] == {"price": "1.5"}
+    assert data["getFundementalData"]["o7"] == {"symbol": "S7"}
+    assert data["getTimeSeries"]["d3"]["columns"]["close"] == [1.0]
+    assert result.extensions["queryPlan"]["unplanned"] == []
+
+
+def test_a_rate_limited_bulk_call_is_not_spent_again_per_symbol(
+    fake_upstream, graphql_context
+):
+    upstream = fake_upstream(
+        lambda params: {
+            "Note": "Thank you for using Alpha Vantage! Our standard API "
+            "rate limit is 25 requests per day."
+        }
+    )
+    quotes = " ".join(
+        f'q{i}: globalQuote(symbol: "{s}") {{ price }}'
+        for i, s in enumerate(["LIM1", "LIM2"])
+    )
+    query = f"{{ getFundementalData {{ {quotes} }} }}"
+    result = asyncio.run(schema.execute(query, context_value=graphql_context()))
+    assert "rate limit" in result.errors[0].message
+    assert [c["function"] for c in upstream.calls] == ["REALTIME_BULK_QUOTES"]
+
+
+def test_quotes_without_bulk_access_keep_to_the_batch_concurrency(
+    fake_upstream, graphql_context
+):
+    def respond(params: dict[str, str]) -> dict:
+        if params["function"] == "REALTIME_BULK_QUOTES":
+            return {"Information": "This is a premium endpoint."}
+        row = {"symbol": params["symbol"], "close": "1.5", "timestamp": "2024-03-01"}
+        return {"Global Quote": as_global_quote(row)}
+
+    upstream = fake_upstream(respond)
+    quotes = " ".join(
+        f'q{i}: globalQuote(symbol: "F{i}") {{ price }}' for i in range(30)
+    )
+    query = f"{{ getFundementalData {{ {quotes} }} }}"
+    free = graphql_context({"ALPHAVANTAGE_API_KEY": "free"})
+    result = asyncio.run(schema.execute(query, context_value=free))
+    assert not result.errors, result.errors
+    functions = [c["function"] for c in upstream.calls]
+    assert functions.count("GLOBAL_QUOTE") == 30
+    assert upstream.peak == CONCURRENCY
@@ -0,0 +1,87 @@
+import asyncio
+
+from ..app import schema
+
+DEBUG_PLAN = {"X-Debug-Plan": "1"}
+
+
+def bars(count: int) -> dict[str, dict[str, str]]:
+    return {
+        f"2024-01-{31 - i:02d}": {
+            "1. open": str(i),
+            "2. high": str(i),
+            "3. low": str(i),
+            "4. close": str(i),
+            "5. volume": "1",
+        }
+        for i in range(count)
+    }
+
+
+def test_compact_daily_fields_are_sliced_from_the_full_series(
+    fake_upstream, graphql_context
+):
+    upstream = fake_upstream(
+        lambda params: {
+            "Meta Data": {"2. Symbol": "PLAN", "4. Output Size": "Full size"},
+            "Time Series (Daily)": bars(30 if params["outputsize"] == "full" else 3),
+        },
+    )
+    query = """query ($s: String!) { getTimeSeries {
+        a: daily(symbol: $s) { columns { date } }
+        ...Full
+    } }
+    fragment Full on TimeSeries {
+        b: daily(symbol: $s, outputsize: "full") { columns { close } }
+    }"""
+    result = asyncio.run(
+        schema.execute(
+            query,
+            variable_values={"s": "PLAN"},
+            context_value=graphql_context(DEBUG_PLAN),
+        )
+    )
+    assert not result.errors, result.errors
+    assert [c["outputsize"] for c in upstream.calls] == ["full"]
+    data = result.data["getTimeSeries"]
+    assert len(data["a"]["columns"]["date"]) == 30
+    assert len(data["b"]["columns"]["close"]) == 30
+    report = result.extensions["queryPlan"]
+    assert report["requests"] == 2
+    assert report["calls"] == [
+        {
+            "params": {
+                "function": "TIME_SERIES_DAILY",
+                "outputsize": "full",
+                "symbol": "PLAN",
+            },
+            "fields": ["getTimeSeries.a", "getTimeSeries.b"],
+            "serves": [
+                {
+                    "function": "TIME_SERIES_DAILY",
+                    "outputsize": "compact",
+                    "symbol": "PLAN",
+                }
+            ],
+        }
+    ]
+    assert report["unplanned"] == []
+
+
+def test_quotes_are_served_from_a_bulk_chunk_of_the_document(
+    fake_upstream, graphql_context
+):
+    row = {"symbol": "MSFT", "close": "410.5", "timestamp": "2024-03-01 16:00:00"}
+    upstream = fake_upstream(lambda params: {"data": [row]})
+    query = """{ getFundementalData {
+        globalQuote(symbol: "msft") { symbol price }
+        globalQuoteBatch(symbols: ["MSFT", "PLANQ"]) { symbol result { price } }
+    } }"""
+    result = asyncio.run(
+        schema.execute(query, context_value=graphql_context(DEBUG_PLAN))
+    )
+    assert not result.errors, result.errors
+    assert [c["function"] for c in upstream.calls] == ["REALTIME_BULK_QUOTES"]
+    data = result.data["getFundementalData"]
+    assert data["globalQuote"] == {"symbol": "MSFT", "price": "410.5"}
+    assert data["globalQuoteBatch"][0]["result"] == {"price": "410.5"}
@@ -0,0 +1,64 @@
+import asyncio
+from graphql import parse, validate
+from .. import prefetch
+from ..prefetch import PREFETCH_QUERIES, Prefetcher
+
+
+class RecordingSchema:
+    def __init__(self):
+        self.executed = []
+
+    async def execute(self, query, variable_values, context_value):
+        headers = context_value.request.headers
+        self.executed.append(
+            (
+                query,
+                variable_values["symbol"],
+                headers["ALPHAVANTAGE_API_KEY"],
+                prefetch.lane.get(),
+            )
+        )
+
+        class Result:
+            errors = None
+
+        return Result()
+
+
+def test_round_warms_each_resolver_for_each_symbol(monkeypatch, unlimited_scheduler):
+    monkeypatch.setattr(prefetch, "scheduler", unlimited_scheduler)
+    schema = RecordingSchema()
+    prefetcher = Prefetcher(
+        schema, symbols=["IBM", "AAPL"], key="k", resolvers=["daily", "ema"]
+    )
+
+    async def main():
+        prefetcher.start()
+        for _ in range(100):
+            if prefetcher.rounds:
+                break
+            await asyncio.sleep(0)
+        await prefetcher.stop()
+
+    asyncio.run(main())
+    assert [(s, q) for q, s, _, _ in schema.executed] == [
+        ("IBM", PREFETCH_QUERIES["daily"]),
+        ("IBM", PREFETCH_QUERIES["ema"]),
+        ("AAPL", PREFETCH_QUERIES["daily"]),
+        ("AAPL", PREFETCH_QUERIES["ema"]),
+    ]
+    assert {(key, name) for _, _, key, name in schema.executed} == {("k", "background")}
+    stats = prefetcher.stats()
+    assert stats["progress"] == "4/4" and stats["state"] == "idle"
+
+
+def test_disabled_without_watchlist():
+    prefetcher = Prefetcher(RecordingSchema(), symbols=[], key="k")
+    assert not prefetcher.enabled
+
+
+def test_queries_are_valid_against_the_schema():
+    from ..app import schema
+
+    for query in PREFETCH_QUERIES.values():
+        assert not validate(schema._schema, parse(query))
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from .. import quotes
+from ..pydantic_schemas import GlobalQuoteSchema
+from ..quotes import BulkQuoteError, BulkQuotes
+
+
+def bulk_row(symbol: str) -> dict:
+    return {
+        "symbol": symbol,
+        "timestamp": "2024-03-01 16:00:00.000",
+        "open": "1.0",
+        "high": "2.0",
+        "low": "0.5",
+        "close": "1.5",
+        "volume": "100",
+        "previous_close": "1.0",
+        "change": "0.5",
+        "change_percent": "50.0",
+    }
+
+
+def test_symbols_are_fetched_in_sorted_chunks_as_global_quotes():
+    requested = []
+
+    async def fetch(params):
+        requested.append(params["symbol"])
+        return {
+            "data": [bulk_row(s) for s in params["symbol"].split(",") if s != "ZZZ"]
+        }
+
+    rows = asyncio.run(
+        BulkQuotes(chunk_size=2).rows(
+            "k", ["msft", "AAPL", "ZZZ", "IBM", "MSFT"], fetch
+        )
+    )
+    assert requested == ["AAPL,IBM", "MSFT,ZZZ"]
+    assert sorted(rows) == ["AAPL", "IBM", "MSFT"]
+    quote = GlobalQuoteSchema.model_validate(rows["MSFT"])
+    assert (quote.price, quote.latest_trading_day, quote.change_percent) == (
+        "1.5",
+        "2024-03-01",
+        "50.0%",
+    )
+
+
+def test_keys_without_bulk_access_fall_back_and_are_remembered():
+    calls = 0
+
+    async def fetch(_):
+        nonlocal calls
+        calls += 1
+        return {"Information": "This is a premium endpoint."}
+
+    bulk = BulkQuotes()
+    assert asyncio.run(bulk.rows("free", ["IBM"], fetch)) is None
+    assert asyncio.run(bulk.rows("free", ["IBM"], fetch)) is None
+    assert calls == 1
+    assert bulk.stats()["fallbacks"] == 2
+    assert bulk.allowed("premium")
+
+
+def test_rate_limited_keys_keep_bulk_access(monkeypatch, unlimited_scheduler):
+    throttled = []
+    monkeypatch.setattr(unlimited_scheduler, "throttled", throttled.append)
+    monkeypatch.setattr(quotes, "scheduler", unlimited_scheduler)
+    calls = 0
+
+    async def fetch(_):
+        nonlocal calls
+        calls += 1
+        return {
+            "Information": "Our standard API rate limit is 25 requests per day. "
+            "Please subscribe to any of the premium plans to remove it."
+        }
+
+    bulk = BulkQuotes()
+    with pytest.raises(BulkQuoteError, match="rate limit"):
+        asyncio.run(bulk.rows("k", ["IBM", "MSFT"], fetch))
+    assert calls == 1
+    assert throttled == ["k"]
+    assert bulk.allowed("k")
+    assert bulk.stats()["failures"] == 1
+    assert bulk.stats()["fallbacks"] == 0
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+from ..resample import DAILY_KEY, RESAMPLED, Resampler, buckets, resample
+from ..series import SeriesFrame
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "resample").glob("*.json"))
+RECORDED = [pytest.param(path, id=path.stem) for path in FIXTURES] or [
+    pytest.param(None, id="unrecorded")
+]
+
+
+def bar(price: float, volume: int, dividend: float = 0.0) -> dict[str, str]:
+    return {
+        "1. open": f"{price:.4f}",
+        "2. high": f"{price + 1:.4f}",
+        "3. low": f"{price - 1:.4f}",
+        "4. close": f"{price + 0.5:.4f}",
+        "5. adjusted close": f"{price / 2:.4f}",
+        "6. volume": str(volume),
+        "7. dividend amount": f"{dividend:.4f}",
+        "8. split coefficient": "1.0",
+    }
+
+
+# ? Good Friday 2024-03-29 closes the market, so that week ends on the Thursday; the
+# ? week of 2024-04-01 is still running.
+DAILY = {
+    "2024-04-02": bar(14, 10),
+    "2024-04-01": bar(13, 10),
+    "2024-03-28": bar(12, 10, 0.5),
+    "2024-03-27": bar(11, 10),
+    "2024-03-26": bar(10, 10),
+    "2024-03-25": bar(9, 10),
+    "2024-03-22": bar(8, 1),
+    "2024-03-21": bar(7, 2, 0.25),
+}
+
+
+def test_weeks_end_on_their_last_trading_day():
+    weekly = resample(SeriesFrame(DAILY), "weekly", True)
+    assert list(weekly) == ["2024-04-02", "2024-03-28", "2024-03-22"]
+    assert weekly["2024-03-28"] == {
+        "1. open": "9.0000",
+        "2. high": "13.0000",
+        "3. low": "8.0000",
+        "4. close": "12.5000",
+        "5. adjusted close": "6.0000",
+        "6. volume": "40",
+        "7. dividend amount": "0.5000",
+    }
+    assert weekly["2024-03-22"]["7. dividend amount"] == "0.2500"
+
+
+def test_buckets_follow_the_calendar():
+    days = [date(1999, 12, 1) + timedelta(days=i) for i in range(365 * 30)]
+    weeks = buckets([day.isoformat() for day in days], "weekly")
+    months = buckets([day.isoformat() for day in days], "monthly")
+    # ? A week is named after its Friday, counting Saturday as the first day.
+    fridays = [day + timedelta(days=(4 - day.weekday()) % 7) for day in days]
+    for i in range(1, len(days)):
+        assert (weeks[i] != weeks[i - 1]) == (fridays[i] != fridays[i - 1]), days[i]
+        assert (months[i] != months[i - 1]) == (days[i].day == 1), days[i]
+
+
+def test_months_and_the_unadjusted_layout():
+    monthly = resample(SeriesFrame(DAILY), "monthly", False)
+    assert list(monthly) == ["2024-04-02", "2024-03-28"]
+    assert monthly["2024-03-28"] == {
+        "1. open": "7.0000",
+        "2. high": "13.0000",
+        "3. low": "6.0000",
+        "4. close": "12.5000",
+        "5. volume": "43",
+    }
+
+
+def test_served_only_from_a_fresh_history():
+    history = {"Meta Data": {"2. Symbol": "IBM"}, DAILY_KEY: DAILY}
+    looked_up = []
+
+    async def daily(params):
+        looked_up.append(params["function"])
+        return history if params["function"].endswith("ADJUSTED") else None
+
+    resampler = Resampler(enabled=True)
+    weekly = {"apikey": "k", "function": "TIME_SERIES_WEEKLY", "symbol": "IBM"}
+    first = asyncio.run(resampler.serve(weekly, daily))
+    assert looked_up == ["TIME_SERIES_DAILY", "TIME_SERIES_DAILY_ADJUSTED"]
+    assert list(first) == ["Meta Data", "Weekly Time Series"]
+    assert asyncio.run(resampler.serve(weekly, daily)) is first
+
+    async def stale(_):
+        return None
+
+    assert asyncio.run(resampler.serve(weekly, stale)) is None
+    assert resampler.stats()["misses"] == 1
+
+
+@pytest.mark.parametrize("path", RECORDED)
+def test_parity_with_recorded_upstream_responses(path):
+    """Fixtures are recorded with `benchmarks/record_resample.py`."""
+    if path is None:
+        message = (
+            "No upstream recordings in tests/fixtures/resample; record them with "
+            "benchmarks/record_resample.py"
+        )
+        if os.getenv("AV_REQUIRE_RECORDINGS"):
+            pytest.fail(message)
+        pytest.skip(message)
+    recording = json.loads(path.read_text())
+    assert any(RESAMPLED[function][1] for function in recording["resampled"])
+    frame = SeriesFrame(recording["daily"][DAILY_KEY])
+    for function, response in recording["resampled"].items():
+        period, adjusted, series_key, _ = RESAMPLED[function]
+        ours = resample(frame, period, adjusted)
+        theirs = response[series_key]
+        # ? The oldest period may have started before the daily history did.
+        dates = sorted(set(ours) & set(theirs), reverse=True)[:-1]
+        assert len(dates) > 10, function
+        if period == "weekly":
+            # ? Past the current week, some week must have ended before its Friday.
+            assert any(date.fromisoformat(d).weekday() != 4 for d in dates[1:])
+        for day in dates:
+            assert set(ours[day]) == set(theirs[day]), (function, day)
+            for name, value in theirs[day].items():
+                assert float(ours[day][name]) == pytest.approx(
+                    float(value), abs=1e-4
+                ), (function, day, name)
@@ -0,0 +1,112 @@
+import asyncio
+import pytest
+from ..scheduler import QuotaExceeded, Scheduler, Tier, client_id, key_id, lane
+
+
+def make_scheduler(tier: Tier) -> Scheduler:
+    return Scheduler(tiers={"test": tier}, key_tiers={}, default_tier="test")
+
+
+def test_daily_quota_is_enforced():
+    scheduler = make_scheduler(Tier(per_minute=0, per_day=2))
+
+    async def main():
+        await scheduler.acquire("key")
+        await scheduler.acquire("key")
+        with pytest.raises(QuotaExceeded):
+            await scheduler.acquire("key")
+
+    asyncio.run(main())
+    assert scheduler.stats()[key_id("key")]["used_today"] == 2
+
+
+def test_keys_without_a_configured_tier_are_not_throttled(monkeypatch):
+    monkeypatch.delenv("AV_DEFAULT_TIER", raising=False)
+    scheduler = Scheduler(key_tiers={"capped": "free"})
+
+    async def main():
+        for _ in range(30):
+            await scheduler.acquire("premium")
+        for _ in range(5):
+            await scheduler.acquire("capped")
+
+    asyncio.run(main())
+    assert scheduler.spare("premium") == float("inf")
+    assert scheduler.spare("capped") < 1
+
+
+def test_queue_is_fair_between_clients_and_lanes():
+    scheduler = make_scheduler(Tier(per_minute=6000, per_day=0))
+    order = []
+
+    async def call(client: str, name: str, tag: str):
+        client_id.set(client)
+        lane.set(name)
+        await scheduler.acquire("key")
+        order.append(tag)
+
+    async def main():
+        scheduler.throttled("key")
+        tasks = [asyncio.create_task(call("batch", "background", "bg"))]
+        tasks += [
+            asyncio.create_task(call("a", "interactive", f"a{i}")) for i in range(3)
+        ]
+        tasks += [asyncio.create_task(call("b", "interactive", "b0"))]
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert order == ["a0", "b0", "a1", "a2", "bg"]
+    stats = scheduler.stats()[key_id("key")]
+    assert stats["waits"] == 5
+    assert stats["queue_depth"] == {"interactive": 0, "background": 0}
+
+
+def test_spare_quota_keeps_a_reserve_for_interactive_calls():
+    per_minute = make_scheduler(Tier(per_minute=10, per_day=0))
+    per_day = make_scheduler(Tier(per_minute=0, per_day=12))
+
+    async def main():
+        assert per_minute.spare("key", reserve=0.5) == 5
+        for _ in range(4):
+            await per_minute.acquire("key")
+            await per_day.acquire("key")
+        assert per_minute.spare("key", reserve=0.5) == pytest.approx(1, abs=0.01)
+        assert per_minute.spare("key") == pytest.approx(6, abs=0.01)
+        assert per_day.spare("key", reserve=0.5) == 2
+
+    asyncio.run(main())
+
+
+def test_unknown_tiers_fail_at_startup():
+    with pytest.raises(ValueError, match="premium57"):
+        Scheduler(
+            tiers={"free": Tier(5, 25)},
+            key_tiers={"k": "premium57"},
+            default_tier="free",
+        )
+    with pytest.raises(ValueError, match="fre\\b"):
+        Scheduler(tiers={"free": Tier(5, 25)}, key_tiers={}, default_tier="fre")
+
+
+def test_idle_keys_are_forgotten_and_stats_keep_keys_apart():
+    scheduler = Scheduler(
+        tiers={"free": Tier(0, 25), "open": Tier(0, 0)},
+        key_tiers={"capped-1234": "free"},
+        default_tier="open",
+        max_keys=2,
+    )
+
+    async def main():
+        await scheduler.acquire("capped-1234")
+        for i in range(5):
+            await scheduler.acquire(f"key{i}-1234")
+
+    asyncio.run(main())
+    stats = scheduler.stats()
+    assert len(stats) < 6
+    # ? Forgetting a key that spent daily quota would hand the quota back.
+    assert stats[key_id("capped-1234")]["used_today"] == 1
+    scheduler = make_scheduler(Tier(0, 0))
+    scheduler.spare("a-1234")
+    scheduler.spare("b-1234")
+    assert sorted(scheduler.stats()) == sorted([key_id("a-1234"), key_id("b-1234")])
@@ -0,0 +1,10 @@
+from pathlib import Path
+
+from ..app import schema
+
+
+def test_exported_schema_is_up_to_date():
+    exported = Path(__file__).parent.parent / "schema.graphql"
+    assert (
+        exported.read_text(encoding="utf-8") == schema.as_str()
+    ), "schema.graphql is stale; regenerate it with schema.as_str()"
@@ -0,0 +1,75 @@
+import numpy as np
+from ..series import SeriesFrame, Window, parse_column, to_list
+from ..strawberry_interfaces import TimeSeriesAdjustedColumns, TimeSeriesColumns
+
+BARS = {
+    "2024-03-01": {"1. open": "10.5", "4. close": "11", "5. volume": "100"},
+    "2024-02-29": {"1. open": "9.25", "4. close": "10.5", "5. volume": "200"},
+}
+
+
+def test_columns_follow_the_order_of_the_bars():
+    frame = SeriesFrame(BARS)
+    columns = TimeSeriesColumns(frame=frame)
+    assert columns.date() == ["2024-03-01", "2024-02-29"]
+    assert columns.open() == [10.5, 9.25]
+    assert columns.close() == [11.0, 10.5]
+    assert frame.column("5. volume").dtype == np.int64
+    assert frame.column("1. open") is frame.column("1. open")
+
+
+def test_adjusted_columns_read_the_adjusted_layout():
+    bars = {"2024-03-01": {"5. adjusted close": "5.5", "6. volume": "7"}}
+    columns = TimeSeriesAdjustedColumns(frame=SeriesFrame(bars))
+    assert columns.adjusted_close() == [5.5]
+    assert columns.volume() == [7.0]
+
+
+def test_gaps_are_parsed_as_nan_and_served_as_null():
+    values = parse_column(["1.5", "None", None, "-", "."])
+    assert values.dtype == np.float64
+    assert to_list(values) == [1.5, None, None, None, None]
+    assert parse_column(["10", "20"], np.int64).dtype == np.int64
+    assert parse_column(["10", "None"], np.int64).dtype == np.float64
+
+
+def test_frames_are_reused_for_the_same_payload():
+    assert SeriesFrame.of(BARS) is SeriesFrame.of(BARS)
+    assert SeriesFrame.of(BARS) is not SeriesFrame.of(dict(BARS))
+
+
+DAYS = {f"2024-01-{day:02d}": {"4. close": str(day)} for day in range(10, 0, -1)}
+
+
+def test_window_selects_a_date_range_newest_first():
+    frame = SeriesFrame(DAYS).window(Window(start="2024-01-03", end="2024-01-05"))
+    assert frame.dates == ["2024-01-05", "2024-01-04", "2024-01-03"]
+    assert frame.values("4. close") == [5.0, 4.0, 3.0]
+    assert frame.next_cursor is None
+    assert len(SeriesFrame(DAYS).window(Window(start="2024-02-01"))) == 0
+
+
+def test_window_pages_with_limit_and_cursor():
+    frame = SeriesFrame(DAYS)
+    frame.column("4. close")
+    first = frame.window(Window(start="2024-01-02", limit=4))
+    assert first.dates == ["2024-01-10", "2024-01-09", "2024-01-08", "2024-01-07"]
+    assert first.next_cursor == "2024-01-07"
+    pages = [first.dates]
+    while first.next_cursor:
+        first = frame.window(
+            Window(start="2024-01-02", limit=4, after=first.next_cursor)
+        )
+        pages.append(first.dates)
+    assert [len(page) for page in pages] == [4, 4, 1]
+    assert first.values("4. close") == [2.0]
+
+
+def test_window_end_covers_the_intraday_bars_of_the_day():
+    bars = {
+        "2024-01-02 10:00:00": {},
+        "2024-01-01 16:00:00": {},
+        "2024-01-01 09:30:00": {},
+    }
+    frame = SeriesFrame(bars).window(Window(end="2024-01-01"))
+    assert frame.dates == ["2024-01-01 16:00:00", "2024-01-01 09:30:00"]
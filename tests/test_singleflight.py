@@ -0,0 +1,38 @@
+import asyncio
+from ..singleflight import SingleFlight
+
+
+def test_concurrent_calls_are_coalesced():
+    flights = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"Global Quote": {"01. symbol": "AAPL"}}
+
+    async def main():
+        return await asyncio.gather(*(flights.do(("AAPL",), fetch) for _ in range(50)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flights.stats() == {"issued": 1, "coalesced": 49, "in_flight": 0}
+
+
+def test_errors_are_shared_and_not_cached():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise ValueError("rate limit")
+
+    async def main():
+        return await asyncio.gather(
+            *(flights.do("k", fail) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ValueError) for r in results)
+    asyncio.run(main())
+    assert flights.stats()["issued"] == 2
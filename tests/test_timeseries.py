@@ -1,3 +1,4 @@
+import asyncio
 from ..app import Query
 import strawberry
 from typing import Literal
@@ -18,7 +19,7 @@ def test_intraday():
         }
     }
     """
-    result = schema.execute_sync(q)
+    result = asyncio.run(schema.execute(q))
     assert not result.errors
     assert result.data.get("getTimeSeries") is not None
     assert result.data.get("getTimeSeries").get("intraday") is not None
@@ -37,7 +38,7 @@ def test_daily():
         }
     }
     """
-    result = schema.execute_sync(q)
+    result = asyncio.run(schema.execute(q))
     assert not result.errors
     assert result.data.get("getTimeSeries") is not None
     assert result.data.get("getTimeSeries").get("daily") is not None
@@ -56,7 +57,7 @@ def test_weekly():
         }
     }
     """
-    result = schema.execute_sync(q)
+    result = asyncio.run(schema.execute(q))
     assert not result.errors
     assert result.data.get("getTimeSeries") is not None
     assert result.data.get("getTimeSeries").get("weekly") is not None
@@ -75,7 +76,7 @@ def test_monthly():
         }
     }
     """
-    result = schema.execute_sync(q)
+    result = asyncio.run(schema.execute(q))
     assert not result.errors
     assert result.data.get("getTimeSeries") is not None
     assert result.data.get("getTimeSeries").get("monthly") is not None
@@ -0,0 +1,67 @@
+import asyncio
+import time
+import aiohttp
+import pytest
+from .. import upstream
+from ..cache import Entry, ResponseCache, cache_key
+
+QUOTE = {"function": "GLOBAL_QUOTE", "symbol": "IBM", "apikey": "a"}
+OLD = {"Global Quote": {"05. price": "100.0"}}
+NEW = {"Global Quote": {"05. price": "101.0"}}
+
+
+@pytest.fixture
+def stale_cache(monkeypatch, unlimited_scheduler):
+    """A cache holding an entry of `QUOTE` fetched 100s ago that expired 40s ago."""
+
+    def make(**kwargs) -> ResponseCache:
+        cache = ResponseCache(ttls={"GLOBAL_QUOTE": 60}, **kwargs)
+        now = time.time()
+        cache.memory.set(
+            cache_key(QUOTE),
+            Entry(OLD, stored_at=now - 100, expires_at=now - 40, size=1),
+        )
+        monkeypatch.setattr(upstream, "cache", cache)
+        monkeypatch.setattr(upstream, "scheduler", unlimited_scheduler)
+        return cache
+
+    return make
+
+
+def test_stale_entry_is_served_while_revalidated(stale_cache, monkeypatch):
+    cache = stale_cache(max_stale=300, stale_if_error=0)
+    calls = []
+
+    async def get_json(params):
+        calls.append(params["symbol"])
+        return NEW
+
+    monkeypatch.setattr(upstream.client, "get_json", get_json)
+
+    async def main():
+        age = upstream.DataAge()
+        upstream.data_age.set(age)
+        first = await upstream.fetch_json(QUOTE)
+        await asyncio.gather(*upstream._revalidations)
+        return age, first, await upstream.fetch_json(QUOTE)
+
+    age, first, second = asyncio.run(main())
+    assert first is OLD and second is NEW
+    assert calls == ["IBM"]
+    assert age.stale and 99 < age.seconds < 110
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_stale_entry_is_served_when_upstream_fails(stale_cache, monkeypatch):
+    cache = stale_cache(max_stale=0, stale_if_error=3600)
+
+    async def get_json(params):
+        raise aiohttp.ClientConnectionError("upstream down")
+
+    monkeypatch.setattr(upstream.client, "get_json", get_json)
+    assert asyncio.run(upstream.fetch_json(QUOTE)) is OLD
+    assert cache.stats()["stale_fallbacks"] == 1
+
+    cache.stale_if_error = 10
+    with pytest.raises(aiohttp.ClientConnectionError):
+        asyncio.run(upstream.fetch_json(QUOTE))
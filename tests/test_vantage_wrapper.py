@@ -0,0 +1,39 @@
+import asyncio
+import threading
+
+from ..vantage_wrapper import ClientPool, LibraryThreads
+
+
+def test_pool_reuses_clients_per_key():
+    pool = ClientPool(max_size=2)
+    first = pool.get("key-a")
+    assert pool.get("key-a") is first
+    assert pool.get("key-b") is not first
+    stats = pool.stats()
+    assert stats["sets_constructed"] == 2
+    assert stats["clients_saved"] == ClientPool.CLIENTS_PER_SET
+
+
+def test_pool_evicts_least_recently_used():
+    pool = ClientPool(max_size=2)
+    a = pool.get("key-a")
+    pool.get("key-b")
+    pool.get("key-a")
+    pool.get("key-c")
+    assert pool.stats()["evictions"] == 1
+    assert pool.get("key-a") is a
+    assert pool.stats()["sets_constructed"] == 3
+
+
+def test_library_calls_run_side_by_side_up_to_the_pool_size():
+    threads = LibraryThreads(max_size=20)
+    # ? Every call waits for all the others, so the barrier breaks unless the 20 run at once.
+    barrier = threading.Barrier(20, timeout=5)
+
+    async def siblings() -> list[int]:
+        return await asyncio.gather(*(threads.run(barrier.wait) for _ in range(20)))
+
+    assert sorted(asyncio.run(siblings())) == list(range(20))
+    assert threads.stats()["peak_in_flight"] == 20
+    assert threads.stats()["in_flight"] == 0
+    threads.shutdown()
@@ -0,0 +1,207 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Mapping
+
+import aiohttp
+
+from adjusted import AdjustedSharing
+from cache import Entry, ResponseCache
+from history import HistoryStore
+from http_client import client
+from intraday import IntradayAggregator
+from notices import is_notice, is_rate_limited
+from resample import Resampler
+from scheduler import QuotaExceeded, Scheduler, lane
+from singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from planner import QueryPlan
+
+type Params = dict[str, str]
+# ? Fetches one normalized request: `fetch_json`, or a step of its pipeline.
+type Fetch = Callable[[Mapping[str, str]], Awaitable[dict]]
+
+cache = ResponseCache()
+history = HistoryStore(backend=cache.backend)
+flights = SingleFlight()
+adjusted = AdjustedSharing()
+resampler = Resampler()
+aggregator = IntradayAggregator()
+scheduler = Scheduler()
+
+_UPSTREAM_ERRORS = (QuotaExceeded, aiohttp.ClientError, asyncio.TimeoutError)
+_revalidations: set[asyncio.Task] = set()
+
+
+@dataclass
+class DataAge:
+    """Age of the oldest upstream response an operation was served from."""
+
+    seconds: float = 0.0
+    stale: bool = False
+    responses: int = 0
+
+    def observe(self, seconds: float, stale: bool) -> None:
+        self.responses += 1
+        self.seconds = max(self.seconds, seconds)
+        self.stale = self.stale or stale
+
+
+data_age: ContextVar[DataAge | None] = ContextVar("data_age", default=None)
+query_plan: ContextVar["QueryPlan | None"] = ContextVar("query_plan", default=None)
+
+
+def _observe(entry: Entry | None) -> None:
+    """Records the age of the response being served (`None` for a fresh call)."""
+    age = data_age.get()
+    if age is not None:
+        now = time.time()
+        if entry is None:
+            age.observe(0.0, False)
+        else:
+            age.observe(now - entry.stored_at, entry.expires_at <= now)
+
+
+def normalize_params(params: Mapping[str, Any]) -> Params:
+    """Builds the query string parameters of an upstream call.
+
+    `None` values and the default `datatype=json` are dropped and everything else is
+    stringified, so the same logical request always produces the same parameters no
+    matter which resolver (or the `alpha_vantage` library) built it.
+
+    Args:
+        params (Mapping[str, Any]): The raw parameters.
+
+    Returns:
+        Params: The normalized parameters, sorted by name.
+    """
+    return {
+        k: str(v)
+        for k, v in sorted(params.items())
+        if v is not None and not (k == "datatype" and v == "json")
+    }
+
+
+async def _call(params: Params) -> dict:
+    """Issues one upstream call once the API key's quota allows it."""
+    key = params.get("apikey", "")
+    await scheduler.acquire(key)
+    response = await client.get_json(params)
+    if is_rate_limited(response):
+        scheduler.throttled(key)
+    if not history.handles(params) and not is_notice(response):
+        # ? Full daily histories are kept by the history store instead.
+        await cache.set(params, response)
+    return response
+
+
+async def _revalidate(params: Params) -> None:
+    """Refreshes a stale entry in the background lane, ignoring upstream errors."""
+    lane.set("background")
+    try:
+        await flights.do(tuple(params.items()), lambda: _call(params))
+    except _UPSTREAM_ERRORS:
+        pass
+
+
+async def _fetch(params: Params) -> dict:
+    """Serves one normalized request from the cache or a single upstream call.
+
+    Entries up to `cache.max_stale` seconds past expiry are served at once while a
+    background task refreshes them. When the upstream call fails, is rate limited or
+    the quota is spent, entries up to `cache.stale_if_error` seconds past expiry are
+    served instead.
+    """
+    if history.handles(params):
+        response = await flights.do(tuple(params.items()), lambda: _call(params))
+        _observe(None)
+        return response
+    entry = await cache.lookup(params)
+    if entry is not None:
+        overdue = time.time() - entry.expires_at
+        if overdue < 0:
+            _observe(entry)
+            return entry.payload
+        if overdue <= cache.max_stale:
+            task = asyncio.create_task(_revalidate(params))
+            _revalidations.add(task)
+            task.add_done_callback(_revalidations.discard)
+            _observe(entry)
+            return entry.payload
+        if overdue > cache.stale_if_error:
+            entry = None
+    try:
+        response = await flights.do(tuple(params.items()), lambda: _call(params))
+    except _UPSTREAM_ERRORS:
+        if entry is None:
+            raise
+        response = None
+    if entry is not None and (response is None or is_rate_limited(response)):
+        cache.stale_fallbacks += 1
+        _observe(entry)
+        return entry.payload
+    _observe(None)
+    return response
+
+
+async def _fresh_daily(params: Params) -> dict | None:
+    """The stored full daily history of `params`, if it was checked within the TTL."""
+    return await history.fresh(params, cache.ttl(params["function"]))
+
+
+async def _serve(params: Params) -> dict:
+    """Serves one normalized request from the history store or `_fetch`."""
+    if history.handles(params):
+        return await flights.do(
+            ("history", *params.items()),
+            lambda: history.full(params, _fetch),
+        )
+    return await _fetch(params)
+
+
+async def fetch_json(params: Mapping[str, Any]) -> dict:
+    """Fetches one Alpha Vantage response through the shared upstream client.
+
+    Fresh responses are served from the response cache (see `cache.ResponseCache`),
+    and `outputsize=full` daily series from the incrementally refreshed history store
+    (see `history.HistoryStore`). On a miss, identical calls in flight at the same
+    time (same normalized parameters, API key included) share a single upstream
+    request, which waits for a token of the key's quota (see `scheduler.Scheduler`).
+    Expired entries may be served while they are refreshed, or when the upstream
+    fails; the age of the data served is recorded in `data_age`. With
+    `AV_SHARE_ADJUSTED`, unadjusted daily, weekly and monthly series are derived from
+    their adjusted responses (see `adjusted.AdjustedSharing`), and weekly and monthly
+    series are resampled from a fresh daily history when there is one (see
+    `resample.Resampler`). Intraday intervals are aggregated from one series of the
+    finest interval (see `intraday.IntradayAggregator`). Within a planned operation,
+    each request is served once and may be derived from a broader one (see
+    `planner.QueryPlan`). The returned dict may be shared between callers and must not
+    be mutated.
+
+    Args:
+        params (Mapping[str, Any]): The query string parameters, including `apikey`.
+
+    Returns:
+        dict: The decoded response.
+    """
+    normalized = normalize_params(params)
+    operation = query_plan.get()
+    if operation is not None:
+        return await operation.fetch(normalized, _resolve)
+    return await _resolve(normalized)
+
+
+async def _resolve(normalized: Params) -> dict:
+    """Serves one normalized request through the derivations and `_serve`."""
+    if resampler.handles(normalized):
+        resampled = await resampler.serve(normalized, _fresh_daily)
+        if resampled is not None:
+            _observe(None)
+            return resampled
+    if aggregator.handles(normalized):
+        return await aggregator.serve(normalized, _serve)
+    if adjusted.handles(normalized):
+        return await adjusted.serve(normalized, _serve)
+    return await _serve(normalized)
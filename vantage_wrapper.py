@@ -1,7 +1,15 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+from functools import partial
 from os import getenv
 from typing import (
+    Callable,
     Tuple,
 )
+from urllib.parse import parse_qsl, urlsplit
 
 from dotenv import load_dotenv
 from strawberry.types.info import Info as _Info, RootValueType
@@ -11,16 +19,221 @@ from alpha_vantage.techindicators import TechIndicators
 from alpha_vantage.fundamentaldata import FundamentalData
 from alpha_vantage.cryptocurrencies import CryptoCurrencies
 from alpha_vantage.alphavantage import AlphaVantage
-
+from upstream import fetch_json
 
 load_dotenv()
 
 type ReturnTuple = Tuple[str | None, str | None, str | None]
 type Info = _Info[GraphQLContext, RootValueType]
 
+_loop: ContextVar[asyncio.AbstractEventLoop] = ContextVar("_loop")
+
+
+class _UpstreamBridge:
+    """Routes the `alpha_vantage` library's HTTP calls through the shared async client.
+
+    The library is synchronous, so its calls run on a worker thread (see `Vantage.call`);
+    the request itself is handed back to the event loop that owns the connection pool.
+    """
+
+    treat_info_as_error: bool
+
+    def _handle_api_call(self, url: str) -> dict:
+        """Replaces the library's `requests.get` with a call on the pooled client.
+
+        Args:
+            url (str): The URL built by the library.
+
+        Raises:
+            ValueError: If Alpha Vantage returns an empty response or an error message.
+
+        Returns:
+            dict: The decoded response.
+        """
+        params = dict(parse_qsl(urlsplit(url).query))
+        json_response: dict = asyncio.run_coroutine_threadsafe(
+            fetch_json(params), _loop.get()
+        ).result()
+        if not json_response:
+            raise ValueError("Error getting data from the api, no return was given.")
+        if "Error Message" in json_response:
+            raise ValueError(json_response["Error Message"])
+        if "Information" in json_response and self.treat_info_as_error:
+            raise ValueError(json_response["Information"])
+        if "Note" in json_response and self.treat_info_as_error:
+            raise ValueError(json_response["Note"])
+        return json_response
+
+
+class _TimeSeries(_UpstreamBridge, TimeSeries):
+    pass
+
+
+class _TechIndicators(_UpstreamBridge, TechIndicators):
+    pass
+
+
+class _FundamentalData(_UpstreamBridge, FundamentalData):
+    pass
+
+
+class _CryptoCurrencies(_UpstreamBridge, CryptoCurrencies):
+    pass
+
+
+class _AlphaVantage(_UpstreamBridge, AlphaVantage):
+    pass
+
+
+class ClientSet:
+    """The five long-lived library clients bound to one API key.
+
+    Args:
+        key (str): The Alpha Vantage API key.
+    """
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self.time_series = _TimeSeries(key=key)
+        self.tech_indicators = _TechIndicators(key=key)
+        self.fundamental_data = _FundamentalData(key=key)
+        self.crypto_currencies = _CryptoCurrencies(key=key)
+        self.alpha_vantage = _AlphaVantage(key=key)
+
+
+class ClientPool:
+    """Bounded, LRU-evicted pool of `ClientSet`s keyed by API key.
+
+    Lookups take a lock, so the pool is safe to share between the event loop and the
+    worker threads that run library calls.
+
+    Args:
+        max_size (int | None, optional): The number of API keys kept. Defaults to
+            `AV_CLIENT_POOL_SIZE` or 64.
+    """
+
+    CLIENTS_PER_SET = 5
+
+    def __init__(self, max_size: int | None = None) -> None:
+        self.max_size = max_size or int(getenv("AV_CLIENT_POOL_SIZE", "64"))
+        self._sets: OrderedDict[str, ClientSet] = OrderedDict()
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.constructed = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> ClientSet:
+        """Returns the client set of `key`, building it on first use.
+
+        Args:
+            key (str): The Alpha Vantage API key.
+
+        Returns:
+            ClientSet: The pooled client set.
+        """
+        with self._lock:
+            self.lookups += 1
+            clients = self._sets.get(key)
+            if clients is not None:
+                self._sets.move_to_end(key)
+                return clients
+            clients = ClientSet(key)
+            self.constructed += 1
+            self._sets[key] = clients
+            if len(self._sets) > self.max_size:
+                self._sets.popitem(last=False)
+                self.evictions += 1
+            return clients
+
+    def stats(self) -> dict[str, int]:
+        """Construction counters of the pool.
+
+        Returns:
+            dict[str, int]: `clients_saved` is the number of library clients that
+                per-resolver construction would have built on top of what the pool did.
+        """
+        with self._lock:
+            return {
+                "size": len(self._sets),
+                "max_size": self.max_size,
+                "lookups": self.lookups,
+                "sets_constructed": self.constructed,
+                "clients_constructed": self.constructed * self.CLIENTS_PER_SET,
+                "clients_saved": (self.lookups - self.constructed)
+                * self.CLIENTS_PER_SET,
+                "evictions": self.evictions,
+            }
+
+
+pool = ClientPool()
+
+
+class LibraryThreads:
+    """Bounded pool of the worker threads that run the library's blocking calls.
+
+    A library call holds its thread while the request it issued runs on the event loop,
+    so the threads mostly wait and the pool is sized for the fields in flight rather
+    than for the CPUs. asyncio's default executor has `min(32, cpus + 4)` threads,
+    which made sibling fields past that count wait for one another on small hosts.
+
+    Args:
+        max_size (int | None, optional): The number of threads. Defaults to
+            `AV_THREAD_POOL_SIZE` or 64.
+    """
+
+    def __init__(self, max_size: int | None = None) -> None:
+        self.max_size = max_size or int(getenv("AV_THREAD_POOL_SIZE", "64"))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_size, thread_name_prefix="alpha_vantage"
+        )
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def run[T](self, fn: Callable[[], T]) -> T:
+        """Runs `fn` on a worker thread without blocking the event loop.
+
+        Args:
+            fn (Callable[[], T]): The blocking call.
+
+        Returns:
+            T: Whatever `fn` returns.
+        """
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn)
+        finally:
+            self.in_flight -= 1
+
+    def shutdown(self) -> None:
+        """Stops the threads once their calls return."""
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict[str, int]:
+        """Calls run and threads in use.
+
+        Returns:
+            dict[str, int]: `peak_in_flight` above `max_size` means calls waited for a
+                thread.
+        """
+        return {
+            "max_size": self.max_size,
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+        }
+
+
+threads = LibraryThreads()
+
 
 class Vantage:
-    """Wrapper for all Alpha Vantage APIs"""
+    """Wrapper for all Alpha Vantage APIs
+
+    Constructing a `Vantage` is cheap: the library clients come from the shared `pool`.
+    """
 
     av_url = getenv("AV_URL")
     info: Info | None = None
@@ -33,11 +246,24 @@ class Vantage:
             key is not None
         ), "Alpha Vantage API key is not set. Set `ALPHAVANTAGE_API_KEY` in the request headers."
         self.key = key
-        self._time_series = TimeSeries(key=self.key)
-        self._tech_indicators = TechIndicators(key=self.key)
-        self._fundamental_data = FundamentalData(key=self.key)
-        self._crypto_currencies = CryptoCurrencies(key=self.key)
-        self.alpha_vantage = AlphaVantage(key=self.key)
+        self._clients = pool.get(key)
+        self.alpha_vantage = self._clients.alpha_vantage
+
+    async def call[**P, T](
+        self, fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> T:  #! pylint: disable=e0602
+        """Runs a blocking library call on a worker thread of `threads` without blocking
+        the event loop, so sibling fields wait on upstream at the same time.
+
+        Args:
+            fn (Callable[P, T]): A method of one of the library clients.
+
+        Returns:
+            T: Whatever the library call returns.
+        """
+        context = copy_context()
+        context.run(_loop.set, asyncio.get_running_loop())
+        return await threads.run(partial(context.run, fn, *args, **kwargs))
 
     @property
     def time_series(self) -> TimeSeries:
@@ -46,7 +272,7 @@ class Vantage:
         Returns:
             TimeSeries: Alpha Vantage Time Series API object.
         """
-        return self._time_series
+        return self._clients.time_series
 
     @property
     def tech_indicators(self) -> TechIndicators:
@@ -55,7 +281,7 @@ class Vantage:
         Returns:
             TechIndicators: Alpha Vantage Technical Indicators API object.
         """
-        return self._tech_indicators
+        return self._clients.tech_indicators
 
     @property
     def fundamental_data(self) -> FundamentalData:
@@ -64,7 +290,7 @@ class Vantage:
         Returns:
             FundamentalData: Alpha Vantage Fundamental Data API object.
         """
-        return self._fundamental_data
+        return self._clients.fundamental_data
 
     @property
     def crypto_currencies(self) -> CryptoCurrencies:
@@ -73,4 +299,4 @@ class Vantage:
         Returns:
             CryptoCurrencies: Alpha Vantage Crypto Currencies API object.
         """
-        return self._crypto_currencies
+        return self._clients.crypto_currencies